@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""dnacentersdk client-side benchmarks.
+
+The benchmarks in this package measure the overhead added by the SDK itself
+(argument checking, request building, validation, JSON decoding and object
+creation). They never contact a real DNA Center; requests are answered
+in-process by a fake transport or by a local stub server.
+
+Run every suite and write machine-readable results with::
+
+    python -m benchmarks --output results.json
+
+or run a single module directly, for example::
+
+    python -m benchmarks.bench_call_overhead
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""Run the benchmark suites and write the results as JSON.
+
+Usage::
+
+    python -m benchmarks [--quick] [--suite NAME ...] [--output FILE]
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+
+import dnacentersdk
+
+from . import (
+    bench_call_overhead,
+    bench_decode,
+    bench_pagination,
+    bench_pnp_import,
+    bench_startup,
+    bench_validation,
+)
+
+
+SUITES = {
+    'startup': bench_startup.run,
+    'call_overhead': lambda quick: bench_call_overhead.run(
+        iterations=200 if quick else bench_call_overhead.DEFAULT_ITERATIONS,
+    ),
+    'decode': bench_decode.run,
+    'validation': bench_validation.run,
+    'pagination': bench_pagination.run,
+    'pnp_import': bench_pnp_import.run,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('--quick', action='store_true',
+                        help='smaller inputs and fewer samples')
+    parser.add_argument('--suite', action='append', choices=sorted(SUITES),
+                        help='suite to run (repeatable; default: all)')
+    parser.add_argument('--output', default='-',
+                        help="output file ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.suite or list(SUITES):
+        sys.stderr.write('==> {}\n'.format(name))
+        results.extend(SUITES[name](args.quick))
+
+    report = {
+        'meta': {
+            'dnacentersdk': dnacentersdk.__version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': datetime.datetime.utcnow().isoformat() + 'Z',
+            'quick': args.quick,
+        },
+        'results': results,
+    }
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""Per-call SDK overhead of the generated wrapper methods.
+
+Each wrapper call is timed against a local stub server (or the in-process
+fake transport) and compared with a bare `requests` round trip to the same
+target; the difference is the time spent inside the SDK.
+
+Usage::
+
+    python -m benchmarks.bench_call_overhead [iterations] [stub|fake]
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import sys
+
+import dnacentersdk
+
+from .harness import best_per_call, fake_api, result
+from .stub_server import StubServer
+
+
+SUITE = 'call_overhead'
+
+DEFAULT_ITERATIONS = 2000
+
+# One representative call per wrapper family (plus a few writes)
+FAMILY_CALLS = [
+    ('clients', 'get_overall_client_health', {}),
+    ('command_runner', 'get_all_keywords_of_clis_accepted', {}),
+    ('devices', 'get_device_by_id', {'id': '1234'}),
+    ('devices', 'get_device_list', {'hostname': 'edge*',
+                                    'family': 'Switches and Hubs'}),
+    ('devices', 'update_device_role', {'id': '1234', 'role': 'ACCESS',
+                                       'roleSource': 'MANUAL'}),
+    ('fabric_wired', 'gets_border_device_details_from_sda_fabric',
+     {'device_ip_address': '10.0.0.1'}),
+    ('file', 'get_list_of_available_namespaces', {}),
+    ('network_discovery', 'get_discoveries_by_range',
+     {'start_index': 1, 'records_to_return': 500}),
+    ('networks', 'get_vlan_details', {}),
+    ('non_fabric_wireless', 'get_enterprise_ssid', {}),
+    ('path_trace', 'retrives_all_previous_pathtraces_summary', {}),
+    ('pnp', 'get_device_list', {'limit': 50, 'offset': 0}),
+    ('swim', 'get_software_image_details', {}),
+    ('site_profile', 'get_device_details_by_ip', {'device_ip': '10.0.0.1'}),
+    ('sites', 'get_site', {'name': 'Global/San Jose'}),
+    ('tag', 'get_tag', {'name': 'core', 'limit': '10', 'offset': '1'}),
+    ('task', 'get_tasks', {'limit': '10', 'offset': '1'}),
+    ('template_programmer', 'get_projects', {}),
+]
+
+
+def wrapper_calls(api):
+    """Return the (name, callable) pairs that are benchmarked."""
+    calls = []
+    for family, method_name, kwargs in FAMILY_CALLS:
+        method = getattr(getattr(api, family), method_name)
+        calls.append(('{}.{}'.format(family, method_name),
+                      lambda method=method, kwargs=kwargs: method(**kwargs)))
+    return calls
+
+
+def _run(api, iterations, transport_name):
+    results = []
+    req_session = api.session._req_session
+    raw_url = api.session.abs_url('/dna/intent/api/v1/network-device/1')
+
+    def raw_call():
+        json.loads(req_session.get(raw_url).text)
+
+    floor = best_per_call(raw_call, iterations)
+    results.append(result(SUITE, 'requests (floor)', floor * 1e6, 'us',
+                          transport=transport_name, overhead_us=0.0))
+    for name, call in wrapper_calls(api):
+        # Re-sample the floor next to every call to limit drift
+        floor = best_per_call(raw_call, iterations)
+        per_call = best_per_call(call, iterations)
+        results.append(result(SUITE, name, per_call * 1e6, 'us',
+                              transport=transport_name,
+                              overhead_us=(per_call - floor) * 1e6))
+    return results
+
+
+def run(iterations=DEFAULT_ITERATIONS, version='1.3.0', transport='fake'):
+    """Run the benchmark and return a list of results.
+
+    Args:
+        iterations(int): Calls per timing sample.
+        version(basestring): DNA Center API version of the wrappers.
+        transport(basestring): 'fake' serves the requests in-process;
+            'stub' sends them to a local HTTP stub server.
+    """
+    if transport == 'fake':
+        api, _ = fake_api(version)
+        return _run(api, iterations, transport)
+    with StubServer() as server:
+        api = dnacentersdk.DNACenterAPI(username='bench', password='bench',
+                                        base_url=server.base_url,
+                                        version=version, verify=False)
+        return _run(api, iterations, transport)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    iterations = int(argv[0]) if argv else DEFAULT_ITERATIONS
+    transport = argv[1] if len(argv) > 1 else 'stub'
+    print('{:<60} {:>14} {:>14}'.format('call', 'per call (us)',
+                                        'overhead (us)'))
+    for item in run(iterations, transport=transport):
+        print('{:<60} {:>14.1f} {:>14.1f}'.format(
+            item['name'], item['value'], item['params']['overhead_us']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""JSON decoding and object_factory cost by response size.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import requests
+
+from dnacentersdk.models.mydict import mydict_data_factory
+from dnacentersdk.utils import extract_and_parse_json
+
+from .fake_transport import build_response
+from .harness import best_per_call, device_record, response_body, result
+
+
+SUITE = 'decode'
+
+SIZES = [1, 10, 100, 1000, 10000, 100000]
+
+QUICK_SIZES = [1, 100, 10000]
+
+
+def _number_for(size):
+    """Keep every sample around the same total amount of work."""
+    return max(1, 2000 // size)
+
+
+def run(quick=False):
+    """Run the benchmark and return a list of results."""
+    results = []
+    request = requests.Request(
+        'GET', 'https://dnac/dna/intent/api/v1/network-device'
+    ).prepare()
+    for size in QUICK_SIZES if quick else SIZES:
+        body = response_body([device_record(i) for i in range(size)])
+        response = build_response(request, 200, body)
+        number = _number_for(size)
+        repeat = 1 if size >= 100000 else 3
+
+        decode = best_per_call(lambda: extract_and_parse_json(response),
+                               number, repeat)
+        json_data = extract_and_parse_json(response)
+        factory = best_per_call(
+            lambda: mydict_data_factory('bpm_20b19b52464b8972_v1_3_0',
+                                        json_data),
+            number, repeat,
+        )
+        results.append(result(SUITE, 'extract_and_parse_json', decode * 1e3,
+                              'ms', records=size, bytes=len(body)))
+        results.append(result(SUITE, 'mydict_data_factory', factory * 1e3,
+                              'ms', records=size, bytes=len(body)))
+        results.append(result(SUITE, 'decode + factory throughput',
+                              size / (decode + factory), 'records/s',
+                              records=size))
+    return results
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""Offset/limit pagination throughput through the API wrappers.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import time
+
+import dnacentersdk
+from dnacentersdk.simulator import Inventory, SimulatorServer
+
+from .harness import device_record, fake_api, response_body, result
+
+
+SUITE = 'pagination'
+
+DEVICE_LIST_PATH = '/dna/intent/api/v1/network-device'
+
+
+def serve_device_pages(transport, total):
+    """Serve `total` devices on the network-device list endpoint.
+
+    Pages are serialized ahead of time, so only the client-side cost is
+    measured. `offset` is 1-based, as on DNA Center.
+    """
+    devices = [device_record(i) for i in range(total)]
+    pages = {}
+
+    def handler(request, query):
+        offset = int(query.get('offset', ['1'])[0])
+        limit = int(query.get('limit', ['500'])[0])
+        key = (offset, limit)
+        if key not in pages:
+            pages[key] = response_body(devices[offset - 1:offset - 1 + limit])
+        return 200, pages[key], None
+
+    for offset in range(1, total + 1, 500):
+        handler(None, {'offset': [str(offset)], 'limit': ['500']})
+    transport.add_route('GET', DEVICE_LIST_PATH, handler)
+
+
+def manual_loop(api, page_size):
+    """The hand-written offset/limit loop used by callers today."""
+    offset = 1
+    count = 0
+    while True:
+        page = api.devices.get_device_list(offset=offset,
+                                           limit=page_size).response
+        count += len(page)
+        if len(page) < page_size:
+            return count
+        offset += page_size
+
+
+def consume(records):
+    """Touch every record, as a caller processing the results would."""
+    return sum(1 for record in records if record.hostname)
+
+
+def read_ahead_results(quick=False, latency=0.1):
+    """Compare iter_device_list with and without reading ahead.
+
+    The pages are served by the local simulator with `latency` seconds of
+    added delay per request, so that the download of a page can overlap
+    the decoding and consumption of the previous one.
+    """
+    total = 5000 if quick else 20000
+    results = []
+    with SimulatorServer(inventory=Inventory(devices=total),
+                         latency=latency) as server:
+        api = dnacentersdk.DNACenterAPI(username='admin', password='secret',
+                                        base_url=server.base_url,
+                                        version='1.3.0', verify=False)
+        for read_ahead in (0, 1, 2):
+            devices = api.devices.iter_device_list(page_size=500,
+                                                   read_ahead=read_ahead)
+            start = time.perf_counter()
+            count = consume(devices)
+            elapsed = time.perf_counter() - start
+            assert count == total
+            results.append(result(
+                SUITE, 'iter_device_list read_ahead={}'.format(read_ahead),
+                count / elapsed, 'records/s', records=total, page_size=500,
+                latency=latency, read_ahead=read_ahead,
+            ))
+    return results
+
+
+def run(quick=False):
+    """Run the benchmark and return a list of results."""
+    total = 5000 if quick else 50000
+    api, transport = fake_api()
+    serve_device_pages(transport, total)
+
+    start = time.perf_counter()
+    count = manual_loop(api, 500)
+    elapsed = time.perf_counter() - start
+    assert count == total
+    return [result(SUITE, 'manual offset/limit loop', count / elapsed,
+                   'records/s', records=total, page_size=500)] + \
+        read_ahead_results(quick)
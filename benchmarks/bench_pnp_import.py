@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""PnP bulk import throughput and memory, by chunk size.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import time
+import tracemalloc
+
+import dnacentersdk
+from dnacentersdk.simulator import Inventory, SimulatorServer
+
+from .harness import result
+
+
+SUITE = 'pnp_import'
+
+
+def pnp_devices(total, offset=0):
+    """Generate PnP import entries with unique serial numbers."""
+    for index in range(offset, offset + total):
+        yield {'deviceInfo': {'serialNumber': 'FDO{:08d}'.format(index),
+                              'pid': 'C9300-48U', 'hostname':
+                              'edge-{:06d}'.format(index)}}
+
+
+def measure(name, func, total, **params):
+    """Time `func` and trace its peak memory, including the simulator's."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    imported = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert imported == total
+    return [
+        result(SUITE, name, total / elapsed, 'devices/s', devices=total,
+               **params),
+        result(SUITE, name + ' peak memory', peak / 2 ** 20, 'MiB',
+               devices=total, **params),
+    ]
+
+
+def run(quick=False, latency=0.05):
+    """Compare one import request with chunked concurrent imports.
+
+    Each configuration imports new devices into the local simulator, which
+    adds `latency` seconds per request. The peak memory is traced in this
+    process, so it includes the requests decoded by the simulator.
+    """
+    total = 5000 if quick else 20000
+    results = []
+    offset = 0
+    with SimulatorServer(inventory=Inventory(devices=1),
+                         latency=latency) as server:
+        api = dnacentersdk.DNACenterAPI(username='admin', password='secret',
+                                        base_url=server.base_url,
+                                        version='1.3.0', verify=False)
+
+        def single_request():
+            response = api.pnp.import_devices_in_bulk(
+                payload=list(pnp_devices(total, offset))
+            )
+            return len(response.successList)
+
+        results.extend(measure('single import_devices_in_bulk',
+                               single_request, total, latency=latency))
+        for chunk_size in (250, 1000, 5000):
+            offset += total
+
+            def chunked():
+                report = api.import_pnp_devices(pnp_devices(total, offset),
+                                                chunk_size=chunk_size)
+                return len(report.success_list)
+
+            results.extend(measure(
+                'import_pnp_devices chunk_size={}'.format(chunk_size),
+                chunked, total, chunk_size=chunk_size, latency=latency,
+            ))
+    return results
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Package import time and DNACenterAPI construction cost.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import subprocess
+import sys
+
+import requests
+
+import dnacentersdk
+
+from .harness import best_per_call, result
+from .stub_server import AUTH_TOKEN_PATH, StubServer
+
+
+SUITE = 'startup'
+
+_IMPORT_SNIPPET = (
+    'import time; start = time.perf_counter(); import dnacentersdk; '
+    'print(time.perf_counter() - start)'
+)
+
+
+def import_time(repeat=5):
+    """Best wall time (seconds) of `import dnacentersdk` in a fresh process.
+    """
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c',
+                                          _IMPORT_SNIPPET])
+        timings.append(float(output.decode('utf-8').strip()))
+    return min(timings)
+
+
+def run(quick=False):
+    """Run the benchmark and return a list of results."""
+    number = 5 if quick else 50
+    results = [result(SUITE, 'import dnacentersdk',
+                      import_time(2 if quick else 5) * 1e3, 'ms')]
+    with StubServer() as server:
+        token_url = server.base_url + AUTH_TOKEN_PATH
+        # The construction includes one token request; time it separately
+        token_floor = best_per_call(
+            lambda: requests.post(token_url, auth=('bench', 'bench')),
+            number,
+        )
+        for version in ('1.2.10', '1.3.0'):
+            construct = best_per_call(
+                lambda: dnacentersdk.DNACenterAPI(
+                    username='bench', password='bench',
+                    base_url=server.base_url, version=version,
+                    verify=False,
+                ),
+                number,
+            )
+            results.append(result(SUITE, 'DNACenterAPI()', construct * 1e3,
+                                  'ms', version=version,
+                                  token_request_ms=token_floor * 1e3))
+    return results
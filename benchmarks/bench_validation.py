@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Request payload validation cost.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from dnacentersdk.models.schema_validator import json_schema_validate
+
+from .harness import best_per_call, result
+
+
+SUITE = 'validation'
+
+
+def _pnp_import_payload(size):
+    return [{'deviceInfo': {'serialNumber': 'FOC{:08d}'.format(i),
+                            'pid': 'C9300-48U',
+                            'name': 'edge-{:06d}'.format(i),
+                            'stack': False,
+                            'sudiRequired': False}}
+            for i in range(size)]
+
+
+def payloads(quick=False):
+    """Return the (name, model, payload) triples that are validated."""
+    items = [
+        ('devices.update_device_role', 'jsd_b9855ad54ae98156_v1_3_0',
+         {'id': '1234', 'role': 'ACCESS', 'roleSource': 'MANUAL'}),
+        ('devices.add_device', 'jsd_4bb22af046fa8f08_v1_3_0',
+         {'cliTransport': 'ssh', 'enablePassword': 'secret',
+          'ipAddress': ['10.0.0.1'], 'password': 'secret',
+          'snmpVersion': 'v2', 'snmpROCommunity': 'public',
+          'userName': 'admin'}),
+        ('pnp.claim_a_device_to_a_site', 'jsd_5889fb844939a13b_v1_3_0',
+         {'deviceId': '1234', 'siteId': '5678', 'type': 'Default'}),
+        ('template_programmer.deploy_template',
+         'jsd_6099da82477b858a_v1_3_0',
+         {'templateId': '1234', 'forcePushTemplate': False,
+          'targetInfo': [{'id': '10.0.0.{}'.format(i),
+                          'type': 'MANAGED_DEVICE_IP',
+                          'params': {'hostname': 'edge-{}'.format(i)}}
+                         for i in range(100)]}),
+    ]
+    for size in (1, 100) if quick else (1, 100, 10000):
+        items.append(('pnp.import_devices_in_bulk[{}]'.format(size),
+                      'jsd_21a6db2540298f55_v1_3_0',
+                      _pnp_import_payload(size)))
+    return items
+
+
+def run(quick=False):
+    """Run the benchmark and return a list of results."""
+    results = []
+    lookup = best_per_call(
+        lambda: json_schema_validate('jsd_b9855ad54ae98156_v1_3_0'), 10000
+    )
+    results.append(result(SUITE, 'validator lookup', lookup * 1e6, 'us'))
+    for name, model, payload in payloads(quick):
+        validator = json_schema_validate(model)
+        number = 1 if isinstance(payload, list) and len(payload) > 1000 \
+            else 200
+        per_call = best_per_call(lambda: validator.validate(payload),
+                                 number, 3)
+        results.append(result(SUITE, name, per_call * 1e6, 'us',
+                              model=model))
+    return results
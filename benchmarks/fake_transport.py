@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""In-process `requests` transport adapter answering with canned data.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import io
+import json
+import urllib.parse
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+DEFAULT_BODY = json.dumps({'response': [], 'version': '1.0'}).encode('utf-8')
+
+
+def build_response(request, status_code=200, body=b'', headers=None):
+    """Build a `requests.Response` for `request` without any I/O."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = 'OK' if status_code < 400 else 'Error'
+    response.headers = CaseInsensitiveDict(
+        {'Content-Type': 'application/json;charset=UTF-8'}
+    )
+    response.headers.update(headers or {})
+    response.headers['Content-Length'] = str(len(body))
+    response._content = body
+    response.raw = io.BytesIO(body)
+    response.url = request.url
+    response.request = request
+    response.encoding = 'utf-8'
+    return response
+
+
+class FakeTransport(BaseAdapter):
+    """A `requests` adapter that serves registered routes in-process.
+
+    A route is an HTTP method and a URL path. Its handler is either the
+    bytes to return or a callable receiving the `PreparedRequest` and the
+    parsed query string and returning `(status_code, body, headers)`.
+    Requests that match no route get an empty DNA Center response.
+    """
+
+    def __init__(self):
+        super(FakeTransport, self).__init__()
+        self._routes = {}
+        self.requests_served = 0
+
+    def add_route(self, method, path, handler):
+        if isinstance(handler, (dict, list)):
+            handler = json.dumps(handler).encode('utf-8')
+        self._routes[(method.upper(), path)] = handler
+
+    def install(self, session):
+        """Mount this transport on a RestSession for every URL."""
+        session._req_session.mount('http://', self)
+        session._req_session.mount('https://', self)
+        return self
+
+    def send(self, request, **kwargs):
+        self.requests_served += 1
+        parsed = urllib.parse.urlsplit(request.url)
+        handler = self._routes.get((request.method, parsed.path),
+                                   DEFAULT_BODY)
+        if callable(handler):
+            query = urllib.parse.parse_qs(parsed.query)
+            status_code, body, headers = handler(request, query)
+            return build_response(request, status_code, body, headers)
+        return build_response(request, 200, handler)
+
+    def close(self):
+        pass
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Shared helpers for the benchmark modules.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import timeit
+
+import dnacentersdk
+
+from .fake_transport import FakeTransport
+from .stub_server import StubServer
+
+
+def best_per_call(func, number, repeat=5):
+    """Return the best observed duration (seconds) of a single call."""
+    timings = timeit.repeat(func, number=number, repeat=repeat)
+    return min(timings) / number
+
+
+def result(suite, name, value, unit, **params):
+    """Build one machine-readable benchmark result."""
+    return {'suite': suite, 'name': name, 'value': value, 'unit': unit,
+            'params': params}
+
+
+def fake_api(version='1.3.0', transport=None):
+    """Create a DNACenterAPI whose requests are served in-process.
+
+    The access token is obtained from a short-lived local stub server (the
+    token request does not go through the API session); every request made
+    afterwards is answered by `transport`.
+
+    Returns:
+        tuple: The DNACenterAPI object and its FakeTransport.
+    """
+    with StubServer() as server:
+        api = dnacentersdk.DNACenterAPI(username='bench', password='bench',
+                                        base_url=server.base_url,
+                                        version=version, verify=False)
+    transport = transport or FakeTransport()
+    transport.install(api.session)
+    return api, transport
+
+
+def device_record(index):
+    """A network-device record shaped like the DNA Center inventory."""
+    return {
+        'id': 'device-{:08d}'.format(index),
+        'hostname': 'edge-{:06d}.example.com'.format(index),
+        'managementIpAddress': '10.{}.{}.{}'.format(
+            (index >> 16) & 255, (index >> 8) & 255, index & 255),
+        'macAddress': '00:00:{:02x}:{:02x}:{:02x}:{:02x}'.format(
+            (index >> 24) & 255, (index >> 16) & 255,
+            (index >> 8) & 255, index & 255),
+        'serialNumber': 'FOC{:08d}'.format(index),
+        'platformId': 'C9300-48U',
+        'family': 'Switches and Hubs',
+        'type': 'Cisco Catalyst 9300 Switch',
+        'series': 'Cisco Catalyst 9300 Series Switches',
+        'role': 'ACCESS',
+        'roleSource': 'AUTO',
+        'softwareType': 'IOS-XE',
+        'softwareVersion': '16.12.1',
+        'reachabilityStatus': 'Reachable',
+        'collectionStatus': 'Managed',
+        'collectionInterval': 'Global Default',
+        'upTime': '10 days, 2:03:04.00',
+        'lastUpdated': '2019-10-01 10:00:00',
+        'lastUpdateTime': 1569924000000,
+        'bootDateTime': '2019-09-21 08:00:00',
+        'interfaceCount': '56',
+        'lineCardCount': '2',
+        'memorySize': 'NA',
+        'locationName': None,
+        'snmpContact': '',
+        'snmpLocation': 'San Jose',
+        'tagCount': '0',
+        'instanceUuid': 'device-{:08d}'.format(index),
+        'instanceTenantId': 'tenant-1',
+    }
+
+
+def response_body(records):
+    """Serialize records the way DNA Center wraps a list response."""
+    return json.dumps({'response': records,
+                       'version': '1.0'}).encode('utf-8')
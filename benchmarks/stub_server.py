@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Minimal local HTTP server answering every request with canned JSON.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+
+AUTH_TOKEN_PATH = '/dna/system/api/v1/auth/token'
+
+DEFAULT_BODY = {'response': [], 'version': '1.0'}
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _reply(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        if self.path.startswith(AUTH_TOKEN_PATH):
+            body = self.server.token_body
+        else:
+            body = self.server.body
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json;charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        # Send the headers and the body in a single segment
+        self._headers_buffer.append(b'\r\n' + body)
+        self.flush_headers()
+
+    do_GET = do_POST = do_PUT = do_DELETE = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(object):
+    """A threaded HTTP server bound to an ephemeral localhost port.
+
+    Use it as a context manager; the server is stopped on exit.
+    """
+
+    def __init__(self, body=None):
+        self._httpd = _ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+        self._httpd.body = json.dumps(
+            DEFAULT_BODY if body is None else body
+        ).encode('utf-8')
+        self._httpd.token_body = json.dumps(
+            {'Token': 'stub-token'}
+        ).encode('utf-8')
+        self._thread = threading.Thread(target=self._httpd.serve_forever)
+        self._thread.daemon = True
+
+    @property
+    def base_url(self):
+        """The base URL of the running server."""
+        host, port = self._httpd.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -37,10 +37,13 @@ from .api import DNACenterAPI
 from .exceptions import (
     AccessTokenError,
     ApiError,
+    CassetteError,
     dnacentersdkException,
     MalformedRequest,
     RateLimitError,
     RateLimitWarning,
+    TaskError,
+    TaskTimeoutError,
     VersionError,
 )
 from .models.mydict import mydict_data_factory
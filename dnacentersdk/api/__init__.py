@@ -24,9 +24,18 @@ SOFTWARE.
 
 from past.types import basestring
 
+from dnacentersdk.batching import DEFAULT_MAX_BATCH, DeviceLookupBatcher
+from dnacentersdk.bulk import bulk
+from dnacentersdk.commands import (
+    COMMAND_RUNNER_MAX_COMMANDS, COMMAND_RUNNER_MAX_DEVICES, run_commands,
+)
 from dnacentersdk.config import (
     DEFAULT_BASE_URL, DEFAULT_SINGLE_REQUEST_TIMEOUT,
-    DEFAULT_WAIT_ON_RATE_LIMIT, DEFAULT_VERIFY,
+    DEFAULT_WAIT_ON_RATE_LIMIT, DEFAULT_VERIFY, DEFAULT_BULK_WORKERS,
+    DEFAULT_WORKERS, DEFAULT_PNP_IMPORT_CHUNK_SIZE, DEFAULT_PNP_IMPORT_RETRIES,
+    DEFAULT_PNP_CLAIM_POLL_BATCH, DEFAULT_TASK_POLL_INTERVAL,
+    DEFAULT_TASK_MAX_POLL_INTERVAL, DEFAULT_TEMPLATE_DEPLOYMENT_SIZE,
+    DEFAULT_MAX_TEMPLATE_DEPLOYMENTS, DEFAULT_MAX_PATH_TRACES,
 )
 from dnacentersdk.environment import (
     DNA_CENTER_USERNAME, DNA_CENTER_PASSWORD,
@@ -34,9 +43,17 @@ from dnacentersdk.environment import (
     DNA_CENTER_VERSION,
 )
 from dnacentersdk.exceptions import AccessTokenError, VersionError
+from dnacentersdk.executor import ApiExecutor
 from dnacentersdk.models.mydict import mydict_data_factory
 from dnacentersdk.models.schema_validator import json_schema_validate
+from dnacentersdk.onboarding import claim_devices, import_devices
+from dnacentersdk.path_trace import PathTraceCache, trace_paths
 from dnacentersdk.restsession import RestSession
+from dnacentersdk.tasks import TaskWaiter
+from dnacentersdk.templates import TemplateCache, deploy_template
+from dnacentersdk.upgrades import (
+    DEFAULT_MAX_ACTIVATIONS, DEFAULT_MAX_DISTRIBUTIONS, upgrade_devices,
+)
 from dnacentersdk.utils import check_type
 
 from .authentication import Authentication
@@ -128,7 +145,8 @@ class DNACenterAPI(object):
                  version=DNA_CENTER_VERSION,
                  debug=None,
                  object_factory=mydict_data_factory,
-                 validator=json_schema_validate):
+                 validator=json_schema_validate,
+                 workers=DEFAULT_WORKERS):
         """Create a new DNACenterAPI object.
         An access token is required to interact with the DNA Center APIs.
         This package supports two methods for you to generate the
@@ -178,6 +196,9 @@ class DNACenterAPI(object):
                 Python objects from the returned DNA Center JSON data objects.
             validator(callable): The factory function to use to validate
                 Python objects sent in the body of the request.
+            workers(int): The number of threads running the calls made with
+                the `submit` variant of the API wrapper methods. Defaults to
+                dnacentersdk.config.DEFAULT_WORKERS.
 
         Returns:
             DNACenterAPI: A new DNACenterAPI object.
@@ -201,6 +222,7 @@ class DNACenterAPI(object):
         check_type(encoded_auth, basestring, may_be_none=True)
         check_type(verify, (bool, basestring), may_be_none=False)
         check_type(version, basestring, may_be_none=False)
+        check_type(workers, int, may_be_none=False)
 
         if version not in ['1.2.10', '1.3.0']:
             raise VersionError(
@@ -263,7 +285,9 @@ class DNACenterAPI(object):
             verify=verify,
             version=version,
             debug=debug,
+            pool_size=max(workers, DEFAULT_WORKERS),
         )
+        self._executor = ApiExecutor(workers)
 
         # API wrappers
         if version == '1.2.10':
@@ -399,11 +423,32 @@ class DNACenterAPI(object):
         self.custom_caller = \
             CustomCaller(self._session, object_factory)
 
+        # Add a `submit` variant to the API wrapper methods
+        for wrapper in vars(self).values():
+            if wrapper not in (self.authentication, self.custom_caller,
+                               self._session, self._executor):
+                self._executor.wrap(wrapper)
+
+        # Shared by the callers waiting for asynchronous tasks, so that
+        # their status requests are batched
+        self.task_waiter = TaskWaiter(self.task)
+
+        # Shared, so that the templates are only read once
+        self.template_cache = TemplateCache(self)
+
+        # Shared, so that repeated sweeps reuse the completed traces
+        self.path_trace_cache = PathTraceCache()
+
     @property
     def session(self):
         """The DNA Center API session."""
         return self._session
 
+    @property
+    def executor(self):
+        """The executor running the submitted API calls."""
+        return self._executor
+
     @property
     def access_token(self):
         """The access token used for API calls to the DNA Center service."""
@@ -456,3 +501,336 @@ class DNACenterAPI(object):
     def wait_on_rate_limit(self, value):
         """Enable or disable automatic rate-limit handling."""
         self._session.wait_on_rate_limit = value
+
+    def bulk(self, method, arguments, workers=DEFAULT_BULK_WORKERS,
+             ordered=False):
+        """Call an API wrapper method for many argument sets, concurrently.
+
+        For example, to fetch the details of many devices::
+
+            for outcome in api.bulk(api.devices.get_device_by_id, ids):
+                if outcome.error is None:
+                    print(outcome.result.response.hostname)
+
+        At most `workers` calls are in flight, and no more than the
+        connection pool size of the session (`max(workers, 10)` of the
+        DNACenterAPI), so that every call reuses a pooled connection.
+        Errors are returned with each call's outcome instead of stopping
+        the batch, and a rate limit response pauses all the calls of the
+        session.
+
+        Args:
+            method(callable): The API wrapper method to call.
+            arguments(iterable): The arguments of each call: a dict of
+                keyword arguments, a tuple or list of positional arguments,
+                or a single positional argument.
+            workers(int): The maximum number of concurrent calls.
+            ordered(bool): Yield the outcomes in the order of `arguments`,
+                instead of as the calls complete.
+
+        Returns:
+            generator: A :class:`dnacentersdk.bulk.BulkResult` per call.
+
+        """
+        check_type(workers, int, may_be_none=False)
+        return bulk(method, arguments,
+                    workers=min(workers, self._session.pool_size),
+                    ordered=ordered)
+
+    def batching(self, window=None, max_batch=DEFAULT_MAX_BATCH,
+                 workers=DEFAULT_BULK_WORKERS):
+        """Batch per-device lookups into few get_device_list queries.
+
+        Use the returned batcher as a context manager; its lookups return
+        futures, resolved when the block exits (or sooner, see
+        :class:`dnacentersdk.batching.DeviceLookupBatcher`)::
+
+            with api.batching() as batch:
+                futures = [batch.get_device_by_id(i) for i in device_ids]
+
+        Args:
+            window(float,int): Also send the pending lookups this many
+                seconds after the first one.
+            max_batch(int): The most ids per get_device_list query.
+            workers(int): The most concurrent queries of the fields that
+                take a single value, such as the serial number.
+
+        Returns:
+            DeviceLookupBatcher: A new batcher over this API's devices.
+
+        """
+        return DeviceLookupBatcher(self.devices, window=window,
+                                   max_batch=max_batch, workers=workers)
+
+    def submit(self, method, *args, **kwargs):
+        """Call an API method on the API's executor.
+
+        Equivalent to `method.submit(*args, **kwargs)` for the API wrapper
+        methods; also accepts other callables, such as the functions added
+        to `custom_caller`.
+
+        Returns:
+            concurrent.futures.Future: The result of the call, or the
+            exception it raised.
+
+        """
+        return self._executor.submit(method, *args, **kwargs)
+
+    def close(self):
+        """Stop the executor threads once the submitted calls are done."""
+        self._executor.shutdown()
+
+    def wait_for_task(self, task, timeout=None):
+        """Wait for an asynchronous task to complete.
+
+        For example, ``api.wait_for_task(api.devices.sync_devices(...))``.
+        The status requests of the tasks waited for concurrently are
+        batched by the API's :class:`dnacentersdk.tasks.TaskWaiter`.
+
+        Args:
+            task(basestring,dict): A task id, or the response of the
+                operation that started the task.
+            timeout(float,int): The most seconds to wait.
+
+        Returns:
+            MyDict: The completed task.
+
+        Raises:
+            TaskError: If the task completes with an error.
+            TaskTimeoutError: If the task does not complete in time.
+
+        """
+        return self.task_waiter.wait_for(task, timeout=timeout).result()
+
+    def run_commands(self, commands, device_ids,
+                     devices_per_request=COMMAND_RUNNER_MAX_DEVICES,
+                     commands_per_request=COMMAND_RUNNER_MAX_COMMANDS,
+                     workers=DEFAULT_BULK_WORKERS, task_timeout=None):
+        """Run read-only commands on many devices, streaming their outputs.
+
+        For example::
+
+            for output in api.run_commands(['show version'], device_ids):
+                print(output.device_id, output.status, output.output)
+
+        See :func:`dnacentersdk.commands.run_commands`.
+
+        Args:
+            commands(list): The commands to run on every device.
+            device_ids(iterable): The ids of the devices.
+            devices_per_request(int): The most devices per request.
+            commands_per_request(int): The most commands per request.
+            workers(int): The number of requests submitted, and of files
+                downloaded, concurrently.
+            task_timeout(float,int): The most seconds to wait for the task
+                of a request.
+
+        Returns:
+            generator: A :class:`dnacentersdk.commands.CommandOutput` per
+            device and command.
+
+        """
+        return run_commands(self, commands, device_ids,
+                            devices_per_request=devices_per_request,
+                            commands_per_request=commands_per_request,
+                            workers=workers, task_timeout=task_timeout)
+
+    def upgrade_devices(self, upgrades, activate=True,
+                        max_distributions=DEFAULT_MAX_DISTRIBUTIONS,
+                        max_activations=DEFAULT_MAX_ACTIVATIONS,
+                        activation_options=None, schedule_validate=None,
+                        workers=DEFAULT_BULK_WORKERS, task_timeout=None):
+        """Distribute software images to devices and activate them.
+
+        For example::
+
+            for event in api.upgrade_devices([(device_id, image_id)]):
+                print(event.device_id, event.stage, event.status)
+
+        See :func:`dnacentersdk.upgrades.upgrade_devices`.
+
+        Args:
+            upgrades(iterable): The (device id, image id) pairs to upgrade.
+            activate(bool): Activate the images after their distribution.
+            max_distributions(int): The most distributions in progress at
+                once.
+            max_activations(int): The most activations in progress at once.
+            activation_options(dict): Additional fields of each activation
+                request.
+            schedule_validate(bool): The scheduleValidate parameter of the
+                activation requests.
+            workers(int): The number of requests sent concurrently.
+            task_timeout(float,int): The most seconds to wait for the task
+                of a request.
+
+        Returns:
+            generator: An :class:`dnacentersdk.upgrades.UpgradeEvent` per
+            device and completed stage.
+
+        """
+        return upgrade_devices(self, upgrades, activate=activate,
+                               max_distributions=max_distributions,
+                               max_activations=max_activations,
+                               activation_options=activation_options,
+                               schedule_validate=schedule_validate,
+                               workers=workers, task_timeout=task_timeout)
+
+    def import_pnp_devices(self, devices,
+                           chunk_size=DEFAULT_PNP_IMPORT_CHUNK_SIZE,
+                           workers=DEFAULT_BULK_WORKERS,
+                           retries=DEFAULT_PNP_IMPORT_RETRIES, progress=None):
+        """Import many devices to PnP with concurrent chunked requests.
+
+        For example::
+
+            report = api.import_pnp_devices(
+                {'deviceInfo': {'serialNumber': serial}} for serial in serials
+            )
+            print(len(report.success_list), report.failure_list)
+
+        See :func:`dnacentersdk.onboarding.import_devices`.
+
+        Args:
+            devices(iterable): The device entries, as in the payload of
+                `pnp.import_devices_in_bulk`.
+            chunk_size(int): The most devices per request.
+            workers(int): The number of requests sent concurrently.
+            retries(int): The number of times a failed request is sent
+                again.
+            progress(callable): Called after each chunk with the number of
+                devices imported and failed so far.
+
+        Returns:
+            PnpImportReport: The merged success and failure lists.
+
+        """
+        return import_devices(self, devices, chunk_size=chunk_size,
+                              workers=workers, retries=retries,
+                              progress=progress)
+
+    def claim_pnp_devices(self, site_id, devices, claim_type='Default',
+                          claim_options=None, workers=DEFAULT_BULK_WORKERS,
+                          interval=DEFAULT_TASK_POLL_INTERVAL,
+                          poll_batch=DEFAULT_PNP_CLAIM_POLL_BATCH,
+                          timeout=None):
+        """Claim PnP devices to a site and wait for their provisioning.
+
+        For example::
+
+            devices = api.import_pnp_devices(entries).success_list
+            for event in api.claim_pnp_devices(site_id, devices):
+                print(event.serial_number, event.status)
+
+        See :func:`dnacentersdk.onboarding.claim_devices`.
+
+        Args:
+            site_id(basestring): The id of the site.
+            devices(iterable): The PnP device records to claim.
+            claim_type(basestring): The `type` of the claims.
+            claim_options(dict): Additional fields of each claim request.
+            workers(int): The number of claims sent concurrently.
+            interval(float,int): Seconds between the state reads.
+            poll_batch(int): The most serial numbers per state read.
+            timeout(float,int): The most seconds to wait for a device after
+                its claim.
+
+        Returns:
+            generator: A :class:`dnacentersdk.onboarding.ClaimEvent` per
+            device.
+
+        """
+        return claim_devices(self, site_id, devices, claim_type=claim_type,
+                             claim_options=claim_options, workers=workers,
+                             interval=interval, poll_batch=poll_batch,
+                             timeout=timeout)
+
+    def deploy_template(self, template_id, targets,
+                        deployment_size=DEFAULT_TEMPLATE_DEPLOYMENT_SIZE,
+                        max_deployments=DEFAULT_MAX_TEMPLATE_DEPLOYMENTS,
+                        force_push=None, workers=DEFAULT_BULK_WORKERS,
+                        interval=DEFAULT_TASK_POLL_INTERVAL,
+                        max_interval=DEFAULT_TASK_MAX_POLL_INTERVAL,
+                        backoff=2.0, timeout=None):
+        """Deploy a template to many targets, streaming their results.
+
+        For example::
+
+            for result in api.deploy_template(template_id, device_ids):
+                print(result.target['id'], result.status, result.message)
+
+        See :func:`dnacentersdk.templates.deploy_template`.
+
+        Args:
+            template_id(basestring): The id of the template.
+            targets(iterable): The targetInfo entries of the deployments,
+                or managed device ids.
+            deployment_size(int): The most targets per deployment.
+            max_deployments(int): The most deployments in progress at once.
+            force_push(bool): The forcePushTemplate field of the
+                deployments.
+            workers(int): The number of requests sent concurrently.
+            interval(float,int): The shortest delay between two status
+                reads.
+            max_interval(float,int): The longest delay between two status
+                reads.
+            backoff(float,int): The factor applied to the delay when no
+                deployment has changed.
+            timeout(float,int): The most seconds to wait for a deployment.
+
+        Returns:
+            generator: A :class:`dnacentersdk.templates.TargetResult` per
+            target.
+
+        """
+        return deploy_template(self, template_id, targets,
+                               deployment_size=deployment_size,
+                               max_deployments=max_deployments,
+                               force_push=force_push, workers=workers,
+                               interval=interval, max_interval=max_interval,
+                               backoff=backoff, timeout=timeout)
+
+    def trace_paths(self, flows, use_cache=True,
+                    max_traces=DEFAULT_MAX_PATH_TRACES,
+                    workers=DEFAULT_BULK_WORKERS,
+                    interval=DEFAULT_TASK_POLL_INTERVAL,
+                    max_interval=DEFAULT_TASK_MAX_POLL_INTERVAL,
+                    backoff=2.0, timeout=None, cleanup=True):
+        """Trace the paths of many flows, streaming their results.
+
+        For example::
+
+            flows = [('10.1.1.1', '10.2.2.2'), ('10.1.1.1', '10.3.3.3')]
+            for result in api.trace_paths(flows):
+                print(result.flow['destIP'], result.status)
+
+        See :func:`dnacentersdk.path_trace.trace_paths`.
+
+        Args:
+            flows(iterable): The initiate_a_new_pathtrace fields of each
+                flow, or (sourceIP, destIP) tuples.
+            use_cache(bool): Serve the flows traced less than
+                `path_trace_cache.ttl` seconds ago from `path_trace_cache`,
+                and cache the completed traces.
+            max_traces(int): The most traces in progress at once.
+            workers(int): The number of requests sent concurrently.
+            interval(float,int): The shortest delay between two status
+                reads.
+            max_interval(float,int): The longest delay between two status
+                reads.
+            backoff(float,int): The factor applied to the delay when no
+                trace has changed.
+            timeout(float,int): The most seconds to wait for a trace.
+            cleanup(bool): Delete the traces once their result is read.
+
+        Returns:
+            generator: A :class:`dnacentersdk.path_trace.PathTraceResult`
+            per flow.
+
+        """
+        check_type(use_cache, bool, may_be_none=False)
+        return trace_paths(self, flows,
+                           cache=self.path_trace_cache if use_cache
+                           else None,
+                           max_traces=max_traces, workers=workers,
+                           interval=interval, max_interval=max_interval,
+                           backoff=backoff, timeout=timeout, cleanup=cleanup)
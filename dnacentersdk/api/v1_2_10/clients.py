@@ -129,8 +129,9 @@ class Clients(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -210,8 +211,9 @@ class Clients(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -121,8 +121,9 @@ class CommandRunner(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -214,8 +215,9 @@ class CommandRunner(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
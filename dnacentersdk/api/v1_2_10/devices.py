@@ -34,6 +34,8 @@ from builtins import *
 
 from past.builtins import basestring
 
+from ...config import DEFAULT_PAGE_SIZE
+from ...pagination import paginated, range_paginated
 from ...restsession import RestSession
 from ...utils import (
     check_type,
@@ -126,8 +128,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -193,8 +196,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -270,8 +274,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -527,8 +532,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -543,6 +549,42 @@ class Devices(object):
 
         return self._object_factory('bpm_20b19b52464b8972_v1_2_10', json_data)
 
+    def iter_device_list(self,
+                         page_size=DEFAULT_PAGE_SIZE,
+                         workers=1,
+                         ordered=True,
+                         read_ahead=0,
+                         **request_parameters):
+        """Iterate over the network devices returned by get_device_list,
+        fetching them page by page.
+
+        Slicing the result, as in `[start:stop]`, only requests that
+        range from DNA Center.
+
+        Args:
+            page_size(int): The number of records requested per page.
+            workers(int): The number of pages fetched concurrently. Above
+                1, the records are counted first to plan the pages.
+            ordered(bool): Yield the records in order. When False, the
+                pages are yielded as they are received.
+            read_ahead(int): The number of pages requested ahead of the
+                page being consumed, so that their download overlaps its
+                processing.
+            **request_parameters: The other parameters of
+                get_device_list, except offset and limit.
+
+        Returns:
+            GeneratorContainer: The records, as MyDict objects.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the DNA Center cloud returns an error.
+        """
+        return paginated(self.get_device_list,
+                         request_parameters, page_size,
+                         count=self.get_device_count, workers=workers,
+                         ordered=ordered, read_ahead=read_ahead)
+
     def get_polling_interval_for_all_devices(self,
                                              headers=None,
                                              payload=None,
@@ -594,8 +636,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -664,8 +707,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -742,8 +786,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -825,8 +870,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -842,6 +888,51 @@ class Devices(object):
 
         return self._object_factory('bpm_349c888443b89a58_v1_2_10', json_data)
 
+    def iter_device_interfaces_by_specified_range(self,
+                                                  device_id,
+                                                  page_size=DEFAULT_PAGE_SIZE,
+                                                  workers=1,
+                                                  ordered=True,
+                                                  read_ahead=0,
+                                                  **request_parameters):
+        """Iterate over the interfaces of a device returned by
+        get_device_interfaces_by_specified_range, fetching them page by
+        page.
+
+        Slicing the result, as in `[start:stop]`, only requests that
+        range from DNA Center.
+
+        Args:
+            device_id(basestring): Device ID.
+            page_size(int): The number of records requested per page, at
+                most 500.
+            workers(int): The number of pages fetched concurrently. Above
+                1, the records are counted first to plan the pages.
+            ordered(bool): Yield the records in order. When False, the
+                pages are yielded as they are received.
+            read_ahead(int): The number of pages requested ahead of the
+                page being consumed, so that their download overlaps its
+                processing.
+            **request_parameters: The other parameters of
+                get_device_interfaces_by_specified_range, except
+                start_index and records_to_return.
+
+        Returns:
+            GeneratorContainer: The records, as MyDict objects.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the DNA Center cloud returns an error.
+        """
+        check_type(device_id, basestring,
+                   may_be_none=False)
+        request_parameters.update(device_id=device_id)
+        return range_paginated(self.get_device_interfaces_by_specified_range,
+                               request_parameters, page_size,
+                               count=self.get_device_interface_count_by_id,
+                               workers=workers, ordered=ordered,
+                               read_ahead=read_ahead)
+
     def delete_device_by_id(self,
                             id,
                             is_force_delete=None,
@@ -903,8 +994,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -976,8 +1068,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1177,8 +1270,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1245,8 +1339,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1323,8 +1418,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1396,8 +1492,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1494,8 +1591,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1566,8 +1664,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1639,8 +1738,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1707,8 +1807,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1779,8 +1880,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1847,8 +1949,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1914,8 +2017,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1998,8 +2102,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2071,8 +2176,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2143,8 +2249,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2215,8 +2322,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2289,8 +2397,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2361,8 +2470,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2439,8 +2549,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2455,6 +2566,43 @@ class Devices(object):
 
         return self._object_factory('bpm_f5947a4c439a8bf0_v1_2_10', json_data)
 
+    def iter_all_interfaces(self,
+                            page_size=DEFAULT_PAGE_SIZE,
+                            workers=1,
+                            ordered=True,
+                            read_ahead=0,
+                            **request_parameters):
+        """Iterate over the interfaces returned by get_all_interfaces, fetching
+        them page by page.
+
+        Slicing the result, as in `[start:stop]`, only requests that
+        range from DNA Center.
+
+        Args:
+            page_size(int): The number of records requested per page.
+            workers(int): The number of pages fetched concurrently. Above
+                1, the records are counted first to plan the pages.
+            ordered(bool): Yield the records in order. When False, the
+                pages are yielded as they are received.
+            read_ahead(int): The number of pages requested ahead of the
+                page being consumed, so that their download overlaps its
+                processing.
+            **request_parameters: The other parameters of
+                get_all_interfaces, except offset and limit.
+
+        Returns:
+            GeneratorContainer: The records, as MyDict objects.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the DNA Center cloud returns an error.
+        """
+        return paginated(self.get_all_interfaces,
+                         request_parameters, page_size,
+                         count=self.get_device_interface_count,
+                         workers=workers, ordered=ordered,
+                         read_ahead=read_ahead)
+
     def sync_devices(self,
                      cliTransport=None,
                      computeDevice=None,
@@ -2639,8 +2787,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2712,8 +2861,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2795,8 +2945,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2872,8 +3023,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2944,8 +3096,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -3040,8 +3193,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -3119,8 +3273,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -3136,6 +3291,44 @@ class Devices(object):
 
         return self._object_factory('bpm_f49548c54be8a3e2_v1_2_10', json_data)
 
+    def iter_network_device_by_pagination_range(self,
+                                                page_size=DEFAULT_PAGE_SIZE,
+                                                workers=1,
+                                                ordered=True,
+                                                read_ahead=0,
+                                                **request_parameters):
+        """Iterate over the network devices returned by
+        get_network_device_by_pagination_range, fetching them page by page.
+
+        Slicing the result, as in `[start:stop]`, only requests that
+        range from DNA Center.
+
+        Args:
+            page_size(int): The number of records requested per page, at
+                most 500.
+            workers(int): The number of pages fetched concurrently. Above
+                1, the records are counted first to plan the pages.
+            ordered(bool): Yield the records in order. When False, the
+                pages are yielded as they are received.
+            read_ahead(int): The number of pages requested ahead of the
+                page being consumed, so that their download overlaps its
+                processing.
+            **request_parameters: The other parameters of
+                get_network_device_by_pagination_range, except start_index and
+                records_to_return.
+
+        Returns:
+            GeneratorContainer: The records, as MyDict objects.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the DNA Center cloud returns an error.
+        """
+        return range_paginated(self.get_network_device_by_pagination_range,
+                               request_parameters, page_size,
+                               count=self.get_device_count, workers=workers,
+                               ordered=ordered, read_ahead=read_ahead)
+
     def retrieves_all_network_devices(self,
                                       associated_wlc_ip=None,
                                       collection_interval=None,
@@ -3312,8 +3505,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -3419,8 +3613,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -3491,8 +3686,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -3581,8 +3777,9 @@ class Devices(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -133,8 +133,9 @@ class FabricWired(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -212,8 +213,9 @@ class FabricWired(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -300,8 +302,9 @@ class FabricWired(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -34,6 +34,9 @@ from builtins import *
 
 from past.builtins import basestring
 
+from ...config import (
+    DEFAULT_DOWNLOAD_CHUNK_SIZE, DEFAULT_DOWNLOAD_SEGMENT_SIZE,
+)
 from ...restsession import RestSession
 from ...utils import (
     check_type,
@@ -121,8 +124,9 @@ class File(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -193,8 +197,9 @@ class File(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -214,9 +219,20 @@ class File(object):
                                   headers=None,
                                   payload=None,
                                   active_validation=True,
+                                  sink=None,
+                                  chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE,
+                                  hash_algorithms=None,
+                                  progress=None,
+                                  resume=False,
+                                  workers=1,
+                                  segment_size=DEFAULT_DOWNLOAD_SEGMENT_SIZE,
                                   **request_parameters):
         """Downloads a file specified by fileId.
 
+        The file is streamed to `sink`, `chunk_size` bytes at a time. A
+        download to a file path can be resumed, or split into concurrent
+        ranged requests.
+
         Args:
             file_id(basestring): File Identification number.
             headers(dict): Dictionary of HTTP Headers to send with the Request
@@ -225,17 +241,38 @@ class File(object):
                 body of the Request.
             active_validation(bool): Enable/Disable payload validation.
                 Defaults to True.
+            sink: None to save the file in the current directory, under the
+                name given by DNA Center; a directory to save it there, a
+                file path, a binary file object, or a callable receiving
+                each chunk of data.
+            chunk_size(int): The number of bytes read at a time.
+            hash_algorithms(list): The hashlib algorithms whose digests of
+                the file are computed while downloading, for example
+                ['md5', 'sha1'].
+            progress(callable): Called after each chunk with the number of
+                bytes received and the expected total (or None).
+            resume(bool): Keep the partial file of a failed download to a
+                file path, and request only the rest of the file on the
+                next call. Segmented downloads (`workers` > 1) cannot be
+                resumed.
+            workers(int): The number of concurrent ranged requests
+                downloading the file to a file path.
+            segment_size(int): The number of bytes per ranged request.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
         Returns:
-            MyDict: JSON response. Access the object's properties by using
-            the dot notation or the bracket notation.
+            DownloadResult: The file name, the path of the saved file, its
+            size and digests, and the response headers. Earlier releases
+            saved the file in the current directory and returned an
+            object holding no data instead.
 
         Raises:
             TypeError: If the parameter types are incorrect.
             MalformedRequest: If the request body created is invalid.
             ApiError: If the DNA Center cloud returns an error.
+            ValueError: If `resume` is combined with `workers` > 1.
+            dnacentersdkException: If the file cannot be written.
         """
         check_type(headers, dict)
         check_type(payload, dict)
@@ -264,21 +301,41 @@ class File(object):
             self._request_validator('jsd_9698c8ec4a0b8c1a_v1_2_10')\
                 .validate(_payload)
 
-        with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
-            with_custom_headers = True
 
         e_url = ('/dna/intent/api/v1/file/${fileId}')
         endpoint_full_url = apply_path_params(e_url, path_params)
-        if with_custom_headers:
-            json_data = self._session.get(endpoint_full_url, params=params,
-                                          json=_payload, headers=_headers,
-                                          stream=True)
-        else:
-            json_data = self._session.get(endpoint_full_url, params=params,
-                                          json=_payload,
-                                          stream=True)
+        return self._session.download(endpoint_full_url, sink=sink,
+                                      params=params, chunk_size=chunk_size,
+                                      hash_algorithms=hash_algorithms,
+                                      progress=progress, resume=resume,
+                                      workers=workers,
+                                      segment_size=segment_size,
+                                      json=_payload, headers=_headers)
+
+    def iter_file_content(self, file_id,
+                          chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE):
+        """Downloads a file specified by fileId, as a generator of chunks
+        of data.
 
-        return self._object_factory('bpm_9698c8ec4a0b8c1a_v1_2_10', json_data)
+        Args:
+            file_id(basestring): File Identification number.
+            chunk_size(int): The most bytes per chunk.
+
+        Returns:
+            generator: The content of the file, in chunks (bytes).
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the DNA Center cloud returns an error.
+        """
+        check_type(file_id, basestring,
+                   may_be_none=False)
+
+        e_url = ('/dna/intent/api/v1/file/${fileId}')
+        endpoint_full_url = apply_path_params(e_url, {'fileId': file_id})
+        return self._session.iter_download(endpoint_full_url,
+                                           chunk_size=chunk_size)
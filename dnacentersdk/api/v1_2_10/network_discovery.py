@@ -34,6 +34,8 @@ from builtins import *
 
 from past.builtins import basestring
 
+from ...config import DEFAULT_PAGE_SIZE
+from ...pagination import range_paginated
 from ...restsession import RestSession
 from ...utils import (
     check_type,
@@ -121,8 +123,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -189,8 +192,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -295,8 +299,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -426,8 +431,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -494,8 +500,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -568,8 +575,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -786,8 +794,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -855,8 +864,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -925,8 +935,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1046,8 +1057,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1128,8 +1140,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1207,8 +1220,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1224,6 +1238,45 @@ class NetworkDiscovery(object):
 
         return self._object_factory('bpm_33b799d04d0a8907_v1_2_10', json_data)
 
+    def iter_discoveries_by_range(self,
+                                  page_size=DEFAULT_PAGE_SIZE,
+                                  workers=1,
+                                  ordered=True,
+                                  read_ahead=0,
+                                  **request_parameters):
+        """Iterate over the discoveries returned by get_discoveries_by_range,
+        fetching them page by page.
+
+        Slicing the result, as in `[start:stop]`, only requests that
+        range from DNA Center.
+
+        Args:
+            page_size(int): The number of records requested per page, at
+                most 500.
+            workers(int): The number of pages fetched concurrently. Above
+                1, the records are counted first to plan the pages.
+            ordered(bool): Yield the records in order. When False, the
+                pages are yielded as they are received.
+            read_ahead(int): The number of pages requested ahead of the
+                page being consumed, so that their download overlaps its
+                processing.
+            **request_parameters: The other parameters of
+                get_discoveries_by_range, except start_index and
+                records_to_return.
+
+        Returns:
+            GeneratorContainer: The records, as MyDict objects.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the DNA Center cloud returns an error.
+        """
+        return range_paginated(self.get_discoveries_by_range,
+                               request_parameters, page_size,
+                               count=self.get_count_of_all_discovery_jobs,
+                               workers=workers, ordered=ordered,
+                               read_ahead=read_ahead)
+
     def create_snmp_read_community(self,
                                    headers=None,
                                    payload=None,
@@ -1276,8 +1329,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1351,8 +1405,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1580,8 +1635,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1649,8 +1705,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1755,8 +1812,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1847,8 +1905,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1915,8 +1974,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2004,8 +2064,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2094,8 +2155,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2111,6 +2173,50 @@ class NetworkDiscovery(object):
 
         return self._object_factory('bpm_a6b798ab4acaa34e_v1_2_10', json_data)
 
+    def iter_discovered_devices_by_range(self,
+                                         id,
+                                         page_size=DEFAULT_PAGE_SIZE,
+                                         workers=1,
+                                         ordered=True,
+                                         read_ahead=0,
+                                         **request_parameters):
+        """Iterate over the devices found by a discovery returned by
+        get_discovered_devices_by_range, fetching them page by page.
+
+        Slicing the result, as in `[start:stop]`, only requests that
+        range from DNA Center.
+
+        Args:
+            id(basestring): Discovery ID.
+            page_size(int): The number of records requested per page, at
+                most 500.
+            workers(int): The number of pages fetched concurrently. Above
+                1, the records are counted first to plan the pages.
+            ordered(bool): Yield the records in order. When False, the
+                pages are yielded as they are received.
+            read_ahead(int): The number of pages requested ahead of the
+                page being consumed, so that their download overlaps its
+                processing.
+            **request_parameters: The other parameters of
+                get_discovered_devices_by_range, except start_index and
+                records_to_return.
+
+        Returns:
+            GeneratorContainer: The records, as MyDict objects.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the DNA Center cloud returns an error.
+        """
+        check_type(id, basestring,
+                   may_be_none=False)
+        request_parameters.update(id=id)
+        return range_paginated(self.get_discovered_devices_by_range,
+                               request_parameters, page_size,
+                               count=self.get_devices_discovered_by_id,
+                               workers=workers, ordered=ordered,
+                               read_ahead=read_ahead)
+
     def get_credential_sub_type_by_credential_id(self,
                                                  id,
                                                  headers=None,
@@ -2167,8 +2273,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2283,8 +2390,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2361,8 +2469,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2430,8 +2539,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2534,8 +2644,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2602,8 +2713,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2675,8 +2787,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2792,8 +2905,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2904,8 +3018,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2973,8 +3088,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -3053,8 +3169,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -3132,8 +3249,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -3218,8 +3336,9 @@ class NetworkDiscovery(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -34,6 +34,8 @@ from builtins import *
 
 from past.builtins import basestring
 
+from ...config import DEFAULT_PAGE_SIZE
+from ...pagination import paginated
 from ...restsession import RestSession
 from ...utils import (
     check_type,
@@ -132,8 +134,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -201,8 +204,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -357,8 +361,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -434,8 +439,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -565,8 +571,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -680,8 +687,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -769,8 +777,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -854,8 +863,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -922,8 +932,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -994,8 +1005,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1122,8 +1134,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1195,8 +1208,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1299,8 +1313,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1367,8 +1382,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1451,8 +1467,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1580,8 +1597,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1684,8 +1702,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1756,8 +1775,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1828,8 +1848,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1902,8 +1923,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1989,8 +2011,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2102,8 +2125,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2267,8 +2291,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2283,6 +2308,42 @@ class Pnp(object):
 
         return self._object_factory('bpm_e6b3db8046c99654_v1_2_10', json_data)
 
+    def iter_device_list(self,
+                         page_size=DEFAULT_PAGE_SIZE,
+                         workers=1,
+                         ordered=True,
+                         read_ahead=0,
+                         **request_parameters):
+        """Iterate over the PnP devices returned by get_device_list, fetching
+        them page by page.
+
+        Slicing the result, as in `[start:stop]`, only requests that
+        range from DNA Center.
+
+        Args:
+            page_size(int): The number of records requested per page.
+            workers(int): The number of pages fetched concurrently. Above
+                1, the records are counted first to plan the pages.
+            ordered(bool): Yield the records in order. When False, the
+                pages are yielded as they are received.
+            read_ahead(int): The number of pages requested ahead of the
+                page being consumed, so that their download overlaps its
+                processing.
+            **request_parameters: The other parameters of
+                get_device_list, except offset and limit.
+
+        Returns:
+            GeneratorContainer: The records, as MyDict objects.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the DNA Center cloud returns an error.
+        """
+        return paginated(self.get_device_list,
+                         request_parameters, page_size, first_offset=0,
+                         count=self.get_device_count, workers=workers,
+                         ordered=ordered, read_ahead=read_ahead)
+
     def add_a_workflow(self,
                        _id=None,
                        addToInventory=None,
@@ -2418,8 +2479,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2558,8 +2620,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2644,8 +2707,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2660,6 +2724,40 @@ class Pnp(object):
 
         return self._object_factory('bpm_f09319674049a7d4_v1_2_10', json_data)
 
+    def iter_device_history(self,
+                            serial_number,
+                            page_size=DEFAULT_PAGE_SIZE,
+                            read_ahead=0,
+                            **request_parameters):
+        """Iterate over the history events of a PnP device returned by
+        get_device_history, fetching them page by page.
+
+        Slicing the result, as in `[start:stop]`, only requests that
+        range from DNA Center.
+
+        Args:
+            serial_number(basestring): Device Serial Number.
+            page_size(int): The number of records requested per page.
+            read_ahead(int): The number of pages requested ahead of the
+                page being consumed, so that their download overlaps its
+                processing.
+            **request_parameters: The other parameters of
+                get_device_history, except offset and limit.
+
+        Returns:
+            GeneratorContainer: The records, as MyDict objects.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the DNA Center cloud returns an error.
+        """
+        check_type(serial_number, basestring,
+                   may_be_none=False)
+        request_parameters.update(serial_number=serial_number)
+        return paginated(self.get_device_history,
+                         request_parameters, page_size, first_offset=0,
+                         read_ahead=read_ahead)
+
     def delete_device_by_id_from_pnp(self,
                                      id,
                                      headers=None,
@@ -2716,8 +2814,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -2825,8 +2924,9 @@ class Pnp(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -34,6 +34,8 @@ from builtins import *
 
 from past.builtins import basestring
 
+from ...config import DEFAULT_PAGE_SIZE
+from ...pagination import paginated
 from ...restsession import RestSession
 from ...utils import (
     check_type,
@@ -130,8 +132,9 @@ class Tag(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -220,8 +223,9 @@ class Tag(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -316,8 +320,9 @@ class Tag(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -384,8 +389,9 @@ class Tag(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -468,8 +474,9 @@ class Tag(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -565,8 +572,9 @@ class Tag(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -664,8 +672,9 @@ class Tag(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -736,8 +745,9 @@ class Tag(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -814,8 +824,9 @@ class Tag(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -925,8 +936,9 @@ class Tag(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -941,6 +953,51 @@ class Tag(object):
 
         return self._object_factory('bpm_eab7abe048fb99ad_v1_2_10', json_data)
 
+    def iter_tag_members_by_id(self,
+                               id,
+                               member_type,
+                               page_size=DEFAULT_PAGE_SIZE,
+                               workers=1,
+                               ordered=True,
+                               read_ahead=0,
+                               **request_parameters):
+        """Iterate over the members of a tag returned by get_tag_members_by_id,
+        fetching them page by page.
+
+        Slicing the result, as in `[start:stop]`, only requests that
+        range from DNA Center.
+
+        Args:
+            id(basestring): Tag ID.
+            member_type(basestring): Entity type of the member.
+            page_size(int): The number of records requested per page.
+            workers(int): The number of pages fetched concurrently. Above
+                1, the records are counted first to plan the pages.
+            ordered(bool): Yield the records in order. When False, the
+                pages are yielded as they are received.
+            read_ahead(int): The number of pages requested ahead of the
+                page being consumed, so that their download overlaps its
+                processing.
+            **request_parameters: The other parameters of
+                get_tag_members_by_id, except offset and limit.
+
+        Returns:
+            GeneratorContainer: The records, as MyDict objects.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the DNA Center cloud returns an error.
+        """
+        check_type(id, basestring,
+                   may_be_none=False)
+        check_type(member_type, basestring,
+                   may_be_none=False)
+        request_parameters.update(id=id, member_type=member_type)
+        return paginated(self.get_tag_members_by_id,
+                         request_parameters, page_size, offset_type=str,
+                         count=self.get_tag_member_count, workers=workers,
+                         ordered=ordered, read_ahead=read_ahead)
+
     def get_tag_by_id(self,
                       id,
                       headers=None,
@@ -997,8 +1054,9 @@ class Tag(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -1127,8 +1185,9 @@ class Tag(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -34,6 +34,8 @@ from builtins import *
 
 from past.builtins import basestring
 
+from ...config import DEFAULT_PAGE_SIZE
+from ...pagination import paginated
 from ...restsession import RestSession
 from ...utils import (
     check_type,
@@ -179,8 +181,9 @@ class Task(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -251,8 +254,9 @@ class Task(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -396,8 +400,9 @@ class Task(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -412,6 +417,42 @@ class Task(object):
 
         return self._object_factory('bpm_e78bb8a2449b9eed_v1_2_10', json_data)
 
+    def iter_tasks(self,
+                   page_size=DEFAULT_PAGE_SIZE,
+                   workers=1,
+                   ordered=True,
+                   read_ahead=0,
+                   **request_parameters):
+        """Iterate over the tasks returned by get_tasks, fetching them page by
+        page.
+
+        Slicing the result, as in `[start:stop]`, only requests that
+        range from DNA Center.
+
+        Args:
+            page_size(int): The number of records requested per page.
+            workers(int): The number of pages fetched concurrently. Above
+                1, the records are counted first to plan the pages.
+            ordered(bool): Yield the records in order. When False, the
+                pages are yielded as they are received.
+            read_ahead(int): The number of pages requested ahead of the
+                page being consumed, so that their download overlaps its
+                processing.
+            **request_parameters: The other parameters of
+                get_tasks, except offset and limit.
+
+        Returns:
+            GeneratorContainer: The records, as MyDict objects.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the DNA Center cloud returns an error.
+        """
+        return paginated(self.get_tasks,
+                         request_parameters, page_size, offset_type=str,
+                         count=self.get_task_count, workers=workers,
+                         ordered=ordered, read_ahead=read_ahead)
+
     def get_task_tree(self,
                       task_id,
                       headers=None,
@@ -468,8 +509,9 @@ class Task(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -552,8 +594,9 @@ class Task(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
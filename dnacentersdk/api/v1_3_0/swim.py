@@ -34,6 +34,7 @@ from builtins import *
 
 from past.builtins import basestring
 
+from ...config import DEFAULT_UPLOAD_CHUNK_SIZE, DEFAULT_UPLOAD_RETRIES
 from ...restsession import RestSession
 from ...utils import (
     check_type,
@@ -215,8 +216,9 @@ class Swim(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -285,8 +287,9 @@ class Swim(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -438,6 +441,86 @@ class Swim(object):
 
         return self._object_factory('bpm_4dbe3bc743a891bc_v1_3_0', json_data)
 
+    def import_local_software_image_file(self,
+                                         file_path,
+                                         is_third_party=None,
+                                         third_party_application_type=None,
+                                         third_party_image_family=None,
+                                         third_party_vendor=None,
+                                         chunk_size=DEFAULT_UPLOAD_CHUNK_SIZE,
+                                         hash_algorithms=None,
+                                         progress=None,
+                                         retries=DEFAULT_UPLOAD_RETRIES,
+                                         headers=None,
+                                         **request_parameters):
+        """Uploads a software image to DNA Center from its path, as
+        import_local_software_image does.
+
+        The image is streamed from the file, `chunk_size` bytes at a time,
+        so that the memory used does not depend on its size; its digests
+        are computed while it is sent. The image is sent again when the
+        connection fails before DNA Center answers.
+
+        Args:
+            file_path(basestring): The path of the image file.
+            is_third_party(bool): Third party Image check.
+            third_party_application_type(basestring): Third Party
+                Application Type.
+            third_party_image_family(basestring): Third Party image
+                family.
+            third_party_vendor(basestring): Third Party Vendor.
+            chunk_size(int): The number of bytes read at a time.
+            hash_algorithms(list): The hashlib algorithms whose digests of
+                the image are computed, for example ['md5'].
+            progress(callable): Called after each chunk with the number of
+                bytes sent and the size of the image.
+            retries(int): The number of times the image is sent again
+                after a connection failure.
+            headers(dict): Dictionary of HTTP Headers to send with the Request
+                .
+            **request_parameters: Additional request parameters (provides
+                support for parameters that may be added in the future).
+
+        Returns:
+            UploadResult: The JSON response, as a MyDict object, and the
+            size and digests of the image.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the DNA Center cloud returns an error.
+            dnacentersdkException: If the image cannot be sent.
+        """
+        check_type(headers, dict)
+        check_type(file_path, basestring,
+                   may_be_none=False)
+        check_type(is_third_party, bool)
+        check_type(third_party_vendor, basestring)
+        check_type(third_party_image_family, basestring)
+        check_type(third_party_application_type, basestring)
+
+        params = {
+            'isThirdParty':
+                is_third_party,
+            'thirdPartyVendor':
+                third_party_vendor,
+            'thirdPartyImageFamily':
+                third_party_image_family,
+            'thirdPartyApplicationType':
+                third_party_application_type,
+        }
+        params.update(request_parameters)
+        params = dict_from_items_with_values(params)
+
+        e_url = ('/dna/intent/api/v1/image/importation/source/file')
+        result = self._session.upload(e_url, file_path, params=params,
+                                      chunk_size=chunk_size,
+                                      hash_algorithms=hash_algorithms,
+                                      progress=progress, retries=retries,
+                                      headers=headers)
+        return result._replace(response=self._object_factory(
+            'bpm_4dbe3bc743a891bc_v1_3_0', result.response
+        ))
+
     def trigger_software_image_activation(self,
                                           schedule_validate=None,
                                           headers=None,
@@ -505,8 +588,9 @@ class Swim(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
@@ -597,8 +681,9 @@ class Swim(object):
                 .validate(_payload)
 
         with_custom_headers = False
-        _headers = self._session.headers or {}
+        _headers = None
         if headers:
+            _headers = self._session.headers or {}
             _headers.update(headers)
             with_custom_headers = True
 
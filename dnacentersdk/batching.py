@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""Batching of per-device lookups into network device list queries.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import collections
+import threading
+from builtins import *
+from concurrent.futures import Future
+
+from past.builtins import basestring
+
+from .bulk import bulk
+from .config import DEFAULT_BULK_WORKERS
+from .exceptions import dnacentersdkException
+from .pagination import page_records
+from .utils import check_type
+
+
+DEFAULT_MAX_BATCH = 100
+
+# Lookup fields: the get_device_list argument and the record key
+LOOKUP_FIELDS = {
+    'id': 'id',
+    'serial_number': 'serialNumber',
+    'management_ip_address': 'managementIpAddress',
+    'hostname': 'hostname',
+    'mac_address': 'macAddress',
+}
+
+# The lookup fields accepting comma-separated values in one query
+MULTI_VALUE_FIELDS = ('id',)
+
+
+class DeviceLookupBatcher(object):
+    """Merge per-device lookups into few get_device_list queries.
+
+    Each lookup returns a :class:`concurrent.futures.Future` resolved with
+    the device record, as in the `response` of `get_device_by_id`. The
+    pending lookups are sent when :meth:`flush` is called, when the batcher
+    is closed (at the end of its `with` block), when `max_batch` lookups of
+    a field are pending, or `window` seconds after the first pending lookup
+    when a window is set::
+
+        with api.batching() as batch:
+            futures = [batch.get_device_by_id(i) for i in device_ids]
+        devices = [future.result() for future in futures]
+
+    Lookups by id are merged into queries of up to `max_batch` comma-separated
+    ids. The other fields only take one value per query: their pending
+    lookups are sent as one query per distinct value, `workers` at a time.
+    Looked up values are matched exactly; a lookup whose device is not
+    found fails with a dnacentersdkException.
+    """
+
+    def __init__(self, devices, window=None, max_batch=DEFAULT_MAX_BATCH,
+                 workers=DEFAULT_BULK_WORKERS):
+        """Initialize a new DeviceLookupBatcher object.
+
+        Args:
+            devices: The Devices API wrapper of a DNACenterAPI object.
+            window(float,int): Send the pending lookups this many seconds
+                after the first one, from a background thread. By default
+                they are only sent by :meth:`flush` and :meth:`close`.
+            max_batch(int): The most ids per get_device_list query, and the
+                most pending lookups of a field sent together.
+            workers(int): The most concurrent queries of single-value
+                fields.
+
+        """
+        check_type(window, (float, int))
+        check_type(max_batch, int, may_be_none=False)
+        check_type(workers, int, may_be_none=False)
+        if max_batch <= 0 or workers <= 0:
+            raise ValueError('max_batch and workers must be positive')
+
+        self._devices = devices
+        self.window = window
+        self.max_batch = max_batch
+        self.workers = workers
+        self.stats = collections.Counter()
+        self._pending = collections.defaultdict(collections.OrderedDict)
+        self._lock = threading.Lock()
+        self._timer = None
+        self._closed = False
+
+    def lookup(self, field, value):
+        """Look up the device whose `field` equals `value`.
+
+        Args:
+            field(basestring): One of the keys of LOOKUP_FIELDS.
+            value(basestring): The value of the field.
+
+        Returns:
+            concurrent.futures.Future: Resolved with the device record.
+
+        """
+        check_type(field, basestring, may_be_none=False)
+        check_type(value, basestring, may_be_none=False)
+        if field not in LOOKUP_FIELDS:
+            raise ValueError('Unsupported lookup field {}'.format(field))
+        if field in MULTI_VALUE_FIELDS and ',' in value:
+            raise ValueError('Lookup values may not contain commas')
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise dnacentersdkException('The batcher is closed')
+            self.stats['lookups'] += 1
+            pending = self._pending[field]
+            pending.setdefault(value, []).append(future)
+            full = len(pending) >= self.max_batch
+            if self.window is not None and self._timer is None and not full:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self._send(field)
+        return future
+
+    def get_device_by_id(self, id):
+        """Look up a device by its id."""
+        return self.lookup('id', id)
+
+    def get_device_by_serial_number(self, serial_number):
+        """Look up a device by its serial number."""
+        return self.lookup('serial_number', serial_number)
+
+    def get_network_device_by_ip(self, ip_address):
+        """Look up a device by its management IP address."""
+        return self.lookup('management_ip_address', ip_address)
+
+    def get_device_by_hostname(self, hostname):
+        """Look up a device by its hostname."""
+        return self.lookup('hostname', hostname)
+
+    def flush(self):
+        """Send every pending lookup."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            fields = list(self._pending)
+        for field in fields:
+            self._send(field)
+
+    def _send(self, field):
+        while True:
+            with self._lock:
+                pending = self._pending[field]
+                if not pending:
+                    return
+                batch = collections.OrderedDict()
+                while pending and len(batch) < self.max_batch:
+                    value, futures = pending.popitem(last=False)
+                    batch[value] = futures
+            self._query(field, batch)
+
+    def _query(self, field, batch):
+        if field in MULTI_VALUE_FIELDS:
+            # Sent as one comma-separated list of values
+            queries = [list(batch)]
+        else:
+            queries = [[value] for value in batch]
+        for outcome in bulk(self._get_devices(field), queries,
+                            workers=self.workers):
+            values = outcome.arguments
+            if outcome.error is not None:
+                for value in values:
+                    for future in batch[value]:
+                        future.set_exception(outcome.error)
+                continue
+            key = LOOKUP_FIELDS[field]
+            found = {}
+            for record in outcome.result:
+                if record is not None:
+                    found.setdefault(record.get(key), record)
+            for value in values:
+                record = found.get(value)
+                for future in batch[value]:
+                    if record is None:
+                        future.set_exception(dnacentersdkException(
+                            'No device with {} {}'.format(field, value)
+                        ))
+                    else:
+                        future.set_result(record)
+
+    def _get_devices(self, field):
+        def get_devices(*values):
+            with self._lock:
+                self.stats['requests'] += 1
+            data = self._devices.get_device_list(**{field: ','.join(values)})
+            return list(page_records(data))
+        return get_devices
+
+    def close(self):
+        """Send the pending lookups and stop accepting new ones."""
+        with self._lock:
+            self._closed = True
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""Bounded-concurrency fan-out of API calls.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import collections
+from builtins import *
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .config import DEFAULT_BULK_WORKERS
+from .utils import check_type
+
+
+BulkResult = collections.namedtuple(
+    'BulkResult', ['index', 'arguments', 'result', 'error']
+)
+"""The outcome of one call made by :func:`bulk`: the position and the
+arguments of the call, and its result, or the exception it raised (in
+which case `result` is None)."""
+
+
+def _call(function, arguments):
+    if isinstance(arguments, dict):
+        return function(**arguments)
+    if isinstance(arguments, (list, tuple)):
+        return function(*arguments)
+    return function(arguments)
+
+
+def _outcome(future, index, arguments):
+    try:
+        return BulkResult(index, arguments, future.result(), None)
+    except Exception as e:
+        return BulkResult(index, arguments, None, e)
+
+
+def bulk(function, arguments, workers=DEFAULT_BULK_WORKERS, ordered=False):
+    """Call `function` once per item of `arguments`, concurrently.
+
+    At most `workers` calls are in flight; `arguments` is consumed lazily,
+    so it may be a generator over many items. An exception raised by a call
+    is returned in its result instead of stopping the other calls.
+
+    The calls share the API session, so a rate limit response received by
+    one of them pauses all of them for its `Retry-After` delay before they
+    are retried (when `wait_on_rate_limit` is enabled).
+
+    The connection pool of the session keeps up to its `pool_size`
+    connections open, so more `workers` than that open and close extra
+    connections; :meth:`DNACenterAPI.bulk` caps `workers` at the pool size.
+
+    The arguments are checked when bulk is called; the calls start when
+    the results are first iterated.
+
+    Args:
+        function(callable): The API wrapper method to call, for example
+            `api.devices.get_device_by_id`.
+        arguments(iterable): The arguments of each call: a dict of keyword
+            arguments, a tuple or list of positional arguments, or a single
+            positional argument.
+        workers(int): The maximum number of concurrent calls.
+        ordered(bool): Yield the results in the order of `arguments`; by
+            default they are yielded as soon as they complete.
+
+    Returns:
+        generator: The :class:`BulkResult` of each call.
+
+    Raises:
+        TypeError: If the parameter types are incorrect.
+        ValueError: If `workers` is not positive.
+
+    """
+    check_type(workers, int, may_be_none=False)
+    check_type(ordered, bool, may_be_none=False)
+    if workers <= 0:
+        raise ValueError('workers must be positive')
+
+    return _bulk(function, arguments, workers, ordered)
+
+
+def _bulk(function, arguments, workers, ordered):
+    items = enumerate(arguments)
+    pending = collections.OrderedDict()
+    executor = ThreadPoolExecutor(workers)
+
+    def submit():
+        item = next(items, None)
+        if item is not None:
+            future = executor.submit(_call, function, item[1])
+            pending[future] = item
+
+    try:
+        for _ in range(workers):
+            submit()
+        while pending:
+            if ordered:
+                done = [next(iter(pending))]
+            else:
+                done = wait(pending, return_when=FIRST_COMPLETED).done
+            for future in done:
+                index, item = pending.pop(future)
+                submit()
+                yield _outcome(future, index, item)
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
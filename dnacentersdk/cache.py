@@ -0,0 +1,469 @@
+# -*- coding: utf-8 -*-
+"""Opt-in cache for the GET responses of a RestSession.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+from future import standard_library
+standard_library.install_aliases()
+
+import collections
+import re
+import threading
+import time
+import urllib.parse
+from builtins import *
+
+from past.builtins import basestring
+
+from .utils import check_type
+
+
+DEFAULT_CACHE_MAXSIZE = 1024
+
+# Request headers that do not change the response
+_IGNORED_HEADERS = frozenset(['x-auth-token', 'content-type', 'accept',
+                              'accept-encoding', 'connection',
+                              'user-agent'])
+
+
+INTENT_API = '/dna/intent/api/v1'
+
+TASK_STATUS_TEMPLATE = INTENT_API + '/task/${taskId}'
+EXECUTION_STATUS_TEMPLATE = \
+    '/dna/platform/management/business-api/v1/execution-status/${executionId}'
+
+_DEVICE_READS = [
+    INTENT_API + '/network-device',
+    INTENT_API + '/network-device/count',
+    INTENT_API + '/network-device/${id}',
+    INTENT_API + '/network-device/serial-number/${serialNumber}',
+    INTENT_API + '/network-device/ip-address/${ipAddress}',
+    INTENT_API + '/network-device/${startIndex}/${recordsToReturn}',
+    INTENT_API + '/device-detail',
+]
+_INVENTORY_READS = _DEVICE_READS + [
+    INTENT_API + '/interface',
+    INTENT_API + '/interface/count',
+    INTENT_API + '/interface/network-device/${id}',
+    INTENT_API + '/interface/network-device/${id}/count',
+    INTENT_API + '/topology/vlan/vlan-names',
+]
+_SITE_READS = [
+    INTENT_API + '/site',
+    INTENT_API + '/site/count',
+    INTENT_API + '/site-health',
+]
+_TAG_READS = [
+    INTENT_API + '/tag',
+    INTENT_API + '/tag/count',
+    INTENT_API + '/tag/${id}',
+]
+_TAG_MEMBER_READS = [
+    INTENT_API + '/tag/${id}/member',
+    INTENT_API + '/tag/${id}/member/count',
+]
+_CREDENTIAL_READS = [
+    INTENT_API + '/global-credential',
+    INTENT_API + '/global-credential/${globalCredentialId}',
+]
+
+DEFAULT_INVALIDATIONS = {
+    ('POST', INTENT_API + '/network-device'): _INVENTORY_READS,
+    ('PUT', INTENT_API + '/network-device'): _DEVICE_READS,
+    ('PUT', INTENT_API + '/network-device/sync'): _DEVICE_READS,
+    ('PUT', INTENT_API + '/network-device/brief'): _DEVICE_READS,
+    ('DELETE', INTENT_API + '/network-device/${id}'): _INVENTORY_READS,
+    ('POST', '/dna/system/api/v1/site/${siteId}/device'): _DEVICE_READS,
+    ('POST', INTENT_API + '/site/${siteId}/device'): _DEVICE_READS,
+    ('POST', INTENT_API + '/site'): _SITE_READS,
+    ('POST', '/dna/system/api/v1/site'): _SITE_READS,
+    ('PUT', INTENT_API + '/site/${siteId}'): _SITE_READS,
+    ('DELETE', INTENT_API + '/site/${siteId}'): _SITE_READS,
+    ('POST', INTENT_API + '/tag'): _TAG_READS,
+    ('PUT', INTENT_API + '/tag'): _TAG_READS,
+    ('DELETE', INTENT_API + '/tag/${id}'): _TAG_READS + _TAG_MEMBER_READS,
+    ('POST', INTENT_API + '/tag/${id}/member'): _TAG_MEMBER_READS,
+    ('DELETE', INTENT_API + '/tag/${id}/member/${memberId}'):
+        _TAG_MEMBER_READS,
+    ('PUT', INTENT_API + '/tag/member'): _TAG_MEMBER_READS,
+    ('POST', INTENT_API + '/global-credential/${type}'): _CREDENTIAL_READS,
+    ('PUT', INTENT_API + '/global-credential/${type}'): _CREDENTIAL_READS,
+    ('DELETE', INTENT_API + '/global-credential/${globalCredentialId}'):
+        _CREDENTIAL_READS,
+}
+"""Maps write endpoints (method, URL template) to the GET URL templates
+whose cached responses they make stale."""
+
+# The most async operations remembered until their completion
+_MAX_PENDING = 1024
+
+
+def _template_regex(template):
+    """Compile a URL template; `${name}` placeholders become named groups."""
+    pattern = re.sub(r'\\\$\\\{([^/]*?)\\\}', r'(?P<\1>[^/]+)',
+                     re.escape(template))
+    return re.compile('^' + pattern + '/?$')
+
+
+def _scalar_fields(payload):
+    if not isinstance(payload, dict):
+        return {}
+    return dict((k, str(v)) for k, v in payload.items()
+                if isinstance(v, (basestring, int)))
+
+
+class CacheEntry(object):
+    """A cached response."""
+
+    __slots__ = ('data', 'expires', 'etag', 'last_modified', 'template')
+
+    def __init__(self, data, expires, etag=None, last_modified=None,
+                 template=None):
+        self.data = data
+        self.expires = expires
+        self.etag = etag
+        self.last_modified = last_modified
+        self.template = template
+
+    @property
+    def fresh(self):
+        """Whether the entry can be used without contacting DNA Center."""
+        return time.time() < self.expires
+
+    def conditional_headers(self):
+        """The headers that revalidate a stale entry."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache(object):
+    """A size-bounded, time-to-live cache of parsed GET responses.
+
+    Only the URL templates given a TTL are cached, for example::
+
+        session.cache = ResponseCache(ttls={
+            '/dna/intent/api/v1/site': 300,
+            '/dna/intent/api/v1/network-device/${id}': 60,
+        })
+
+    Entries are keyed on the URL, the query parameters and the request
+    headers (except the access token). When an expired entry carries an
+    `ETag` or `Last-Modified` header, it is revalidated with a conditional
+    request, and reused if DNA Center answers 304 Not Modified. The least
+    recently used entries are evicted beyond `maxsize` entries.
+
+    Successful write requests remove the cached responses they make stale,
+    following the `invalidations` map; the path parameters and the scalar
+    body fields of the write narrow it down, so that deleting a device only
+    removes that device from the per-device entries. Writes that start an
+    asynchronous task (or site execution) invalidate again when the task
+    status, polled through the session, reports its completion.
+
+    The cached data is shared between callers; the default object factory
+    copies it into new objects.
+    """
+
+    def __init__(self, ttls=None, default_ttl=None,
+                 maxsize=DEFAULT_CACHE_MAXSIZE,
+                 invalidations=DEFAULT_INVALIDATIONS):
+        """Initialize a new ResponseCache object.
+
+        Args:
+            ttls(dict): Maps URL templates (the endpoint paths, with
+                `${name}` placeholders) to time-to-live values in seconds.
+            default_ttl(int,float): The time-to-live of the responses of the
+                other GET endpoints. By default they are not cached.
+            maxsize(int): The maximum number of cached responses.
+            invalidations(dict): Maps write endpoints, as (method, URL
+                template) tuples, to the GET URL templates they make stale.
+                Defaults to DEFAULT_INVALIDATIONS.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(ttls, dict)
+        check_type(default_ttl, (int, float))
+        check_type(maxsize, int, may_be_none=False)
+        check_type(invalidations, dict)
+
+        self.default_ttl = default_ttl
+        self.maxsize = maxsize
+        self.stats = collections.Counter()
+        """Counters: `hits`, `misses`, `revalidations` (conditional
+        requests), `revalidated` (304 responses), `stores`, `evictions` and
+        `invalidations` (entries removed after writes)."""
+
+        self._ttls = []
+        self._entries = collections.OrderedDict()
+        self._invalidations = []
+        self._pending = collections.OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        for template, ttl in (ttls or {}).items():
+            self.set_ttl(template, ttl)
+        for (method, template), targets in (invalidations or {}).items():
+            self.add_invalidation(method, template, targets)
+
+    def set_ttl(self, template, ttl):
+        """Set the time-to-live of the responses of a URL template.
+
+        Args:
+            template(basestring): The endpoint path, with `${name}`
+                placeholders.
+            ttl(int,float): Seconds; None or 0 disables caching.
+
+        """
+        check_type(template, basestring, may_be_none=False)
+        check_type(ttl, (int, float))
+        with self._lock:
+            self._ttls = [t for t in self._ttls if t[0] != template]
+            self._ttls.append((template, _template_regex(template), ttl))
+
+    def template_for(self, url):
+        """The configured URL template matching `url`, or None."""
+        path = urllib.parse.urlsplit(url).path
+        for template, regex, _ in self._ttls:
+            if regex.match(path):
+                return template
+        return None
+
+    def ttl_for(self, url):
+        """The time-to-live of the responses of `url`, or None."""
+        path = urllib.parse.urlsplit(url).path
+        for _, regex, ttl in self._ttls:
+            if regex.match(path):
+                return ttl
+        return self.default_ttl
+
+    @staticmethod
+    def key(url, params=None, headers=None):
+        """The cache key of a GET request."""
+        params = tuple(sorted(
+            (k, tuple(v) if isinstance(v, (list, tuple)) else v)
+            for k, v in (params or {}).items() if v is not None
+        ))
+        headers = tuple(sorted(
+            (k.lower(), v) for k, v in (headers or {}).items()
+            if k.lower() not in _IGNORED_HEADERS
+        ))
+        return url, params, headers
+
+    def lookup(self, key):
+        """Return the entry of `key`, fresh or stale, or None.
+
+        A fresh entry counts as a hit and a stale entry that can be
+        revalidated as a revalidation; a missing entry, or a stale entry
+        that cannot be revalidated, counts as a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            # Move the entry to the most recently used end
+            self._entries[key] = self._entries.pop(key)
+            if entry.fresh:
+                self.stats['hits'] += 1
+            elif entry.etag or entry.last_modified:
+                self.stats['revalidations'] += 1
+            else:
+                self.stats['misses'] += 1
+                return None
+            return entry
+
+    @property
+    def generation(self):
+        """A counter incremented by every invalidation."""
+        return self._generation
+
+    def store(self, key, data, ttl, etag=None, last_modified=None,
+              generation=None):
+        """Cache the parsed response of `key` for `ttl` seconds.
+
+        The response is not cached if an invalidation happened since
+        `generation` (the :attr:`generation` read before sending the
+        request), as it may predate a write.
+        """
+        entry = CacheEntry(data, time.time() + ttl, etag, last_modified,
+                           self.template_for(key[0]))
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return entry
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            self.stats['stores'] += 1
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+        return entry
+
+    def revalidated(self, entry, ttl):
+        """Extend a stale entry that DNA Center reported as not modified."""
+        with self._lock:
+            entry.expires = time.time() + ttl
+            self.stats['revalidated'] += 1
+        return entry
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def add_invalidation(self, method, template, targets):
+        """Make a write endpoint invalidate GET URL templates.
+
+        Args:
+            method(basestring): The HTTP method of the write.
+            template(basestring): The URL template of the write.
+            targets(list): The GET URL templates it makes stale.
+
+        """
+        check_type(method, basestring, may_be_none=False)
+        check_type(template, basestring, may_be_none=False)
+        check_type(targets, (list, tuple), may_be_none=False)
+        with self._lock:
+            self._invalidations.append((
+                method.upper(), _template_regex(template),
+                [_template_regex(t) for t in targets],
+            ))
+
+    def invalidate(self, template=None, **params):
+        """Remove the cached responses of a URL template.
+
+        Args:
+            template(basestring): A URL template; every response is removed
+                when it is None.
+            **params: Only remove the responses whose path parameters of the
+                same names have these values.
+
+        Returns:
+            int: The number of removed responses.
+
+        """
+        if template is None:
+            count = len(self._entries)
+            self.clear()
+            return count
+        return self._invalidate([_template_regex(template)], params)
+
+    def _invalidate(self, regexes, params):
+        with self._lock:
+            self._generation += 1
+            stale = []
+            for key in self._entries:
+                path = urllib.parse.urlsplit(key[0]).path
+                for regex in regexes:
+                    match = regex.match(path)
+                    if match and all(
+                        params[k] == v
+                        for k, v in match.groupdict().items() if k in params
+                    ):
+                        stale.append(key)
+                        break
+            for key in stale:
+                del self._entries[key]
+            self.stats['invalidations'] += len(stale)
+            return len(stale)
+
+    def written(self, method, url, payload=None, json_data=None):
+        """Invalidate the responses made stale by a successful write.
+
+        Args:
+            method(basestring): The HTTP method of the write.
+            url(basestring): The absolute URL of the write.
+            payload: The JSON body of the write.
+            json_data: The parsed response of the write.
+
+        """
+        path = urllib.parse.urlsplit(url).path
+        for write_method, regex, targets in self._invalidations:
+            if write_method != method.upper():
+                continue
+            match = regex.match(path)
+            if not match:
+                continue
+            params = _scalar_fields(payload)
+            params.update(match.groupdict())
+            self._invalidate(targets, params)
+            operation = self._operation_id(json_data)
+            if operation:
+                with self._lock:
+                    self._pending[operation] = (targets, params)
+                    while len(self._pending) > _MAX_PENDING:
+                        self._pending.popitem(last=False)
+
+    @staticmethod
+    def _operation_id(json_data):
+        if not isinstance(json_data, dict):
+            return None
+        response = json_data.get('response')
+        if isinstance(response, dict) and response.get('taskId'):
+            return response['taskId']
+        return json_data.get('executionId')
+
+    _status_regexes = (
+        (_template_regex(TASK_STATUS_TEMPLATE), 'taskId'),
+        (_template_regex(EXECUTION_STATUS_TEMPLATE), 'executionId'),
+    )
+
+    def observe(self, url, json_data):
+        """Invalidate again once an async write is reported complete.
+
+        Args:
+            url(basestring): The absolute URL of a GET request.
+            json_data: Its parsed response.
+
+        """
+        if not self._pending or not isinstance(json_data, dict):
+            return
+        path = urllib.parse.urlsplit(url).path
+        for regex, name in self._status_regexes:
+            match = regex.match(path)
+            if not match or match.group(name) not in self._pending:
+                continue
+            status = json_data.get('response', json_data)
+            if not isinstance(status, dict):
+                return
+            if status.get('endTime') or \
+                    status.get('status') in ('SUCCESS', 'FAILURE'):
+                with self._lock:
+                    pending = self._pending.pop(match.group(name), None)
+                if pending:
+                    self._invalidate(*pending)
+            return
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""Record and replay the HTTP traffic of a RestSession.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+from future import standard_library
+standard_library.install_aliases()
+
+import base64
+import collections
+import hashlib
+import io
+import json
+import threading
+import time
+import urllib.parse
+import zlib
+from builtins import *
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.response import HTTPResponse
+
+from .exceptions import CassetteError
+
+
+CASSETTE_FORMAT_VERSION = 1
+
+# Response headers that no longer describe the stored (decoded) body
+_DROPPED_HEADERS = ('content-encoding', 'content-length',
+                    'transfer-encoding')
+
+
+def request_fingerprint(method, url, body=None):
+    """Identify a request independently of its access token.
+
+    The fingerprint covers the method, the URL path, the query parameters
+    (in any order) and the body. JSON bodies are compared by value.
+
+    Returns:
+        str: A SHA-256 hex digest.
+
+    """
+    parsed = urllib.parse.urlsplit(url)
+    query = sorted(urllib.parse.parse_qsl(parsed.query,
+                                          keep_blank_values=True))
+    digest = hashlib.sha256()
+    digest.update('{} {}?{}'.format(method.upper(), parsed.path,
+                                    urllib.parse.urlencode(query))
+                  .encode('utf-8'))
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    if isinstance(body, bytes) and body:
+        try:
+            body = json.dumps(json.loads(body.decode('utf-8')),
+                              sort_keys=True).encode('utf-8')
+        except ValueError:
+            pass
+        digest.update(b'\n' + body)
+    return digest.hexdigest()
+
+
+class Cassette(object):
+    """A set of recorded HTTP interactions, stored in a file.
+
+    Response bodies are stored zlib-compressed. Responses recorded for the
+    same request fingerprint are replayed in the recorded order; once they
+    have all been replayed, the last one is served again.
+    """
+
+    def __init__(self, path):
+        """Initialize a new Cassette object.
+
+        Args:
+            path(basestring): The cassette file.
+
+        """
+        self.path = path
+        self.interactions = []
+        self._index = collections.defaultdict(list)
+        self._positions = collections.defaultdict(int)
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Read the interactions stored in the cassette file."""
+        with io.open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != CASSETTE_FORMAT_VERSION:
+            raise CassetteError('Unsupported cassette format {}'
+                                ''.format(data.get('version')))
+        with self._lock:
+            self.interactions = []
+            self._index.clear()
+            self._positions.clear()
+        for interaction in data['interactions']:
+            self.add(interaction)
+        return self
+
+    def save(self):
+        """Write the interactions to the cassette file."""
+        with self._lock:
+            data = {'version': CASSETTE_FORMAT_VERSION,
+                    'interactions': list(self.interactions)}
+        with io.open(self.path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(data, indent=1))
+
+    def add(self, interaction):
+        """Append a recorded interaction."""
+        with self._lock:
+            self.interactions.append(interaction)
+            self._index[interaction['fingerprint']].append(interaction)
+
+    def record(self, request, response, elapsed):
+        """Record a response to a request.
+
+        Args:
+            request(requests.PreparedRequest): The request sent.
+            response(requests.Response): The response received; its body is
+                read.
+            elapsed(float): Seconds between sending the request and reading
+                the response body.
+
+        """
+        headers = [(k, v) for k, v in response.headers.items()
+                   if k.lower() not in _DROPPED_HEADERS]
+        self.add({
+            'fingerprint': request_fingerprint(request.method, request.url,
+                                               request.body),
+            'request': {'method': request.method, 'url': request.url},
+            'response': {
+                'status': response.status_code,
+                'reason': response.reason,
+                'headers': headers,
+                'body': base64.b64encode(
+                    zlib.compress(response.content)
+                ).decode('ascii'),
+            },
+            'elapsed': elapsed,
+        })
+
+    def play(self, request):
+        """Return the next recorded interaction matching `request`.
+
+        Raises:
+            CassetteError: If no response was recorded for the request.
+
+        """
+        fingerprint = request_fingerprint(request.method, request.url,
+                                          request.body)
+        with self._lock:
+            recorded = self._index.get(fingerprint)
+            if not recorded:
+                raise CassetteError('No recorded response for {} {}'
+                                    ''.format(request.method, request.url))
+            position = self._positions[fingerprint]
+            self._positions[fingerprint] = position + 1
+        return recorded[min(position, len(recorded) - 1)]
+
+    def rewind(self):
+        """Replay every interaction from the beginning again."""
+        with self._lock:
+            self._positions.clear()
+
+
+class RecordingAdapter(BaseAdapter):
+    """A transport adapter that records the responses of another adapter."""
+
+    def __init__(self, cassette, adapter=None):
+        super(RecordingAdapter, self).__init__()
+        self.cassette = cassette
+        self.adapter = adapter or HTTPAdapter()
+
+    def send(self, request, **kwargs):
+        start = time.time()
+        response = self.adapter.send(request, **kwargs)
+        # Include the transfer of the body in the recorded latency
+        response.content
+        self.cassette.record(request, response, time.time() - start)
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """A transport adapter that serves responses from a cassette.
+
+    Responses are served as fast as possible, or after their recorded
+    latency when `realtime` is True.
+    """
+
+    def __init__(self, cassette, realtime=False):
+        super(ReplayAdapter, self).__init__()
+        self.cassette = cassette
+        self.realtime = realtime
+        self._builder = HTTPAdapter()
+
+    def send(self, request, **kwargs):
+        interaction = self.cassette.play(request)
+        if self.realtime and interaction.get('elapsed'):
+            time.sleep(interaction['elapsed'])
+        recorded = interaction['response']
+        body = zlib.decompress(base64.b64decode(recorded['body']))
+        headers = CaseInsensitiveDict(recorded['headers'])
+        headers['Content-Length'] = str(len(body))
+        raw = HTTPResponse(body=io.BytesIO(body), headers=headers,
+                           status=recorded['status'],
+                           reason=recorded['reason'],
+                           preload_content=False, decode_content=False)
+        return self._builder.build_response(request, raw)
+
+    def close(self):
+        self._builder.close()
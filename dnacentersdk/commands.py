@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""Running read-only commands on many devices with the command runner.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+from future import standard_library
+standard_library.install_aliases()
+
+import collections
+import io
+import itertools
+import json
+import queue
+from builtins import *
+from concurrent.futures import ThreadPoolExecutor
+
+from .bulk import bulk
+from .config import DEFAULT_BULK_WORKERS
+from .utils import check_type
+
+
+COMMAND_RUNNER_MAX_COMMANDS = 5
+"""The most commands accepted by a command runner request."""
+
+COMMAND_RUNNER_MAX_DEVICES = 100
+"""The most devices accepted by a command runner request."""
+
+CommandOutput = collections.namedtuple(
+    'CommandOutput', ['device_id', 'command', 'status', 'output', 'error']
+)
+"""The output of a command on a device: its `status` is SUCCESS, FAILURE
+or BLACKLISTED, as reported by DNA Center, or ERROR when the request
+running the command failed, in which case `error` is the exception."""
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def command_outputs(results):
+    """Return the CommandOutput records of a command runner result file.
+
+    Args:
+        results(list): The decoded JSON content of the file.
+
+    """
+    for result in results:
+        for status, outputs in (result.get('commandResponses') or {}).items():
+            for command, output in (outputs or {}).items():
+                yield CommandOutput(result.get('deviceUuid'), command,
+                                    status, output, None)
+
+
+def _errors(request, error):
+    return [CommandOutput(device_id, command, 'ERROR', None, error)
+            for device_id in request['deviceUuids']
+            for command in request['commands']]
+
+
+def run_commands(api, commands, device_ids,
+                 devices_per_request=COMMAND_RUNNER_MAX_DEVICES,
+                 commands_per_request=COMMAND_RUNNER_MAX_COMMANDS,
+                 workers=DEFAULT_BULK_WORKERS, task_timeout=None):
+    """Run read-only commands on many devices, streaming their outputs.
+
+    The devices and the commands are split into requests accepted by the
+    command runner, which are submitted concurrently. Their tasks are waited
+    for together by the API's task waiter, and the result files of the
+    completed tasks are downloaded in parallel. The outputs are yielded as
+    the files arrive, in no particular order.
+
+    A request that fails (when it is submitted, when its task completes, or
+    when its file is downloaded) yields an ERROR output for each of its
+    devices and commands instead of stopping the others.
+
+    Args:
+        api(DNACenterAPI): The API used to run the commands.
+        commands(list): The commands to run on every device.
+        device_ids(iterable): The ids of the devices; consumed lazily.
+        devices_per_request(int): The most devices per request.
+        commands_per_request(int): The most commands per request.
+        workers(int): The number of requests submitted, and of files
+            downloaded, concurrently.
+        task_timeout(float,int): Seconds before the task of a request fails
+            with a TaskTimeoutError.
+
+    Returns:
+        generator: A :class:`CommandOutput` per device and command.
+
+    """
+    check_type(commands, list, may_be_none=False)
+    check_type(devices_per_request, int, may_be_none=False)
+    check_type(commands_per_request, int, may_be_none=False)
+    check_type(workers, int, may_be_none=False)
+    check_type(task_timeout, (float, int))
+    if not commands:
+        raise ValueError('No commands to run')
+    if devices_per_request <= 0 or commands_per_request <= 0:
+        raise ValueError('The request sizes must be positive')
+
+    command_batches = list(_batches(commands, commands_per_request))
+
+    def run_requests():
+        for devices in _batches(device_ids, devices_per_request):
+            for batch in command_batches:
+                yield {'commands': batch, 'deviceUuids': devices}
+
+    outputs = queue.Queue()
+    downloads = ThreadPoolExecutor(workers)
+
+    def download(task, request):
+        try:
+            progress = json.loads(task.result()['progress'])
+            content = io.BytesIO()
+            api.file.download_a_file_by_fileid(progress['fileId'],
+                                               sink=content)
+            records = list(command_outputs(
+                json.loads(content.getvalue().decode('utf-8'))
+            ))
+        except Exception as e:
+            records = _errors(request, e)
+        outputs.put(records)
+
+    def completed(request):
+        def callback(task):
+            try:
+                downloads.submit(download, task, request)
+            except RuntimeError:
+                # The outputs are no longer consumed
+                pass
+        return callback
+
+    run = api.command_runner.run_read_only_commands_on_devices
+    in_flight = 0
+    try:
+        for outcome in bulk(run, run_requests(), workers=workers):
+            in_flight += 1
+            if outcome.error is not None:
+                outputs.put(_errors(outcome.arguments, outcome.error))
+            else:
+                task = api.task_waiter.wait_for(outcome.result,
+                                                timeout=task_timeout)
+                task.add_done_callback(completed(outcome.arguments))
+            while True:
+                try:
+                    records = outputs.get_nowait()
+                except queue.Empty:
+                    break
+                in_flight -= 1
+                for record in records:
+                    yield record
+        while in_flight:
+            records = outputs.get()
+            in_flight -= 1
+            for record in records:
+                yield record
+    finally:
+        downloads.shutdown(wait=False)
@@ -32,6 +32,40 @@ DEFAULT_WAIT_ON_RATE_LIMIT = True
 
 DEFAULT_VERIFY = True
 
+DEFAULT_PAGE_SIZE = 500
+
+DEFAULT_BULK_WORKERS = 8
+
+DEFAULT_WORKERS = 10
+
+DEFAULT_TASK_POLL_INTERVAL = 1.0
+
+DEFAULT_TASK_MAX_POLL_INTERVAL = 30.0
+
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+DEFAULT_DOWNLOAD_SEGMENT_SIZE = 8 * 1024 * 1024
+
+DEFAULT_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+DEFAULT_UPLOAD_RETRIES = 3
+
+DEFAULT_PNP_IMPORT_CHUNK_SIZE = 1000
+
+DEFAULT_PNP_IMPORT_RETRIES = 2
+
+DEFAULT_PNP_CLAIM_POLL_BATCH = 100
+
+DEFAULT_TEMPLATE_DEPLOYMENT_SIZE = 100
+
+DEFAULT_MAX_TEMPLATE_DEPLOYMENTS = 10
+
+DEFAULT_TEMPLATE_CACHE_MAX_AGE = 300
+
+DEFAULT_MAX_PATH_TRACES = 10
+
+DEFAULT_PATH_TRACE_TTL = 300
+
 DEBUG_ENVIRONMENT_VARIABLE = 'DEBUG'
 
 # DNA Center API version. Format: MAJOR.MINOR.PATCH
@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""Streaming file downloads to caller-chosen sinks.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+from future import standard_library
+standard_library.install_aliases()
+
+import collections
+import contextlib
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from builtins import *
+from concurrent.futures import ThreadPoolExecutor
+
+from past.builtins import basestring
+
+from .exceptions import ApiError, dnacentersdkException
+
+
+DownloadResult = collections.namedtuple(
+    'DownloadResult', ['file_name', 'path', 'size', 'digests', 'headers']
+)
+"""The outcome of a download: the file name given by DNA Center, the path
+of the saved file (None when the sink is not a path), the number of bytes
+received, the hex digests computed while downloading, by algorithm, and
+the response headers."""
+
+_FILENAME = re.compile(r'filename="?([^";]+)"?')
+_CONTENT_RANGE = re.compile(r'bytes (\d+)-(\d+)/(\d+|\*)$')
+
+PARTIAL_SUFFIX = '.part'
+"""Appended to the path of a file to name its partial download, kept to
+resume the download."""
+
+
+def file_name_of(response, default=None):
+    """The name of a downloaded file, from the response headers.
+
+    Only the base name is kept, so that a file saved under this name stays
+    in the chosen directory.
+    """
+    name = response.headers.get('fileName')
+    if not name:
+        match = _FILENAME.search(
+            response.headers.get('Content-Disposition', '')
+        )
+        name = match.group(1) if match else default
+    return os.path.basename(name) if name else name
+
+
+def _target_path(sink, file_name):
+    if sink is None:
+        return file_name
+    if os.path.isdir(sink):
+        return os.path.join(sink, file_name)
+    return sink
+
+
+@contextlib.contextmanager
+def open_sink(sink, file_name):
+    """Open the destination of a download.
+
+    Args:
+        sink: None to save the file under `file_name` in the current
+            directory, a directory to save it under `file_name` there, a
+            file path, a binary file object, or a callable receiving each
+            chunk of data.
+        file_name(basestring): The name of the downloaded file.
+
+    Yields:
+        tuple: A function writing a chunk of data, and the path of the
+        saved file or None.
+
+    A file saved to a path is written to a temporary file in the same
+    directory, which replaces the target once complete; concurrent
+    downloads of files with the same name never interleave their data, and
+    an interrupted download leaves no partial file under the target name.
+    """
+    if sink is not None and not isinstance(sink, basestring):
+        if hasattr(sink, 'write'):
+            yield sink.write, None
+        elif callable(sink):
+            yield sink, None
+        else:
+            raise TypeError('Unsupported download sink {!r}'.format(sink))
+        return
+
+    path = _target_path(sink, file_name)
+    with temporary_file(path) as temporary:
+        with open(temporary, 'wb') as f:
+            yield f.write, path
+
+
+@contextlib.contextmanager
+def temporary_file(path):
+    """Yield the path of a new temporary file, which replaces the file at
+    `path` when the block completes, or is removed if it fails."""
+    directory, name = os.path.split(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(prefix='.{}.'.format(name),
+                                             suffix='.tmp', dir=directory)
+    os.close(descriptor)
+    try:
+        yield temporary
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+def write_response(response, sink=None, chunk_size=1024 * 1024,
+                   hash_algorithms=None, progress=None, default_name=None):
+    """Stream the body of a response to a sink.
+
+    Args:
+        response(requests.Response): A response requested with
+            `stream=True`.
+        sink: The destination of the data; see :func:`open_sink`.
+        chunk_size(int): The number of bytes read at a time; bounds the
+            memory used by the download.
+        hash_algorithms(list): The names of the hashlib algorithms whose
+            digests of the data are computed, for example ['md5', 'sha1'].
+        progress(callable): Called after each chunk with the number of
+            bytes received so far and the expected total, or None when the
+            response has no Content-Length.
+        default_name(basestring): The file name used when the response
+            headers do not give one.
+
+    Returns:
+        DownloadResult: The outcome of the download.
+
+    Raises:
+        dnacentersdkException: If the data cannot be written.
+
+    """
+    file_name = file_name_of(response, default_name)
+    hashes = [(name, hashlib.new(name)) for name in hash_algorithms or ()]
+    total = response.headers.get('Content-Length')
+    total = int(total) if total and total.isdigit() else None
+    size = 0
+    try:
+        with open_sink(sink, file_name) as (write, path):
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if not chunk:
+                    continue
+                write(chunk)
+                for _, digest in hashes:
+                    digest.update(chunk)
+                size += len(chunk)
+                if progress is not None:
+                    progress(size, total)
+    except (IOError, OSError) as e:
+        raise dnacentersdkException('DownloadFailure {}'.format(e))
+    return DownloadResult(file_name, path, size,
+                          dict((name, digest.hexdigest())
+                               for name, digest in hashes),
+                          response.headers)
+
+
+def content_range(response):
+    """The (start, end, total) byte range of a 206 response, or None.
+
+    `total` is None when the server does not know the size of the file.
+    """
+    if response.status_code != 206:
+        return None
+    match = _CONTENT_RANGE.match(response.headers.get('Content-Range', ''))
+    if not match:
+        return None
+    start, end, total = match.groups()
+    return int(start), int(end), None if total == '*' else int(total)
+
+
+def _content_length(response):
+    length = response.headers.get('Content-Length')
+    return int(length) if length and length.isdigit() else None
+
+
+def _hash_file(path, hash_algorithms, chunk_size):
+    hashes = [(name, hashlib.new(name)) for name in hash_algorithms or ()]
+    if hashes:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                for _, digest in hashes:
+                    digest.update(chunk)
+    return dict((name, digest.hexdigest()) for name, digest in hashes)
+
+
+def resume_download(send, path, chunk_size=1024 * 1024,
+                    hash_algorithms=None, progress=None):
+    """Download a file to a path, resuming an interrupted download.
+
+    The data is written to `path` + PARTIAL_SUFFIX, which is kept when the
+    download fails and moved to `path` once it is complete. When the
+    partial file exists, only the rest of the file is requested, with a
+    Range header; if the server answers with the whole file instead, the
+    partial file is overwritten.
+
+    Args:
+        send(callable): Sends the GET request with additional headers,
+            and returns the streamed response, as a context manager; a 416
+            (range not satisfiable) response must be returned too.
+        path(basestring): The path of the file.
+        chunk_size(int): The number of bytes read at a time.
+        hash_algorithms(list): The hashlib algorithms whose digests of the
+            whole file are computed.
+        progress(callable): Called after each chunk with the number of
+            bytes of the file received and the expected total, or None.
+
+    Returns:
+        DownloadResult: The outcome of the download.
+
+    Raises:
+        ApiError: If a request without a range is answered with 416.
+        dnacentersdkException: If the file cannot be written.
+
+    """
+    partial = path + PARTIAL_SUFFIX
+    offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+    headers = {'Range': 'bytes={}-'.format(offset)} if offset else {}
+    with send(headers) as response:
+        if response.status_code == 416:
+            if not offset:
+                # No range was requested
+                raise ApiError(response)
+            # The partial file is not a part of the current file
+            try:
+                os.remove(partial)
+            except (IOError, OSError) as e:
+                if os.path.exists(partial):
+                    raise dnacentersdkException(
+                        'DownloadFailure {}'.format(e)
+                    )
+            return resume_download(send, path, chunk_size=chunk_size,
+                                   hash_algorithms=hash_algorithms,
+                                   progress=progress)
+        byte_range = content_range(response)
+        if not offset or byte_range is None or byte_range[0] != offset:
+            offset = 0
+        length = _content_length(response)
+        total = offset + length if length is not None else None
+        hashes = [(name, hashlib.new(name))
+                  for name in hash_algorithms or ()]
+        size = offset
+        try:
+            if offset and hashes:
+                with open(partial, 'rb') as f:
+                    for chunk in iter(lambda: f.read(chunk_size), b''):
+                        for _, digest in hashes:
+                            digest.update(chunk)
+            with open(partial, 'ab' if offset else 'wb') as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    for _, digest in hashes:
+                        digest.update(chunk)
+                    size += len(chunk)
+                    if progress is not None:
+                        progress(size, total)
+            os.replace(partial, path)
+        except (IOError, OSError) as e:
+            raise dnacentersdkException('DownloadFailure {}'.format(e))
+        return DownloadResult(file_name_of(response), path, size,
+                              dict((name, digest.hexdigest())
+                                   for name, digest in hashes),
+                              response.headers)
+
+
+def segmented_download(send, path, segment_size, workers,
+                       chunk_size=1024 * 1024, hash_algorithms=None,
+                       progress=None):
+    """Download a file to a path with concurrent ranged requests.
+
+    The first segment is requested with a Range header. When the server
+    answers with a partial response giving the size of the file, the file
+    is pre-allocated and its other segments are requested by `workers`
+    threads, each writing its segment in place. Otherwise the whole file,
+    received in answer to the first request, is written sequentially.
+
+    Args:
+        send(callable): Sends the GET request with additional headers,
+            and returns the streamed response, as a context manager.
+        path(basestring): The path of the file.
+        segment_size(int): The number of bytes per ranged request.
+        workers(int): The number of concurrent requests.
+        chunk_size(int): The number of bytes read at a time.
+        hash_algorithms(list): The hashlib algorithms whose digests of the
+            file are computed, once it is complete.
+        progress(callable): Called after each chunk with the number of
+            bytes received and the size of the file.
+
+    Returns:
+        DownloadResult: The outcome of the download.
+
+    Raises:
+        dnacentersdkException: If a segment cannot be downloaded.
+
+    """
+    lock = threading.Lock()
+    received = [0]
+
+    def write_segment(response, f, start, total):
+        f.seek(start)
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if not chunk:
+                continue
+            f.write(chunk)
+            with lock:
+                received[0] += len(chunk)
+                done = received[0]
+            if progress is not None:
+                progress(done, total)
+
+    with send({'Range': 'bytes=0-{}'.format(segment_size - 1)}) as response:
+        byte_range = content_range(response)
+        if byte_range is None or byte_range[2] is None:
+            return write_response(response, path, chunk_size=chunk_size,
+                                  hash_algorithms=hash_algorithms,
+                                  progress=progress)
+        total = byte_range[2]
+        segments = [(start, min(start + segment_size, total) - 1)
+                    for start in range(byte_range[1] + 1, total,
+                                       segment_size)]
+
+        def fetch(segment):
+            start, end = segment
+            headers = {'Range': 'bytes={}-{}'.format(start, end)}
+            with send(headers) as segment_response:
+                if content_range(segment_response) != (start, end, total):
+                    raise dnacentersdkException(
+                        'DownloadFailure unexpected response to the range '
+                        '{}-{}'.format(start, end)
+                    )
+                with open(temporary, 'r+b') as f:
+                    write_segment(segment_response, f, start, total)
+
+        try:
+            with temporary_file(path) as temporary:
+                # Pre-allocate the file, so that the segments are written in
+                # place
+                with open(temporary, 'r+b') as f:
+                    f.truncate(total)
+                    write_segment(response, f, 0, total)
+                with ThreadPoolExecutor(workers) as executor:
+                    for _ in executor.map(fetch, segments):
+                        pass
+                if received[0] != total:
+                    raise dnacentersdkException(
+                        'DownloadFailure received {} of {} bytes'
+                        ''.format(received[0], total)
+                    )
+        except (IOError, OSError) as e:
+            raise dnacentersdkException('DownloadFailure {}'.format(e))
+        return DownloadResult(file_name_of(response), path, total,
+                              _hash_file(path, hash_algorithms, chunk_size),
+                              response.headers)
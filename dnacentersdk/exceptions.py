@@ -157,3 +157,49 @@ class RateLimitWarning(UserWarning):
 class MalformedRequest(dnacentersdkException):
     """Raised when a malformed request is received from DNA Center user."""
     pass
+
+
+class CassetteError(dnacentersdkException):
+    """Raised when a recorded HTTP response cannot be replayed."""
+    pass
+
+
+class TaskError(dnacentersdkException):
+    """Raised when an asynchronous DNA Center task completes with an error."""
+
+    def __init__(self, task, tree=None):
+        """Initialize a new TaskError object.
+
+        Args:
+            task(dict): The failed task, as returned by get_task_by_id.
+            tree(list): The tasks of its task tree, when they were fetched.
+
+        """
+        self.task = task
+        """The failed task."""
+
+        self.tree = tree
+        """The tasks of its task tree, or None."""
+
+        super(TaskError, self).__init__(
+            'Task {} failed: {}'.format(
+                task.get('id'),
+                task.get('failureReason') or task.get('progress'),
+            )
+        )
+
+
+class TaskTimeoutError(dnacentersdkException):
+    """Raised when an asynchronous DNA Center task does not complete in time.
+    """
+
+    def __init__(self, task_id, task=None):
+        self.task_id = task_id
+        """The id of the task."""
+
+        self.task = task
+        """The last status received for the task, or None."""
+
+        super(TaskTimeoutError, self).__init__(
+            'Task {} did not complete in time'.format(task_id)
+        )
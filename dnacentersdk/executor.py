@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""Future-returning variants of the API wrapper methods.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import functools
+import inspect
+import threading
+from builtins import *
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import DEFAULT_WORKERS
+from .utils import check_type
+
+
+class SubmittableMethod(object):
+    """An API wrapper method with a Future-returning `submit` variant.
+
+    Calling the object calls the method. `submit` takes the same arguments,
+    schedules the call on the API's executor and returns a
+    :class:`concurrent.futures.Future` for its result::
+
+        future = api.devices.get_device_by_id.submit(device_id)
+        device = future.result()
+    """
+
+    def __init__(self, method, executor):
+        """Initialize a new SubmittableMethod object.
+
+        Args:
+            method(callable): The bound API wrapper method.
+            executor(ApiExecutor): The executor running the submitted calls.
+
+        """
+        self._method = method
+        self._executor = executor
+        functools.update_wrapper(self, method)
+
+    def __call__(self, *args, **kwargs):
+        return self._method(*args, **kwargs)
+
+    def submit(self, *args, **kwargs):
+        """Schedule a call of the method.
+
+        Returns:
+            concurrent.futures.Future: The result of the call, or the
+            exception it raised.
+
+        """
+        return self._executor.submit(self._method, *args, **kwargs)
+
+    def __repr__(self):
+        return '<SubmittableMethod {}>'.format(self.__name__)
+
+
+class ApiExecutor(object):
+    """A thread pool shared by the submitted calls of a DNACenterAPI object.
+
+    The threads are started on the first submitted call and stopped by
+    :meth:`shutdown`; a call submitted afterwards starts a new pool.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS):
+        """Initialize a new ApiExecutor object.
+
+        Args:
+            workers(int): The maximum number of concurrent calls.
+
+        """
+        check_type(workers, int, may_be_none=False)
+        if workers <= 0:
+            raise ValueError('workers must be positive')
+
+        self.workers = workers
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def submit(self, function, *args, **kwargs):
+        """Schedule a call of `function`.
+
+        Returns:
+            concurrent.futures.Future: The result of the call, or the
+            exception it raised.
+
+        """
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.workers)
+            return self._pool.submit(function, *args, **kwargs)
+
+    def shutdown(self, wait=True):
+        """Stop the threads once the submitted calls are done."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    def wrap(self, wrapper):
+        """Give the public methods of an API wrapper a `submit` variant.
+
+        Args:
+            wrapper: An API wrapper object, for example `api.devices`.
+
+        """
+        for name, method in inspect.getmembers(wrapper, inspect.ismethod):
+            if not name.startswith('_'):
+                setattr(wrapper, name, SubmittableMethod(method, self))
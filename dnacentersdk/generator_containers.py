@@ -77,6 +77,14 @@ class GeneratorContainer(object):
             bound_arguments = signature.bind(*args, **kwargs)
             self.arguments = bound_arguments.arguments
 
+    def _accepts(self, parameter):
+        """Whether the generator function has a parameter of this name."""
+        if sys.version_info[0] < 3:
+            return parameter in inspect.getargspec(
+                self.generator_function).args
+        return parameter in inspect.signature(
+            self.generator_function).parameters
+
     def __repr__(self):
         """A string representation of this object."""
         return '<GeneratorContainer {func_name}({arguments})>'.format(
@@ -115,6 +123,10 @@ class GeneratorContainer(object):
         parameter to the generator function wrapped by the GeneratorContainer,
         this optimization will not change the value.
 
+        When the generator function accepts a `start` parameter, the start of
+        the slice is passed on to it as well, and `max` is set to the length
+        of the slice, so that the records before `start` are not requested.
+
         Args:
             item(slice): A slice object specifying the start, stop and step.
 
@@ -125,6 +137,21 @@ class GeneratorContainer(object):
         """
         if isinstance(item, slice):
             arguments = self.arguments.copy()
+            if self._accepts('start') and (item.start or 0) > 0 \
+                    and (item.stop is None or item.stop >= item.start):
+                start = arguments.get('start') or 0
+                stop = None if item.stop is None else item.stop - item.start
+                if arguments.get('max') is not None:
+                    remaining = max(arguments['max'] - item.start, 0)
+                    stop = remaining if stop is None else min(stop, remaining)
+                arguments['start'] = start + item.start
+                arguments['max'] = stop
+                return islice(
+                    self.generator_function(**arguments),
+                    None,
+                    None,
+                    item.step,
+                )
             arguments.setdefault('max', item.stop)
             return islice(
                 self.generator_function(**arguments),
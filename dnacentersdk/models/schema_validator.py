@@ -1801,6 +1801,8 @@ json_schema_validators['jsd_2f97e8fa45f8b2a3_v1_3_0'] =\
 json_schema_validators['jsd_ac8ae94c4e69a09d_v1_3_0'] =\
     JSONSchemaValidatorAc8AE94C4E69A09D_v1_3_0()
 
+_default_validator = None
+
 
 def json_schema_validate(model):
     """Factory function for creating JSONSchemaValidator objects.
@@ -1814,4 +1816,11 @@ def json_schema_validate(model):
     Raises:
         MalformedRequest.
     """
-    return json_schema_validators.get(model, JSONSchemaValidator())
+    global _default_validator
+    validator = json_schema_validators.get(model)
+    if validator is None:
+        # Compile the permissive fallback validator only once
+        if _default_validator is None:
+            _default_validator = JSONSchemaValidator()
+        validator = _default_validator
+    return validator
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""Bulk Plug and Play (PnP) onboarding.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+from future import standard_library
+standard_library.install_aliases()
+
+import collections
+import itertools
+import queue
+import threading
+import time
+from builtins import *
+
+import requests
+from past.builtins import basestring
+
+from .bulk import bulk
+from .config import (
+    DEFAULT_BULK_WORKERS, DEFAULT_PNP_CLAIM_POLL_BATCH,
+    DEFAULT_PNP_IMPORT_CHUNK_SIZE, DEFAULT_PNP_IMPORT_RETRIES,
+    DEFAULT_TASK_MAX_POLL_INTERVAL, DEFAULT_TASK_POLL_INTERVAL,
+)
+from .exceptions import ApiError, MalformedRequest, dnacentersdkException
+from .utils import check_type
+
+
+PNP_IMPORT_VALIDATOR = 'jsd_21a6db2540298f55'
+"""The request schema of import_devices_in_bulk, without its version."""
+
+CLAIM_STATES = {'Provisioned': 'SUCCESS', 'Error': 'FAILURE'}
+"""The PnP device states that complete a claim, and their event status."""
+
+PnpImportReport = collections.namedtuple(
+    'PnpImportReport', ['success_list', 'failure_list']
+)
+"""The merged outcome of an import: the PnP device records created, and a
+failure record (`index`, `serialNum`, `id` and `msg`) per device that was
+not imported, whose `index` is the position of the device in the
+imported list."""
+
+ClaimEvent = collections.namedtuple(
+    'ClaimEvent', ['device_id', 'serial_number', 'status', 'device', 'error']
+)
+"""The completion of the claim of a PnP device: its `status` is SUCCESS
+when the device is provisioned, FAILURE when its claim request fails (with
+the exception as `error`) or when it reaches the Error state, and TIMEOUT
+when it is not provisioned in time. `device` is the last PnP device record
+read, if any."""
+
+
+def _chunks(devices, size):
+    iterator = iter(devices)
+    for start in itertools.count(0, size):
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield start, chunk
+
+
+def _failure(index, device, message):
+    if not isinstance(device, dict):
+        device = {}
+    return {'index': index,
+            'serialNum': (device.get('deviceInfo') or {}).get('serialNumber'),
+            'id': device.get('id'),
+            'msg': message}
+
+
+def _retryable(error):
+    # Server errors and failed connections; the other errors of a request
+    # would be returned again
+    if isinstance(error, ApiError):
+        return error.status_code >= 500
+    return isinstance(error, dnacentersdkException)
+
+
+def _transient(error):
+    # Server errors, rate limits and failed connections; reading the
+    # devices again may succeed
+    if isinstance(error, ApiError):
+        return error.status_code >= 500 or error.status_code == 429
+    if isinstance(error, MalformedRequest):
+        return False
+    return isinstance(error, (dnacentersdkException,
+                              requests.exceptions.RequestException))
+
+
+def import_devices(api, devices, chunk_size=DEFAULT_PNP_IMPORT_CHUNK_SIZE,
+                   workers=DEFAULT_BULK_WORKERS,
+                   retries=DEFAULT_PNP_IMPORT_RETRIES, progress=None):
+    """Import many devices to PnP with concurrent chunked requests.
+
+    `devices` is consumed lazily and split into chunks of `chunk_size`
+    devices, which are imported concurrently by `import_devices_in_bulk`
+    requests. Each device is validated on its own as its chunk is
+    prepared, so that an invalid device is reported in the failure list
+    instead of failing its chunk. A chunk whose request fails with a server
+    error or a connection failure is sent again, up to `retries` times
+    (DNA Center reports the devices already imported by a failed attempt
+    as failures); the devices of a chunk that cannot be sent are reported
+    as failures with the error message.
+
+    Args:
+        api(DNACenterAPI): The API used to import the devices.
+        devices(iterable): The device entries, as in the payload of
+            `import_devices_in_bulk`.
+        chunk_size(int): The most devices per request.
+        workers(int): The number of requests sent concurrently.
+        retries(int): The number of times a failed request is sent again.
+        progress(callable): Called after each chunk with the number of
+            devices imported and failed so far.
+
+    Returns:
+        PnpImportReport: The merged success and failure lists.
+
+    """
+    check_type(chunk_size, int, may_be_none=False)
+    check_type(workers, int, may_be_none=False)
+    check_type(retries, int, may_be_none=False)
+    if chunk_size <= 0:
+        raise ValueError('chunk_size must be positive')
+
+    pnp = api.pnp
+    validator = pnp._request_validator('{}_v{}'.format(
+        PNP_IMPORT_VALIDATOR, api.version.replace('.', '_')
+    ))
+
+    def send(payload):
+        for attempt in itertools.count(1):
+            try:
+                return pnp.import_devices_in_bulk(payload=payload,
+                                                  active_validation=False)
+            except Exception as e:
+                if attempt > retries or not _retryable(e):
+                    raise
+            time.sleep(min(2 ** attempt, 30) / 10)
+
+    def import_chunk(start, chunk):
+        indexes, payload, failures = [], [], []
+        for index, device in enumerate(chunk, start):
+            try:
+                validator.validate([device])
+            except MalformedRequest as e:
+                failures.append(_failure(index, device, str(e)))
+            else:
+                indexes.append(index)
+                payload.append(device)
+        if not payload:
+            return [], failures
+        try:
+            response = send(payload)
+        except Exception as e:
+            return [], failures + [_failure(index, device, str(e)) for
+                                   index, device in zip(indexes, payload)]
+        for failure in response.get('failureList') or ():
+            failure = dict(failure)
+            if isinstance(failure.get('index'), int) \
+                    and 0 <= failure['index'] < len(indexes):
+                failure['index'] = indexes[failure['index']]
+            failures.append(failure)
+        return list(response.get('successList') or ()), failures
+
+    report = PnpImportReport([], [])
+    for outcome in bulk(import_chunk, _chunks(devices, chunk_size),
+                        workers=workers):
+        if outcome.error is not None:
+            start, chunk = outcome.arguments
+            report.failure_list.extend(
+                _failure(index, device, str(outcome.error))
+                for index, device in enumerate(chunk, start)
+            )
+        else:
+            report.success_list.extend(outcome.result[0])
+            report.failure_list.extend(outcome.result[1])
+        if progress is not None:
+            progress(len(report.success_list), len(report.failure_list))
+    report.failure_list.sort(
+        key=lambda f: f['index'] if isinstance(f.get('index'), int) else -1
+    )
+    return report
+
+
+def _serial_number(device):
+    return (device.get('deviceInfo') or {}).get('serialNumber')
+
+
+def claim_devices(api, site_id, devices, claim_type='Default',
+                  claim_options=None, workers=DEFAULT_BULK_WORKERS,
+                  interval=DEFAULT_TASK_POLL_INTERVAL,
+                  poll_batch=DEFAULT_PNP_CLAIM_POLL_BATCH, timeout=None):
+    """Claim PnP devices to a site and wait for their provisioning.
+
+    The devices are claimed by concurrent `claim_a_device_to_a_site`
+    requests. While the claims are sent, the state of the claimed devices
+    is read every `interval` seconds by `get_device_list` requests that
+    each filter up to `poll_batch` serial numbers, as repeated
+    `serialNumber` query parameters, instead of a request per device. An
+    event is yielded as soon as the claim of a device completes, in the
+    order of completion.
+
+    A state read failing with a server error, a rate limit or a connection
+    failure leaves its devices waiting, and the next read is delayed up to
+    DEFAULT_TASK_MAX_POLL_INTERVAL seconds; other errors are raised.
+    Closing the generator, or an error, stops sending the claims.
+
+    Args:
+        api(DNACenterAPI): The API used to claim the devices.
+        site_id(basestring): The id of the site.
+        devices(iterable): The PnP device records to claim, as returned by
+            `pnp.get_device_list` or in the success list of an import; they
+            need their `id` and `deviceInfo.serialNumber`.
+        claim_type(basestring): The `type` of the claims, for example
+            'Default' or 'AccessPoint'.
+        claim_options(dict): Additional fields of each claim request, for
+            example `imageInfo` and `configInfo`.
+        workers(int): The number of claims sent concurrently.
+        interval(float,int): Seconds between the state reads.
+        poll_batch(int): The most serial numbers per state read.
+        timeout(float,int): Seconds after its claim before a device that is
+            not provisioned yields a TIMEOUT event. By default the devices
+            are waited for until they complete.
+
+    Returns:
+        generator: A :class:`ClaimEvent` per device.
+
+    Raises:
+        ApiError: If a state read fails with a client error.
+
+    """
+    check_type(claim_type, basestring, may_be_none=False)
+    check_type(claim_options, dict)
+    check_type(workers, int, may_be_none=False)
+    check_type(interval, (float, int), may_be_none=False)
+    check_type(poll_batch, int, may_be_none=False)
+    check_type(timeout, (float, int))
+    if poll_batch <= 0:
+        raise ValueError('poll_batch must be positive')
+
+    pnp = api.pnp
+
+    def claim(device):
+        request = {'deviceId': device.get('id'), 'siteId': site_id,
+                   'type': claim_type}
+        request.update(claim_options or {})
+        pnp.claim_a_device_to_a_site(payload=request)
+
+    claimed = queue.Queue()
+    stopped = threading.Event()
+
+    def send_claims():
+        # The records are passed as positional arguments
+        outcomes = bulk(claim, ((d,) for d in devices), workers=workers)
+        try:
+            for outcome in outcomes:
+                if stopped.is_set():
+                    break
+                claimed.put(outcome)
+        finally:
+            outcomes.close()
+            claimed.put(None)
+
+    sender = threading.Thread(target=send_claims)
+    sender.daemon = True
+    sender.start()
+
+    # The claimed devices by serial number, with their claim time
+    waiting = collections.OrderedDict()
+    sending = True
+    delay = interval
+    next_poll = time.time() + delay
+    try:
+        while sending or waiting:
+            try:
+                outcome = claimed.get(
+                    timeout=max(next_poll - time.time(), 0) if waiting
+                    else None
+                )
+            except queue.Empty:
+                outcome = False
+            if outcome is None:
+                sending = False
+            elif outcome:
+                device = outcome.arguments[0]
+                if outcome.error is not None:
+                    yield ClaimEvent(device.get('id'),
+                                     _serial_number(device), 'FAILURE',
+                                     device, outcome.error)
+                else:
+                    waiting[_serial_number(device)] = (device, time.time())
+            if not waiting or time.time() < next_poll:
+                continue
+            serials = list(waiting)
+            failed = False
+            for start in range(0, len(serials), poll_batch):
+                # serial_number takes a single value; the list is sent as
+                # repeated serialNumber parameters
+                try:
+                    records = pnp.get_device_list(
+                        serialNumber=serials[start:start + poll_batch]
+                    )
+                except Exception as e:
+                    if not _transient(e):
+                        raise
+                    # The devices stay waiting until a later read
+                    failed = True
+                    continue
+                for record in records or ():
+                    serial_number = _serial_number(record)
+                    status = CLAIM_STATES.get(
+                        (record.get('deviceInfo') or {}).get('state')
+                    )
+                    if status and serial_number in waiting:
+                        del waiting[serial_number]
+                        yield ClaimEvent(record.get('id'), serial_number,
+                                         status, record, None)
+            if timeout is not None:
+                now = time.time()
+                for serial_number, (device, since) in list(waiting.items()):
+                    if now - since >= timeout:
+                        del waiting[serial_number]
+                        yield ClaimEvent(device.get('id'), serial_number,
+                                         'TIMEOUT', device, None)
+            delay = min(delay * 2, max(DEFAULT_TASK_MAX_POLL_INTERVAL,
+                                       interval)) if failed else interval
+            next_poll = time.time() + delay
+    finally:
+        stopped.set()
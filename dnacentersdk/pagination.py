@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+"""Automatic pagination of offset/limit API endpoints.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import collections
+import functools
+import inspect
+import itertools
+from builtins import *
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .config import DEFAULT_PAGE_SIZE
+from .generator_containers import GeneratorContainer
+from .utils import check_type
+
+
+RANGE_PAGE_MAXIMUM = 500
+"""The most records returned by a call to a range endpoint."""
+
+
+def page_records(data):
+    """Return the records of a page: its `response` list, or the page itself
+    when the endpoint returns a bare list."""
+    if isinstance(data, list):
+        return data
+    records = data.get('response') if isinstance(data, dict) else None
+    return records if isinstance(records, list) else []
+
+
+def count_value(data):
+    """Return the number returned by a count endpoint."""
+    if isinstance(data, dict):
+        data = data.get('response')
+    return data if isinstance(data, int) else None
+
+
+def count_arguments(count, params):
+    """Return the arguments of the `count` method matching the list
+    parameters `params`, or None when `count` does not take all of them,
+    in which case it would not count the same records."""
+    accepted = inspect.signature(count).parameters
+    arguments = {}
+    for name, value in params.items():
+        if value is None:
+            continue
+        if name not in accepted \
+                or accepted[name].kind == inspect.Parameter.VAR_KEYWORD:
+            return None
+        arguments[name] = value
+    return arguments
+
+
+def _fetch_page(fetch, params, offset, limit, offset_type):
+    arguments = dict(params)
+    arguments.update(offset=offset_type(offset), limit=offset_type(limit))
+    return page_records(fetch(**arguments))[:limit]
+
+
+def _pipeline(request, offsets, depth):
+    """Yield `request(offset)` for each offset, keeping `depth` more
+    requests in flight than the one being consumed."""
+    executor = ThreadPoolExecutor(depth + 1)
+    pending = collections.deque()
+    try:
+        for offset in offsets:
+            pending.append(executor.submit(request, offset))
+            if len(pending) > depth:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def paginate(fetch, params, page_size=DEFAULT_PAGE_SIZE, first_offset=1,
+             offset_type=int, start=0, max=None, read_ahead=0):
+    """Yield the records of an offset/limit endpoint, page by page.
+
+    Only one page is held in memory at a time, plus the `read_ahead` pages
+    requested ahead of it. Reading ahead overlaps the download and decoding
+    of the next pages with the consumption of the current one; as the end
+    of the records is unknown, up to `read_ahead` requests past the last
+    page are wasted.
+
+    Args:
+        fetch(callable): The API wrapper method returning a page.
+        params(dict): The other keyword arguments of `fetch`.
+        page_size(int): The number of records requested per page.
+        first_offset(int): The offset of the first record on the server,
+            1 for most endpoints.
+        offset_type(type): The type of the `offset` and `limit` arguments of
+            `fetch`, int or str.
+        start(int): The index of the first record to yield.
+        max(int): The maximum number of records to yield, or None for all of
+            them.
+        read_ahead(int): The number of pages requested ahead of the page
+            being consumed, from background threads.
+
+    """
+    check_type(page_size, int, may_be_none=False)
+    check_type(start, int, may_be_none=False)
+    check_type(max, int)
+    check_type(read_ahead, int, may_be_none=False)
+    if page_size <= 0 or read_ahead < 0:
+        raise ValueError('page_size must be positive and read_ahead must '
+                         'not be negative')
+
+    stop = None if max is None else start + max
+
+    def request(offset):
+        limit = page_size if stop is None else min(page_size, stop - offset)
+        arguments = dict(params)
+        arguments.update(offset=offset_type(first_offset + offset),
+                         limit=offset_type(limit))
+        return offset, limit, page_records(fetch(**arguments))
+
+    offsets = itertools.count(start, page_size)
+    if stop is not None:
+        offsets = itertools.takewhile(lambda offset: offset < stop, offsets)
+    if read_ahead:
+        pages = _pipeline(request, offsets, read_ahead)
+    else:
+        pages = (request(offset) for offset in offsets)
+
+    previous = None
+    try:
+        for offset, limit, records in pages:
+            if len(records) > limit and offset == start:
+                # The endpoint ignored the offset and limit and returned all
+                # of its records at once
+                for record in records[start:stop]:
+                    yield record
+                return
+            if not records or records == previous:
+                return
+            for record in records[:limit]:
+                yield record
+            if len(records) < limit:
+                return
+            previous = records
+    finally:
+        pages.close()
+
+
+def prefetch(fetch, params, total, page_size=DEFAULT_PAGE_SIZE,
+             first_offset=1, offset_type=int, workers=4, ordered=True,
+             start=0, max=None):
+    """Yield the records of an offset/limit endpoint, fetching the pages of a
+    known number of records concurrently.
+
+    At most `workers` pages are in flight, and at most `workers` pages are
+    held in memory. When the last planned page is full, the records have
+    grown since they were counted and the remaining ones are fetched
+    sequentially; when they have shrunk, the pages past the end are empty.
+    As with any offset pagination, records added or removed during the scan
+    may shift others across pages.
+
+    Args:
+        fetch(callable): The API wrapper method returning a page.
+        params(dict): The other keyword arguments of `fetch`.
+        total(int): The number of records, from the count endpoint.
+        page_size(int): The number of records requested per page.
+        first_offset(int): The offset of the first record on the server.
+        offset_type(type): The type of the `offset` and `limit` arguments of
+            `fetch`.
+        workers(int): The maximum number of concurrent requests.
+        ordered(bool): Yield the records in order; when False, yield the
+            pages in the order they are received.
+        start(int): The index of the first record to yield.
+        max(int): The maximum number of records to yield, or None for all of
+            them.
+
+    """
+    check_type(total, int, may_be_none=False)
+    check_type(workers, int, may_be_none=False)
+    if page_size <= 0 or workers <= 0:
+        raise ValueError('page_size and workers must be positive')
+
+    stop = total if max is None else min(total, start + max)
+    planned = iter(range(start, stop, page_size))
+    last_full = False
+    pending = collections.OrderedDict()
+    executor = ThreadPoolExecutor(workers)
+
+    def submit():
+        offset = next(planned, None)
+        if offset is not None:
+            limit = min(page_size, stop - offset)
+            future = executor.submit(_fetch_page, fetch, params,
+                                     first_offset + offset, limit,
+                                     offset_type)
+            pending[future] = (offset, limit)
+
+    try:
+        for _ in range(workers):
+            submit()
+        while pending:
+            if ordered:
+                done = [next(iter(pending))]
+            else:
+                done = wait(pending, return_when=FIRST_COMPLETED).done
+            for future in done:
+                offset, limit = pending.pop(future)
+                records = future.result()
+                if offset + limit == stop:
+                    last_full = len(records) == limit
+                submit()
+                for record in records:
+                    yield record
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+    if last_full and (max is None or stop < start + max):
+        # More records than counted
+        remaining = None if max is None else start + max - stop
+        for record in paginate(fetch, params, page_size, first_offset,
+                               offset_type, start=stop, max=remaining):
+            yield record
+
+
+def scan(fetch, params, page_size=DEFAULT_PAGE_SIZE, first_offset=1,
+         offset_type=int, count=None, workers=1, ordered=True, read_ahead=0,
+         start=0, max=None):
+    """Yield the records of an offset/limit endpoint.
+
+    The pages are fetched concurrently by :func:`prefetch` when `workers`
+    is above 1 and the `count` method counts the records matching `params`,
+    and sequentially by :func:`paginate`, reading `read_ahead` pages ahead,
+    otherwise.
+    """
+    check_type(workers, int, may_be_none=False)
+    total = None
+    if workers > 1 and count is not None:
+        arguments = count_arguments(count, params)
+        if arguments is not None:
+            total = count_value(count(**arguments))
+    if total is None:
+        records = paginate(fetch, params, page_size, first_offset,
+                           offset_type, start, max, read_ahead)
+    else:
+        records = prefetch(fetch, params, total, page_size, first_offset,
+                           offset_type, workers, ordered, start, max)
+    for record in records:
+        yield record
+
+
+def paginated(fetch, params, page_size=DEFAULT_PAGE_SIZE, first_offset=1,
+              offset_type=int, count=None, workers=1, ordered=True,
+              read_ahead=0):
+    """Return a reusable, sliceable iterable over an offset/limit endpoint.
+
+    Each iteration fetches the records again, page by page, `workers` pages
+    at a time when a `count` method is given. Slicing the iterable, as in
+    `[start:stop]`, requests the slice from the server instead of fetching
+    and discarding the records before `start`.
+
+    Args:
+        fetch(callable): The API wrapper method returning a page.
+        params(dict): The other keyword arguments of `fetch`; `offset` and
+            `limit` are managed by the pagination.
+        page_size(int): The number of records requested per page.
+        first_offset(int): The offset of the first record on the server.
+        offset_type(type): The type of the `offset` and `limit` arguments of
+            `fetch`.
+        count(callable): The API wrapper method counting the records, used
+            to fetch pages concurrently.
+        workers(int): The number of pages fetched concurrently.
+        ordered(bool): Yield the records in order, or as they are received.
+        read_ahead(int): The number of pages requested ahead of the page
+            being consumed, when the pages are fetched sequentially.
+
+    Returns:
+        GeneratorContainer: The records.
+
+    """
+    check_type(params, dict, may_be_none=False)
+    check_type(page_size, int, may_be_none=False)
+    for name in ('offset', 'limit'):
+        if params.get(name) is not None:
+            raise TypeError('{} is managed by the pagination; slice the '
+                            'result instead'.format(name))
+    params = dict((k, v) for k, v in params.items()
+                  if k not in ('offset', 'limit'))
+    return GeneratorContainer(scan, fetch, params, page_size, first_offset,
+                              offset_type, count, workers, ordered,
+                              read_ahead)
+
+
+def _fetch_range(fetch, offset, limit, **params):
+    return fetch(start_index=offset, records_to_return=limit, **params)
+
+
+def range_paginated(fetch, params, page_size=DEFAULT_PAGE_SIZE,
+                    maximum=RANGE_PAGE_MAXIMUM, count=None, workers=1,
+                    ordered=True, read_ahead=0):
+    """Return a reusable, sliceable iterable over a range endpoint.
+
+    Range endpoints, such as `/network-device/${startIndex}/
+    ${recordsToReturn}`, take the 1-based index of the first record and
+    the number of records as path parameters; they are paginated like
+    offset/limit endpoints, see :func:`paginated`.
+
+    Args:
+        fetch(callable): The API wrapper method returning a page, taking
+            `start_index` and `records_to_return` arguments.
+        params(dict): The other keyword arguments of `fetch`.
+        page_size(int): The number of records requested per page, capped
+            to `maximum`.
+        maximum(int): The most records the endpoint returns per call.
+        count(callable): The API wrapper method counting the records, used
+            to fetch pages concurrently.
+        workers(int): The number of pages fetched concurrently.
+        ordered(bool): Yield the records in order, or as they are received.
+        read_ahead(int): The number of pages requested ahead of the page
+            being consumed, when the pages are fetched sequentially.
+
+    Returns:
+        GeneratorContainer: The records.
+
+    """
+    check_type(params, dict, may_be_none=False)
+    check_type(page_size, int, may_be_none=False)
+    check_type(maximum, int)
+    for name in ('start_index', 'records_to_return'):
+        if params.get(name) is not None:
+            raise TypeError('{} is managed by the pagination; slice the '
+                            'result instead'.format(name))
+    if maximum:
+        page_size = min(page_size, maximum)
+    params = dict((k, v) for k, v in params.items()
+                  if k not in ('start_index', 'records_to_return'))
+    return paginated(functools.partial(_fetch_range, fetch), params,
+                     page_size, count=count, workers=workers, ordered=ordered,
+                     read_ahead=read_ahead)
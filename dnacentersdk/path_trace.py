@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+"""Concurrent path traces, with their completed results cached.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+from future import standard_library
+standard_library.install_aliases()
+
+import collections
+import queue
+import threading
+import time
+from builtins import *
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import (
+    DEFAULT_BULK_WORKERS, DEFAULT_MAX_PATH_TRACES, DEFAULT_PAGE_SIZE,
+    DEFAULT_PATH_TRACE_TTL, DEFAULT_TASK_MAX_POLL_INTERVAL,
+    DEFAULT_TASK_POLL_INTERVAL,
+)
+from .pagination import paginate
+from .utils import check_type
+
+
+TRACE_DONE = ('COMPLETED', 'FAILED')
+"""The statuses of completed path traces."""
+
+# The fields of a flow identifying its trace
+FLOW_KEY_FIELDS = ('sourceIP', 'destIP', 'sourcePort', 'destPort',
+                   'protocol')
+
+PathTraceResult = collections.namedtuple(
+    'PathTraceResult',
+    ['flow', 'flow_analysis_id', 'status', 'result', 'error', 'cached']
+)
+"""The outcome of the path trace of a flow: its `status` is COMPLETED or
+FAILED, as reported by DNA Center with the flow analysis as `result`,
+ERROR when a request failed (with the exception as `error`), or TIMEOUT
+when the trace did not complete in time. `cached` is True when the result
+was served from a :class:`PathTraceCache`."""
+
+
+def _flow(flow):
+    """The initiate_a_new_pathtrace fields of a flow."""
+    if isinstance(flow, (list, tuple)):
+        flow = dict(zip(('sourceIP', 'destIP'), flow))
+    flow = dict(flow)
+    for field in ('sourcePort', 'destPort'):
+        if flow.get(field) is not None:
+            flow[field] = str(flow[field])
+    return flow
+
+
+def flow_key(flow):
+    """The cache key of a flow: its addresses, ports and protocol."""
+    flow = _flow(flow)
+    return tuple(flow.get(field) for field in FLOW_KEY_FIELDS)
+
+
+class PathTraceCache(object):
+    """The completed path traces, by flow, for `ttl` seconds.
+
+    Flows are identified by their source and destination addresses and
+    ports and their protocol; failed traces are not cached.
+    """
+
+    def __init__(self, ttl=DEFAULT_PATH_TRACE_TTL):
+        """Initialize a new PathTraceCache object.
+
+        Args:
+            ttl(float,int): Seconds during which a completed trace is
+                served from the cache.
+
+        """
+        check_type(ttl, (float, int), may_be_none=False)
+        if ttl < 0:
+            raise ValueError('ttl must not be negative')
+
+        self.ttl = ttl
+        self.stats = collections.Counter()
+        """Counters: `hits`, `misses` and `expired` (misses of entries
+        older than `ttl`)."""
+
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, flow):
+        """The cached flow analysis of a flow, or None."""
+        key = flow_key(flow)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] >= self.ttl:
+                del self._entries[key]
+                self.stats['expired'] += 1
+                entry = None
+            self.stats['hits' if entry else 'misses'] += 1
+        return entry and entry[1]
+
+    def put(self, flow, result):
+        """Cache the flow analysis of a completed trace of a flow."""
+        with self._lock:
+            self._entries[flow_key(flow)] = (time.time(), result)
+
+    def clear(self):
+        """Forget every cached trace."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+def trace_paths(api, flows, cache=None,
+                max_traces=DEFAULT_MAX_PATH_TRACES,
+                workers=DEFAULT_BULK_WORKERS,
+                interval=DEFAULT_TASK_POLL_INTERVAL,
+                max_interval=DEFAULT_TASK_MAX_POLL_INTERVAL,
+                backoff=2.0, window_margin=60, window_limit=2000,
+                timeout=None, cleanup=True):
+    """Trace the paths of many flows, streaming the result of each one.
+
+    At most `max_traces` traces are in progress at once, and a flow is
+    traced once even when it is repeated. The statuses of the traces in
+    progress are read together, with one trace summary query covering
+    their creation times, every `interval` seconds while they progress,
+    backing off up to `max_interval` seconds while none of them changes.
+    The flow analysis of a completed trace is then read, and the trace is
+    deleted from DNA Center when `cleanup` is True.
+
+    Flows whose completed trace is in `cache` are not traced again; their
+    cached results are yielded as soon as the flows are read.
+
+    Args:
+        api(DNACenterAPI): The API used to trace the paths.
+        flows(iterable): The initiate_a_new_pathtrace fields of each flow
+            (`sourceIP`, `destIP`, `sourcePort`, `destPort`, `protocol`,
+            ...), or (sourceIP, destIP) tuples; consumed lazily.
+        cache(PathTraceCache): The cache of the completed traces, if any.
+        max_traces(int): The most traces in progress at once.
+        workers(int): The number of requests sent concurrently.
+        interval(float,int): The shortest delay between two status reads.
+        max_interval(float,int): The longest delay between two status
+            reads.
+        backoff(float,int): The factor applied to the delay when no trace
+            has changed.
+        window_margin(float,int): Seconds subtracted from the earliest
+            start of the traces in progress when querying their summaries,
+            to allow for the clock difference with DNA Center.
+        window_limit(int): The most trace summaries read per status
+            query; the traces it does not cover are read one by one.
+        timeout(float,int): Seconds after its start before a trace that
+            has not completed yields a TIMEOUT result.
+        cleanup(bool): Delete the traces once their result is read (or
+            they timed out). Failures to delete them are ignored.
+
+    Returns:
+        generator: A :class:`PathTraceResult` per flow, in the order in
+        which their traces complete.
+
+    """
+    check_type(cache, PathTraceCache)
+    check_type(max_traces, int, may_be_none=False)
+    check_type(workers, int, may_be_none=False)
+    check_type(interval, (float, int), may_be_none=False)
+    check_type(max_interval, (float, int), may_be_none=False)
+    check_type(backoff, (float, int), may_be_none=False)
+    check_type(window_margin, (float, int), may_be_none=False)
+    check_type(window_limit, int, may_be_none=False)
+    check_type(timeout, (float, int))
+    check_type(cleanup, bool, may_be_none=False)
+    if max_traces <= 0 or workers <= 0 or window_limit <= 0:
+        raise ValueError('The trace limits must be positive')
+    if interval <= 0 or max_interval < interval or backoff < 1:
+        raise ValueError('Invalid polling intervals')
+
+    path_trace = api.path_trace
+    started = queue.Queue()
+    requests = ThreadPoolExecutor(workers)
+
+    def sent(key):
+        def callback(future):
+            started.put((key, future))
+        return callback
+
+    def finish(flow_analysis_id):
+        try:
+            result = path_trace.retrieves_previous_pathtrace(
+                flow_analysis_id
+            ).response
+        except Exception as e:
+            result = e
+        if cleanup:
+            remove(flow_analysis_id)
+        return result
+
+    def remove(flow_analysis_id):
+        try:
+            path_trace.deletes_pathtrace_by_id(flow_analysis_id)
+        except Exception:
+            pass
+
+    flows = iter(flows)
+    exhausted = False
+    # The flows of each key being started or traced
+    waiting = collections.OrderedDict()
+    sending = 0
+    # The traces in progress: their key, start and last status
+    traces = collections.OrderedDict()
+    delay = interval
+    next_poll = time.time() + delay
+    try:
+        while True:
+            while not exhausted and sending + len(traces) < max_traces:
+                flow = next(flows, None)
+                if flow is None:
+                    exhausted = True
+                    break
+                flow = _flow(flow)
+                key = flow_key(flow)
+                if key in waiting:
+                    waiting[key].append(flow)
+                    continue
+                result = cache.get(flow) if cache is not None else None
+                if result is not None:
+                    yield PathTraceResult(flow, result.request.id,
+                                          'COMPLETED', result, None, True)
+                    continue
+                waiting[key] = [flow]
+                sending += 1
+                requests.submit(path_trace.initiate_a_new_pathtrace,
+                                **flow).add_done_callback(sent(key))
+            if not sending and not traces:
+                return
+            try:
+                wait = max(next_poll - time.time(), 0) if traces else None
+                key, future = started.get(timeout=wait)
+            except queue.Empty:
+                pass
+            else:
+                sending -= 1
+                try:
+                    flow_analysis_id = future.result().response \
+                        .flowAnalysisId
+                except Exception as e:
+                    for flow in waiting.pop(key):
+                        yield PathTraceResult(flow, None, 'ERROR', None, e,
+                                              False)
+                else:
+                    traces[flow_analysis_id] = [key, time.time(), None]
+            if not traces or time.time() < next_poll:
+                continue
+
+            statuses = _read_statuses(path_trace, traces, window_margin,
+                                      window_limit)
+            changed = False
+            done = []
+            for flow_analysis_id, (key, since, last) in list(traces.items()):
+                status = statuses.get(flow_analysis_id, last)
+                if status != last:
+                    changed = True
+                    traces[flow_analysis_id][2] = status
+                if status in TRACE_DONE:
+                    done.append(flow_analysis_id)
+                elif timeout is not None and time.time() - since >= timeout:
+                    del traces[flow_analysis_id]
+                    if cleanup:
+                        requests.submit(remove, flow_analysis_id)
+                    for flow in waiting.pop(key):
+                        yield PathTraceResult(flow, flow_analysis_id,
+                                              'TIMEOUT', None, None, False)
+            for flow_analysis_id, result in zip(done, requests.map(finish,
+                                                                   done)):
+                key = traces.pop(flow_analysis_id)[0]
+                flows_of_key = waiting.pop(key)
+                if isinstance(result, Exception):
+                    for flow in flows_of_key:
+                        yield PathTraceResult(flow, flow_analysis_id,
+                                              'ERROR', None, result, False)
+                    continue
+                status = result.request.status
+                if cache is not None and status == 'COMPLETED':
+                    cache.put(flows_of_key[0], result)
+                for flow in flows_of_key:
+                    yield PathTraceResult(flow, flow_analysis_id, status,
+                                          result, None, False)
+            delay = interval if changed else min(delay * backoff,
+                                                 max_interval)
+            next_poll = time.time() + delay
+    finally:
+        requests.shutdown(wait=False)
+
+
+def _read_statuses(path_trace, traces, window_margin, window_limit):
+    """The status of each trace in progress, by flow analysis id.
+
+    The summaries created since the earliest start of the traces are read
+    in one paged query, until every trace is found or `window_limit`
+    summaries are read; the traces missing from it are read one by one.
+    Traces whose status could not be read are left out.
+    """
+    earliest = min(since for key, since, last in traces.values())
+    statuses = {}
+    try:
+        summaries = paginate(
+            path_trace.retrives_all_previous_pathtraces_summary,
+            {'gt_create_time': str(int((earliest - window_margin) * 1000))},
+            page_size=min(window_limit, DEFAULT_PAGE_SIZE),
+            offset_type=str, max=window_limit,
+        )
+        for summary in summaries:
+            if summary.get('id') in traces:
+                statuses[summary['id']] = summary.get('status')
+                if len(statuses) == len(traces):
+                    break
+    except Exception:
+        pass
+    for flow_analysis_id in traces:
+        if flow_analysis_id not in statuses:
+            try:
+                data = path_trace.retrieves_previous_pathtrace(
+                    flow_analysis_id
+                )
+            except Exception:
+                continue
+            statuses[flow_analysis_id] = data.response.request.status
+    return statuses
@@ -33,6 +33,10 @@ from __future__ import (
 from future import standard_library
 standard_library.install_aliases()
 
+import collections
+import functools
+import os
+import threading
 import time
 import urllib.parse
 import warnings
@@ -40,10 +44,17 @@ from builtins import *
 
 import requests
 from past.builtins import basestring
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 
+from .cache import ResponseCache
+from .cassette import Cassette, RecordingAdapter, ReplayAdapter
 from .config import (
-    DEFAULT_SINGLE_REQUEST_TIMEOUT, DEFAULT_WAIT_ON_RATE_LIMIT, DEFAULT_VERIFY
+    DEFAULT_SINGLE_REQUEST_TIMEOUT, DEFAULT_WAIT_ON_RATE_LIMIT, DEFAULT_VERIFY,
+    DEFAULT_DOWNLOAD_CHUNK_SIZE, DEFAULT_DOWNLOAD_SEGMENT_SIZE,
+    DEFAULT_UPLOAD_CHUNK_SIZE, DEFAULT_UPLOAD_RETRIES,
 )
+from .download import resume_download, segmented_download, write_response
+from .upload import MultipartFile, UploadResult
 from .exceptions import (
     dnacentersdkException, RateLimitError, RateLimitWarning, ApiError,
 )
@@ -61,6 +72,15 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+class _Flight(object):
+    """A GET request in flight, shared by identical concurrent requests."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
 # Main module interface
 class RestSession(object):
     """RESTful HTTP session class for making calls to the DNA Center APIs."""
@@ -70,7 +90,8 @@ class RestSession(object):
                  wait_on_rate_limit=DEFAULT_WAIT_ON_RATE_LIMIT,
                  verify=DEFAULT_VERIFY,
                  version=None,
-                 debug=False):
+                 debug=False,
+                 pool_size=None):
         """Initialize a new RestSession object.
 
         Args:
@@ -93,6 +114,9 @@ class RestSession(object):
                 DNA Center APIs' request and response process.
                 Defaults to the DEBUG environment variable or False
                 if the environment variable is not set.
+            pool_size(int): The number of connections to DNA Center kept
+                open for reuse; at least the number of concurrent requests.
+                Defaults to the `requests` default (10).
 
         Raises:
             TypeError: If the parameter types are incorrect.
@@ -105,6 +129,7 @@ class RestSession(object):
         check_type(verify, (bool, basestring), may_be_none=False)
         check_type(version, basestring, may_be_none=False)
         check_type(debug, (bool), may_be_none=False)
+        check_type(pool_size, int)
 
         super(RestSession, self).__init__()
 
@@ -127,6 +152,23 @@ class RestSession(object):
 
         # Initialize a new `requests` session
         self._req_session = requests.session()
+        if pool_size is not None:
+            for prefix in ('https://', 'http://'):
+                self._req_session.mount(prefix,
+                                        HTTPAdapter(pool_maxsize=pool_size))
+        self._pool_size = pool_size if pool_size is not None \
+            else DEFAULT_POOLSIZE
+        self._cassette = None
+        self._adapters = None
+        self._cache = None
+        self._coalesce = False
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self._stats = collections.Counter()
+        # Rate limiting and token refreshes are shared by the threads using
+        # the session
+        self._resume_at = 0.0
+        self._refresh_lock = threading.Lock()
 
         # Update the headers of the `requests` session
         self.update_headers({'X-Auth-Token': access_token,
@@ -197,6 +239,11 @@ class RestSession(object):
         check_type(value, bool, may_be_none=False)
         self._wait_on_rate_limit = value
 
+    @property
+    def pool_size(self):
+        """The number of connections to DNA Center kept open for reuse."""
+        return self._pool_size
+
     @property
     def headers(self):
         """The HTTP headers used for requests in this session."""
@@ -230,6 +277,106 @@ class RestSession(object):
         self._access_token = self._get_access_token()
         self.update_headers({'X-Auth-Token': self.access_token})
 
+    @property
+    def cache(self):
+        """The GET response cache, or None when caching is disabled.
+
+        Assign a :class:`dnacentersdk.cache.ResponseCache` to enable it.
+        """
+        return self._cache
+
+    @cache.setter
+    def cache(self, value):
+        """Enable (or disable, with None) the GET response cache."""
+        check_type(value, ResponseCache)
+        self._cache = value
+
+    @property
+    def coalesce(self):
+        """Single-flight GET requests.
+
+        When enabled, identical GET requests (same URL, parameters and
+        headers) made concurrently share one call to DNA Center: the
+        requests that arrive while it is in flight wait for it and return
+        its result, or raise its error. Streamed requests are not shared.
+        The `coalesced` counter of :attr:`stats` counts the saved calls.
+
+        """
+        return self._coalesce
+
+    @coalesce.setter
+    def coalesce(self, value):
+        """Enable or disable single-flight GET requests."""
+        check_type(value, bool, may_be_none=False)
+        self._coalesce = value
+
+    @property
+    def stats(self):
+        """Session counters; `coalesced` counts the GET requests served by
+        an identical request in flight."""
+        return self._stats
+
+    @property
+    def cassette(self):
+        """The cassette in use, or None."""
+        return self._cassette
+
+    def use_cassette(self, path, record=False, realtime=False):
+        """Record the HTTP traffic of this session, or replay it.
+
+        When recording, requests are sent to DNA Center and their responses
+        are stored in the cassette, which is written to `path` by
+        :meth:`eject_cassette`. When replaying, the responses are served
+        from the cassette file and DNA Center is not contacted.
+
+        Note: The access token request is made outside of this session and
+        is neither recorded nor replayed.
+
+        Args:
+            path(basestring): The cassette file.
+            record(bool): Record a new cassette instead of replaying one.
+            realtime(bool): Replay the responses with their recorded
+                latency instead of as fast as possible.
+
+        Returns:
+            Cassette: The cassette in use.
+
+        """
+        check_type(path, basestring, may_be_none=False)
+        check_type(record, bool, may_be_none=False)
+        check_type(realtime, bool, may_be_none=False)
+
+        self.eject_cassette()
+        cassette = Cassette(path)
+        # Load the cassette first, so that the session is left untouched
+        # when it cannot be read
+        if not record:
+            cassette.load()
+        self._adapters = dict(self._req_session.adapters)
+        for prefix in ('https://', 'http://'):
+            if record:
+                adapter = RecordingAdapter(cassette,
+                                           self._req_session.adapters[prefix])
+            else:
+                adapter = ReplayAdapter(cassette, realtime=realtime)
+            self._req_session.mount(prefix, adapter)
+        self._cassette = cassette
+        return cassette
+
+    def eject_cassette(self):
+        """Stop recording or replaying, saving a recorded cassette."""
+        cassette, self._cassette = self._cassette, None
+        if cassette is None:
+            return
+        recording = isinstance(self._req_session.adapters['https://'],
+                               RecordingAdapter)
+        self._req_session.adapters.clear()
+        for prefix, adapter in self._adapters.items():
+            self._req_session.mount(prefix, adapter)
+        self._adapters = None
+        if recording:
+            cassette.save()
+
     def abs_url(self, url):
         """Given a relative or absolute URL; return an absolute URL.
 
@@ -281,12 +428,18 @@ class RestSession(object):
         c = custom_refresh
         while True:
             c += 1
+            # Wait for a rate limit hit by any request of the session
+            delay = self._resume_at - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            access_token = self._access_token
             # Make the HTTP request to the API endpoint
             try:
-                logger.debug('Attempt {}'.format(c))
-                logger.debug(pprint_request_info(abs_url, method,
-                                                 _headers=self.headers,
-                                                 **kwargs))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug('Attempt {}'.format(c))
+                    logger.debug(pprint_request_info(abs_url, method,
+                                                     _headers=self.headers,
+                                                     **kwargs))
                 response = self._req_session.request(method, abs_url, **kwargs)
             except socket.error:
                 # A socket error
@@ -317,7 +470,8 @@ class RestSession(object):
                 # Wait and retry if automatic rate-limit handling is enabled
                 if self.wait_on_rate_limit:
                     warnings.warn(RateLimitWarning(response))
-                    time.sleep(e.retry_after)
+                    self._resume_at = max(self._resume_at,
+                                          time.time() + e.retry_after)
                     continue
                 else:
                     # Re-raise the RateLimitError
@@ -325,16 +479,20 @@ class RestSession(object):
             except ApiError as e:
                 if e.status_code == 401 and custom_refresh < 1:
                     logger.debug(pprint_response_info(response))
-                    logger.debug('Refreshing access token')
-                    self.refresh_token()
-                    logger.debug('Refreshed token.')
+                    with self._refresh_lock:
+                        # Unless another request refreshed it meanwhile
+                        if self._access_token == access_token:
+                            logger.debug('Refreshing access token')
+                            self.refresh_token()
+                            logger.debug('Refreshed token.')
                     return self.request(method, url, erc, 1, **kwargs)
                 else:
                     # Re-raise the ApiError
                     logger.debug(pprint_response_info(response))
                     raise
             else:
-                logger.debug(pprint_response_info(response))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(pprint_response_info(response))
                 return response
 
     def multipart_data(self, fields, create_callback):
@@ -362,6 +520,69 @@ class RestSession(object):
         else:
             return None
 
+    def upload(self, url, path, params=None, field_name='file',
+               chunk_size=DEFAULT_UPLOAD_CHUNK_SIZE, hash_algorithms=None,
+               progress=None, retries=DEFAULT_UPLOAD_RETRIES, **kwargs):
+        """Upload a file as a multipart/form-data POST request.
+
+        The file is streamed from its path, `chunk_size` bytes at a time,
+        while its digests are computed. When the connection fails before a
+        response is received (for example, when it is reset), the file is
+        sent again from its start, up to `retries` times.
+
+        Args:
+            url(basestring): The URL of the API endpoint.
+            path(basestring): The path of the file.
+            params(dict): The parameters for the HTTP POST request.
+            field_name(basestring): The name of the form field of the file.
+            chunk_size(int): The number of bytes read at a time.
+            hash_algorithms(list): The hashlib algorithms whose digests of
+                the file are computed while it is sent.
+            progress(callable): Called after each chunk with the number of
+                bytes sent and the size of the file.
+            retries(int): The number of times the file is sent again after a
+                connection failure.
+            **kwargs: Passed on to the requests package.
+
+        Returns:
+            UploadResult: The JSON response, and the size and digests of
+            the file.
+
+        Raises:
+            ApiError: If anything other than the expected response code is
+                returned by the DNA Center API endpoint.
+            dnacentersdkException: If the file cannot be sent.
+
+        """
+        check_type(url, basestring, may_be_none=False)
+        check_type(path, basestring, may_be_none=False)
+        check_type(params, dict)
+        check_type(chunk_size, int, may_be_none=False)
+        check_type(retries, int, may_be_none=False)
+
+        body = MultipartFile(path, field_name=field_name,
+                             chunk_size=chunk_size,
+                             hash_algorithms=hash_algorithms,
+                             progress=progress)
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers.update({'Content-Type': body.content_type,
+                        'Content-Length': str(len(body))})
+        attempt = 0
+        while True:
+            try:
+                json_data = self.post(url, params=params, data=body,
+                                      headers=headers, **kwargs)
+                return UploadResult(json_data, body.size, body.digests)
+            except ApiError:
+                raise
+            except dnacentersdkException:
+                # The connection failed before a response was received
+                attempt += 1
+                if attempt > retries:
+                    raise
+                logger.debug('Sending {} again'.format(path))
+                time.sleep(min(2 ** attempt, 30) / 10)
+
     def get(self, url, params=None, **kwargs):
         """Sends a GET request.
 
@@ -382,22 +603,199 @@ class RestSession(object):
 
         # Expected response code
         erc = kwargs.pop('erc', EXPECTED_RESPONSE_CODE['GET'])
+        if self._coalesce and not kwargs.get('stream'):
+            key = ResponseCache.key(self.abs_url(url), params,
+                                    kwargs.get('headers'))
+            return self._single_flight(key, self._get, url, params, erc,
+                                       **kwargs)
+        return self._get(url, params, erc, **kwargs)
+
+    def download(self, url, sink=None, params=None,
+                 chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE, hash_algorithms=None,
+                 progress=None, resume=False, workers=1,
+                 segment_size=DEFAULT_DOWNLOAD_SEGMENT_SIZE, **kwargs):
+        """Download a file, streaming it to a sink.
+
+        When `sink` is a file path, an interrupted download can be resumed
+        (see :func:`dnacentersdk.download.resume_download`), and a large
+        file can be downloaded in segments by concurrent ranged requests
+        (see :func:`dnacentersdk.download.segmented_download`).
+
+        Args:
+            url(basestring): The URL of the API endpoint.
+            sink: None to save the file in the current directory, under the
+                name given by DNA Center; a directory to save it there, a
+                file path, a binary file object or a callable receiving each
+                chunk of data.
+            params(dict): The parameters for the HTTP GET request.
+            chunk_size(int): The number of bytes read at a time.
+            hash_algorithms(list): The hashlib algorithms whose digests of
+                the file are computed while downloading.
+            progress(callable): Called after each chunk with the number of
+                bytes received and the expected total (or None).
+            resume(bool): Keep the partial file of a failed download to a
+                file path, and resume from it. Segmented downloads
+                (`workers` > 1) cannot be resumed.
+            workers(int): The number of concurrent ranged requests
+                downloading a file to a file path.
+            segment_size(int): The number of bytes per ranged request.
+            **kwargs: Passed on to the requests package.
+
+        Returns:
+            DownloadResult: The outcome of the download.
+
+        Raises:
+            ApiError: If anything other than the expected response code is
+                returned by the DNA Center API endpoint.
+            ValueError: If `resume` is combined with `workers` > 1.
+            dnacentersdkException: If the file cannot be written.
+
+        """
+        check_type(url, basestring, may_be_none=False)
+        check_type(params, dict)
+        check_type(chunk_size, int, may_be_none=False)
+        check_type(resume, bool, may_be_none=False)
+        check_type(workers, int, may_be_none=False)
+        check_type(segment_size, int, may_be_none=False)
+        if resume and workers > 1:
+            raise ValueError('Segmented downloads cannot be resumed')
+
+        erc = kwargs.pop('erc', EXPECTED_RESPONSE_CODE['GET'])
+        headers = kwargs.pop('headers', None)
+
+        def send(range_headers, expected=erc):
+            request_headers = dict(headers or {})
+            request_headers.update(range_headers)
+            return self.request('GET', url, expected, 0, params=params,
+                                stream=True, headers=request_headers,
+                                **kwargs)
+
+        if isinstance(sink, basestring) and not os.path.isdir(sink):
+            if workers > 1:
+                return segmented_download(send, sink, segment_size, workers,
+                                          chunk_size=chunk_size,
+                                          hash_algorithms=hash_algorithms,
+                                          progress=progress)
+            if resume:
+                send_range = functools.partial(send,
+                                               expected=list(erc) + [416])
+                return resume_download(send_range, sink,
+                                       chunk_size=chunk_size,
+                                       hash_algorithms=hash_algorithms,
+                                       progress=progress)
+
+        # The last segment of the URL path names a file DNA Center does not
+        # name
+        default_name = urllib.parse.urlsplit(url).path.rstrip('/')
+        default_name = default_name.split('/')[-1]
+        with send({}) as resp:
+            return write_response(resp, sink, chunk_size=chunk_size,
+                                  hash_algorithms=hash_algorithms,
+                                  progress=progress,
+                                  default_name=default_name)
+
+    def iter_download(self, url, params=None,
+                      chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE, **kwargs):
+        """Download a file as a generator of chunks of data.
+
+        The request is sent when the iteration starts, and the connection is
+        released when it ends.
+
+        Args:
+            url(basestring): The URL of the API endpoint.
+            params(dict): The parameters for the HTTP GET request.
+            chunk_size(int): The most bytes per chunk.
+            **kwargs: Passed on to the requests package.
+
+        Returns:
+            generator: The chunks of data (bytes).
+
+        """
+        check_type(url, basestring, may_be_none=False)
+        check_type(params, dict)
+        check_type(chunk_size, int, may_be_none=False)
+
+        erc = kwargs.pop('erc', EXPECTED_RESPONSE_CODE['GET'])
+        with self.request('GET', url, erc, 0, params=params, stream=True,
+                          **kwargs) as resp:
+            for chunk in resp.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    yield chunk
+
+    def _single_flight(self, key, function, *args, **kwargs):
+        """Call `function`, unless a call of the same `key` is in flight, in
+        which case wait for it and share its outcome."""
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self._stats['coalesced'] += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = function(*args, **kwargs)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _get(self, url, params, erc, **kwargs):
+        """Send a GET request, through the response cache when enabled."""
         stream = kwargs.get('stream', None)
+        if self._cache is not None and not stream:
+            ttl = self._cache.ttl_for(self.abs_url(url))
+            if ttl:
+                return self._cached_get(url, params, erc, ttl, **kwargs)
         with self.request('GET', url, erc, 0, params=params, **kwargs) as resp:
             if stream and 'fileName' in resp.headers:
-                try:
-                    file_name = resp.headers.get('fileName')
-                    with open(file_name, 'wb') as f:
-                        logger.debug('Downloading {} ...'.format(file_name))
-                        for chunk in resp.iter_content(chunk_size=1024):
-                            if chunk:
-                                f.write(chunk)
-                except Exception as e:
-                    raise dnacentersdkException('DownloadFailure {}'.format(e))
-                logger.debug('Downloaded')
-            return extract_and_parse_json(resp, ignore=stream)
+                # Saved in the current directory, see download() for other
+                # destinations
+                write_response(resp, chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE)
+            json_data = extract_and_parse_json(resp, ignore=stream)
+            if self._cache is not None and not stream:
+                self._cache.observe(self.abs_url(url), json_data)
+            return json_data
         return None
 
+    def _cached_get(self, url, params, erc, ttl, **kwargs):
+        """Serve a GET request from the response cache when possible."""
+        cache = self._cache
+        key = cache.key(self.abs_url(url), params, kwargs.get('headers'))
+        entry = cache.lookup(key)
+        if entry is not None:
+            if entry.fresh:
+                return entry.data
+            # Revalidate the stale entry
+            headers = dict(kwargs.get('headers') or {})
+            headers.update(entry.conditional_headers())
+            kwargs['headers'] = headers
+            erc = list(erc) + [304]
+        generation = cache.generation
+        with self.request('GET', url, erc, 0, params=params, **kwargs) as resp:
+            if resp.status_code == 304 and entry is not None:
+                return cache.revalidated(entry, ttl).data
+            json_data = extract_and_parse_json(resp)
+            if resp.status_code == 200:
+                cache.store(key, json_data, ttl, resp.headers.get('ETag'),
+                            resp.headers.get('Last-Modified'), generation)
+            cache.observe(key[0], json_data)
+            return json_data
+
+    def _written(self, method, url, json, json_data):
+        """Let the response cache drop what a successful write made stale."""
+        if self._cache is not None:
+            self._cache.written(method, self.abs_url(url), json, json_data)
+        return json_data
+
     def post(self, url, params=None, json=None, data=None, **kwargs):
         """Sends a POST request.
 
@@ -422,7 +820,8 @@ class RestSession(object):
 
         response = self.request('POST', url, erc, 0, params=params,
                                 json=json, data=data, **kwargs)
-        return extract_and_parse_json(response)
+        return self._written('POST', url, json,
+                             extract_and_parse_json(response))
 
     def put(self, url, params=None, json=None, data=None, **kwargs):
         """Sends a PUT request.
@@ -448,7 +847,8 @@ class RestSession(object):
 
         response = self.request('PUT', url, erc, 0, params=params,
                                 json=json, data=data, **kwargs)
-        return extract_and_parse_json(response)
+        return self._written('PUT', url, json,
+                             extract_and_parse_json(response))
 
     def delete(self, url, params=None, **kwargs):
         """Sends a DELETE request.
@@ -471,4 +871,5 @@ class RestSession(object):
         erc = kwargs.pop('erc', EXPECTED_RESPONSE_CODE['DELETE'])
 
         response = self.request('DELETE', url, erc, 0, params=params, **kwargs)
-        return extract_and_parse_json(response)
+        return self._written('DELETE', url, kwargs.get('json'),
+                             extract_and_parse_json(response))
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""A local stand-in for DNA Center, for load and scale testing.
+
+The simulator answers the intent API endpoints used by the API wrappers from
+a synthetic inventory, so throughput can be measured offline::
+
+    python -m dnacentersdk.simulator --devices 100000 --latency 0.05
+
+or, from Python::
+
+    from dnacentersdk.simulator import SimulatorServer
+
+    with SimulatorServer(throttle_rate=0.01) as server:
+        api = DNACenterAPI(username='admin', password='secret',
+                           base_url=server.base_url, verify=False)
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+from .app import (
+    Simulator,
+    SimulatorError,
+    SimulatorRequest,
+    SimulatorResponse,
+    TaskFailure,
+)
+from .inventory import Inventory
+from .server import SimulatorServer
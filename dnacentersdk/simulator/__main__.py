@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Run the DNA Center simulator.
+
+Usage::
+
+    python -m dnacentersdk.simulator [--port PORT] [--devices N] ...
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+import sys
+
+from .app import DEFAULT_MAX_PAGE_SIZE, DEFAULT_SITES, Simulator
+from .inventory import (
+    DEFAULT_DEVICES, DEFAULT_INTERFACES_PER_DEVICE, Inventory,
+)
+from .server import SimulatorServer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m dnacentersdk.simulator')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--devices', type=int, default=DEFAULT_DEVICES)
+    parser.add_argument('--interfaces-per-device', type=int,
+                        default=DEFAULT_INTERFACES_PER_DEVICE)
+    parser.add_argument('--sites', type=int, default=DEFAULT_SITES)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='random extra latency upper bound (seconds)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0,
+                        help='probability of a 429 response')
+    parser.add_argument('--rate-limit', type=int, default=None,
+                        help='requests per second before 429 responses')
+    parser.add_argument('--retry-after', type=int, default=1,
+                        help='Retry-After header of 429 responses')
+    parser.add_argument('--token-ttl', type=float, default=None,
+                        help='access token lifetime (seconds)')
+    parser.add_argument('--username', help='accepted username')
+    parser.add_argument('--password', help='accepted password')
+    parser.add_argument('--task-duration', type=float, default=0.0,
+                        help='seconds before asynchronous tasks complete')
+    parser.add_argument('--task-failure-rate', type=float, default=0.0,
+                        help='probability of a failed task')
+    parser.add_argument('--max-page-size', type=int,
+                        default=DEFAULT_MAX_PAGE_SIZE)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    simulator = Simulator(
+        inventory=Inventory(args.devices, args.interfaces_per_device),
+        sites=args.sites,
+        latency=args.latency,
+        jitter=args.jitter,
+        throttle_rate=args.throttle_rate,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        token_ttl=args.token_ttl,
+        credentials=(args.username, args.password)
+        if args.username else None,
+        task_duration=args.task_duration,
+        task_failure_rate=args.task_failure_rate,
+        max_page_size=args.max_page_size,
+        seed=args.seed,
+    )
+    server = SimulatorServer(simulator, host=args.host, port=args.port)
+    sys.stderr.write('DNA Center simulator listening on {}\n'
+                     ''.format(server.base_url))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,1669 @@
+# -*- coding: utf-8 -*-
+"""Request handling of the DNA Center simulator.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+from future import standard_library
+standard_library.install_aliases()
+
+import base64
+import collections
+import email.parser
+import hashlib
+import heapq
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+from builtins import *
+
+from .inventory import Inventory
+
+
+INTENT_API = '/dna/intent/api/v1'
+AUTH_TOKEN_PATH = '/dna/system/api/v1/auth/token'
+EXECUTION_STATUS_PATH = \
+    '/dna/platform/management/business-api/v1/execution-status'
+
+# Command runner limits and the first words of its read-only commands
+COMMAND_RUNNER_MAX_COMMANDS = 5
+COMMAND_RUNNER_MAX_DEVICES = 100
+LEGIT_READS = ('cat', 'dir', 'more', 'ping', 'show', 'traceroute')
+
+# Template deployment target types, and the device fields they match
+TEMPLATE_TARGET_FIELDS = {
+    'MANAGED_DEVICE_UUID': 'id',
+    'MANAGED_DEVICE_IP': 'managementIpAddress',
+    'MANAGED_DEVICE_HOSTNAME': 'hostname',
+}
+
+DEFAULT_MAX_PAGE_SIZE = 500
+DEFAULT_SITES = 10
+
+JSON_CONTENT_TYPE = 'application/json;charset=UTF-8'
+
+
+SimulatorResponse = collections.namedtuple(
+    'SimulatorResponse', ['status', 'headers', 'body']
+)
+
+
+class SimulatorRequest(object):
+    """A request received by the simulator."""
+
+    def __init__(self, method, url, headers=None, body=None):
+        parsed = urllib.parse.urlsplit(url)
+        self.method = method.upper()
+        self.path = parsed.path
+        self.query = urllib.parse.parse_qs(parsed.query,
+                                           keep_blank_values=True)
+        self.headers = dict((str(k).lower(), v)
+                            for k, v in (headers or {}).items())
+        self.body = body or b''
+
+    def value(self, name, default=None):
+        """The first value of the query parameter `name`."""
+        values = self.query.get(name)
+        return values[0] if values else default
+
+    def values(self, name, separator=None):
+        """All the values of the query parameter `name`.
+
+        Repeated parameters are accepted, and values are split on
+        `separator` for the parameters documented as lists.
+        """
+        return [v for value in self.query.get(name, [])
+                for v in (value.split(separator) if separator else [value])
+                if v]
+
+    def integer(self, name, default):
+        """The query parameter `name` as an integer."""
+        value = self.value(name)
+        if value in (None, ''):
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise SimulatorError(400, 'Invalid value for {}: {}'
+                                      ''.format(name, value))
+
+    def json(self):
+        """The decoded JSON body of the request."""
+        if not self.body:
+            return None
+        try:
+            return json.loads(self.body.decode('utf-8'))
+        except ValueError:
+            raise SimulatorError(400, 'Malformed JSON body')
+
+
+class SimulatorError(Exception):
+    """An error response returned by a route handler."""
+
+    def __init__(self, status, message, headers=None):
+        super(SimulatorError, self).__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+class TaskFailure(Exception):
+    """Raised by a task action to complete its task with an error."""
+    pass
+
+
+_ROUTES = []
+
+
+def route(method, template):
+    """Register a Simulator method as the handler of `method` `template`.
+
+    `${name}` placeholders of the template are passed to the handler as
+    keyword arguments.
+    """
+    def decorator(func):
+        _ROUTES.append((method, template, func.__name__))
+        return func
+    return decorator
+
+
+def _compile(template):
+    segments = template.strip('/').split('/')
+    pattern = '/'.join(
+        '(?P<{}>[^/]+)'.format(s[2:-1]) if s.startswith('${')
+        else re.escape(s)
+        for s in segments
+    )
+    # Literal segments take precedence over placeholders
+    precedence = tuple(s.startswith('${') for s in segments)
+    return re.compile('^/' + pattern + '/?$'), precedence
+
+
+def _json_response(data, status=200, headers=None):
+    response_headers = {'Content-Type': JSON_CONTENT_TYPE}
+    response_headers.update(headers or {})
+    return SimulatorResponse(status, response_headers,
+                             json.dumps(data).encode('utf-8'))
+
+
+def _error_body(status, message):
+    return {'response': {'errorCode': str(status), 'message': message,
+                         'detail': message},
+            'version': '1.0'}
+
+
+def _wrap(response):
+    return {'response': response, 'version': '1.0'}
+
+
+def _page(iterable, offset, limit):
+    """Return `limit` items of `iterable`, starting at index `offset`."""
+    return list(itertools.islice(iterable, max(0, offset),
+                                 max(0, offset) + max(0, limit)))
+
+
+class Simulator(object):
+    """An in-memory stand-in for the DNA Center intent APIs.
+
+    It serves the authentication, network-device, interface, site, tag,
+    task, PnP, command runner, file, software image, template and path
+    trace endpoints used by the API wrappers from a synthetic
+    :class:`Inventory`, and can inject latency, rate limiting (429 responses
+    with a `Retry-After` header), dropped connections and access token
+    expiry. Write operations return asynchronous tasks (or site execution
+    ids) that complete after `task_duration` seconds; their changes are
+    applied when they complete.
+
+    Offsets are 1-based, as on DNA Center, except on the PnP device list
+    whose offset is 0-based.
+
+    The simulator is not bound to a transport; use
+    :class:`dnacentersdk.simulator.SimulatorServer` to serve it over HTTP.
+    """
+
+    def __init__(self, inventory=None, sites=DEFAULT_SITES,
+                 latency=0.0, jitter=0.0,
+                 throttle_rate=0.0, rate_limit=None, retry_after=1,
+                 token_ttl=None, credentials=None,
+                 task_duration=0.0, task_failure_rate=0.0,
+                 max_page_size=DEFAULT_MAX_PAGE_SIZE, etags=False, seed=0):
+        """Initialize a new Simulator object.
+
+        Args:
+            inventory(Inventory): The device inventory. Defaults to an
+                Inventory with 1,000 devices.
+            sites(int): The number of areas (each with one building)
+                created under the Global site.
+            latency(float): Seconds added to every response.
+            jitter(float): Upper bound of a random number of seconds added
+                to `latency`.
+            throttle_rate(float): The probability that a request is rejected
+                with 429 Too Many Requests.
+            rate_limit(int): Reject requests with 429 beyond this number of
+                requests per second.
+            retry_after(int): The `Retry-After` header of 429 responses.
+            token_ttl(float): The lifetime of access tokens in seconds;
+                requests made with an expired token get 401 Unauthorized.
+                Tokens do not expire by default.
+            credentials(tuple): The accepted (username, password). Any
+                credentials are accepted by default.
+            task_duration(float): Seconds before asynchronous tasks
+                complete.
+            task_failure_rate(float): The probability that an asynchronous
+                task completes with an error, or that the provisioning of a
+                claimed PnP device fails.
+            max_page_size(int): The largest page returned by list endpoints.
+            etags(bool): Send ETag headers and answer matching conditional
+                GET requests with 304 Not Modified.
+            seed(int): Seed of the random number generator.
+
+        """
+        self.inventory = inventory if inventory is not None else Inventory()
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.token_ttl = token_ttl
+        self.credentials = credentials
+        self.task_duration = task_duration
+        self.task_failure_rate = task_failure_rate
+        self.max_page_size = max_page_size
+        self.etags = etags
+
+        self.stats = collections.Counter()
+        """Request counters: `requests`, `throttled`, `unauthorized`,
+        `not_found`, `not_modified`, `dropped` and one counter per route
+        (`'GET /path/${id}'`)."""
+
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._tokens = {}
+        self._window = collections.deque()
+        self._pending = []
+        self._tasks = collections.OrderedDict()
+        self._executions = {}
+        self._sites = collections.OrderedDict()
+        self._tags = collections.OrderedDict()
+        self._tag_members = {}
+        self._pnp_devices = collections.OrderedDict()
+        self._pnp_serials = {}
+        self._pnp_history = collections.defaultdict(list)
+        self._files = collections.OrderedDict()
+        self._images = collections.OrderedDict()
+        self._distributed = collections.defaultdict(set)
+        self._templates = collections.OrderedDict()
+        self._template_versions = {}
+        self._deployments = collections.OrderedDict()
+        self._flow_analyses = collections.OrderedDict()
+        self._drops = collections.Counter()
+
+        self._routes = sorted(
+            (_compile(template) + (method, template, name)
+             for method, template, name in _ROUTES),
+            key=lambda r: r[1],
+        )
+        self._seed_sites(sites)
+
+    # Request processing
+
+    def handle(self, method, url, headers=None, body=None):
+        """Process a request and return a SimulatorResponse.
+
+        Args:
+            method(basestring): The HTTP method.
+            url(basestring): The request path, including the query string.
+            headers(dict): The request headers.
+            body(bytes): The request body.
+
+        """
+        request = SimulatorRequest(method, url, headers, body)
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        with self._lock:
+            self._run_pending()
+            self.stats['requests'] += 1
+            try:
+                return self._dispatch(request)
+            except SimulatorError as e:
+                return _json_response(_error_body(e.status, e.message),
+                                      e.status, e.headers)
+
+    def _dispatch(self, request):
+        for regex, _, method, template, name in self._routes:
+            if method != request.method:
+                continue
+            match = regex.match(request.path)
+            if match:
+                break
+        else:
+            self.stats['not_found'] += 1
+            raise SimulatorError(404, 'No route for {} {}'
+                                      ''.format(request.method, request.path))
+
+        route_name = '{} {}'.format(method, template)
+        self.stats[route_name] += 1
+        if self._drops[route_name] > 0:
+            self._drops[route_name] -= 1
+            self.stats['dropped'] += 1
+            return SimulatorResponse(None, {}, b'')
+        if template != AUTH_TOKEN_PATH:
+            self._check_rate_limit()
+            self._check_token(request)
+        params = dict((k, urllib.parse.unquote(v))
+                      for k, v in match.groupdict().items())
+        response = getattr(self, name)(request, **params)
+        if not isinstance(response, SimulatorResponse):
+            response = _json_response(response)
+        if self.etags and request.method == 'GET' \
+                and response.status == 200:
+            etag = '"{}"'.format(hashlib.md5(response.body).hexdigest())
+            response.headers['ETag'] = etag
+            if request.headers.get('if-none-match') == etag:
+                self.stats['not_modified'] += 1
+                return SimulatorResponse(304, {'ETag': etag}, b'')
+        return response
+
+    def _check_rate_limit(self):
+        throttled = self.throttle_rate and \
+            self._random.random() < self.throttle_rate
+        if self.rate_limit and not throttled:
+            now = time.time()
+            while self._window and self._window[0] <= now - 1:
+                self._window.popleft()
+            throttled = len(self._window) >= self.rate_limit
+            if not throttled:
+                self._window.append(now)
+        if throttled:
+            self.stats['throttled'] += 1
+            raise SimulatorError(429, 'Rate limit exceeded',
+                                 {'Retry-After': str(self.retry_after)})
+
+    def _check_token(self, request):
+        token = request.headers.get('x-auth-token')
+        expires = self._tokens.get(token, 0)
+        if expires is None or expires > time.time():
+            return
+        self.stats['unauthorized'] += 1
+        raise SimulatorError(401, 'Invalid or expired access token')
+
+    def expire_tokens(self):
+        """Invalidate every access token issued so far."""
+        with self._lock:
+            self._tokens.clear()
+
+    def drop_requests(self, route, count=1):
+        """Close the connection of the next requests to a route unanswered.
+
+        Args:
+            route(basestring): The route, as in `stats`, for example
+                `'POST /dna/intent/api/v1/image/importation/source/file'`.
+            count(int): The number of requests dropped.
+
+        """
+        with self._lock:
+            self._drops[route] += count
+
+    # Helpers
+
+    def _new_id(self):
+        return '{:08x}-{:04x}-4{:03x}-8{:03x}-{:012x}'.format(
+            next(self._ids), self._random.getrandbits(16),
+            self._random.getrandbits(12), self._random.getrandbits(12),
+            self._random.getrandbits(48),
+        )
+
+    @staticmethod
+    def _now():
+        return int(time.time() * 1000)
+
+    def _defer(self, delay, callback):
+        """Call `callback` once `delay` seconds have passed."""
+        if delay <= 0:
+            callback()
+        else:
+            heapq.heappush(self._pending,
+                           (time.time() + delay, next(self._ids), callback))
+
+    def _run_pending(self):
+        now = time.time()
+        while self._pending and self._pending[0][0] <= now:
+            heapq.heappop(self._pending)[2]()
+
+    def run_pending(self):
+        """Complete the tasks and state changes that are due."""
+        with self._lock:
+            self._run_pending()
+
+    def _start_task(self, action=None, service_type='simulator-service'):
+        """Create an asynchronous task and return the DNA Center response.
+
+        `action` is called when the task completes; it applies the changes
+        of the operation and may return the task progress, or raise
+        TaskFailure.
+        """
+        now = self._now()
+        task_id = self._new_id()
+        task = {
+            'id': task_id, 'rootId': task_id, 'serviceType': service_type,
+            'startTime': now, 'lastUpdate': now, 'version': now,
+            'progress': 'In progress', 'isError': False,
+            'username': 'simulator', 'instanceTenantId': 'simulator',
+        }
+        self._tasks[task_id] = task
+        fails = self.task_failure_rate and \
+            self._random.random() < self.task_failure_rate
+
+        def complete():
+            try:
+                if fails:
+                    raise TaskFailure('Simulated task failure')
+                progress = action() if action else None
+                task['progress'] = progress or 'Task completed'
+            except TaskFailure as e:
+                task.update(isError=True, failureReason=str(e),
+                            progress='Task failed')
+            task['endTime'] = task['lastUpdate'] = self._now()
+
+        self._defer(self.task_duration, complete)
+        return _json_response(
+            _wrap({'taskId': task_id, 'url': '/api/v1/task/' + task_id}),
+            202,
+        )
+
+    def _start_execution(self, name, action):
+        """Create a site (business API) execution."""
+        execution_id = self._new_id()
+        execution = {'bapiExecutionId': execution_id, 'bapiName': name,
+                     'status': 'IN_PROGRESS', 'startTime': self._now()}
+        self._executions[execution_id] = execution
+
+        def complete():
+            try:
+                action()
+                execution['status'] = 'SUCCESS'
+            except TaskFailure as e:
+                execution.update(status='FAILURE', bapiError=str(e))
+            execution['endTime'] = self._now()
+
+        self._defer(self.task_duration, complete)
+        return _json_response({
+            'executionId': execution_id,
+            'executionStatusUrl': '{}/{}'.format(EXECUTION_STATUS_PATH,
+                                                 execution_id),
+            'message': 'The request has been accepted for execution',
+        }, 202)
+
+    def _payload(self, request, expected=dict):
+        payload = request.json()
+        if not isinstance(payload, expected):
+            raise SimulatorError(400, 'Invalid request body')
+        return payload
+
+    def _device(self, value, field='id'):
+        index = self.inventory.index_of(field, value)
+        if index is None:
+            raise SimulatorError(404, 'Device {} not found'.format(value))
+        return index
+
+    # Authentication
+
+    @route('POST', AUTH_TOKEN_PATH)
+    def auth_token(self, request):
+        authorization = request.headers.get('authorization', '')
+        try:
+            scheme, encoded = authorization.split(' ', 1)
+            username, password = base64.b64decode(
+                encoded).decode('utf-8').split(':', 1)
+        except (ValueError, TypeError):
+            raise SimulatorError(401, 'Missing or malformed credentials')
+        accepted = not self.credentials \
+            or tuple(self.credentials) == (username, password)
+        if scheme.lower() != 'basic' or not accepted:
+            raise SimulatorError(401, 'Authentication has failed')
+        token = base64.b64encode(
+            hashlib.sha256(self._new_id().encode('utf-8')).digest()
+        ).decode('ascii')
+        self._tokens[token] = None if self.token_ttl is None \
+            else time.time() + self.token_ttl
+        return {'Token': token}
+
+    # Devices
+
+    @route('GET', INTENT_API + '/network-device')
+    def get_device_list(self, request):
+        # Only the ids are documented as a comma-separated list
+        filters = dict((k, request.values(k, ',' if k == 'id' else None))
+                       for k in request.query if k not in ('offset', 'limit'))
+        offset = request.integer('offset', 1)
+        limit = min(request.integer('limit', self.max_page_size),
+                    self.max_page_size)
+        indexes = _page(self.inventory.find_devices(filters), offset - 1,
+                        limit)
+        return _wrap([self.inventory.device(i) for i in indexes])
+
+    @route('GET', INTENT_API + '/network-device/count')
+    def get_device_count(self, request):
+        return _wrap(self.inventory.device_count)
+
+    @route('GET', INTENT_API + '/network-device/${id}')
+    def get_device_by_id(self, request, id):
+        return _wrap(self.inventory.device(self._device(id)))
+
+    @route('GET', INTENT_API + '/network-device/serial-number/${serialNumber}')
+    def get_device_by_serial_number(self, request, serialNumber):
+        index = self._device(serialNumber, 'serialNumber')
+        return _wrap(self.inventory.device(index))
+
+    @route('GET', INTENT_API + '/network-device/ip-address/${ipAddress}')
+    def get_network_device_by_ip(self, request, ipAddress):
+        index = self._device(ipAddress, 'managementIpAddress')
+        return _wrap(self.inventory.device(index))
+
+    @route('GET', INTENT_API
+           + '/network-device/${startIndex}/${recordsToReturn}')
+    def get_network_device_by_pagination_range(self, request, startIndex,
+                                               recordsToReturn):
+        try:
+            start, count = int(startIndex), int(recordsToReturn)
+        except ValueError:
+            raise SimulatorError(400, 'Invalid range')
+        indexes = _page(self.inventory.find_devices(), start - 1,
+                        min(count, self.max_page_size))
+        return _wrap([self.inventory.device(i) for i in indexes])
+
+    @route('GET', INTENT_API + '/network-device/${networkDeviceId}/config')
+    def get_device_config_by_id(self, request, networkDeviceId):
+        record = self.inventory.device(self._device(networkDeviceId))
+        return _wrap('hostname {}\n!\nend\n'.format(record['hostname']))
+
+    @route('POST', INTENT_API + '/network-device')
+    def add_device(self, request):
+        payload = self._payload(request)
+        addresses = payload.get('ipAddress') or []
+
+        def action():
+            for address in addresses:
+                if self.inventory.index_of('managementIpAddress',
+                                           address) is not None:
+                    raise TaskFailure('Device {} already exists'
+                                      ''.format(address))
+            for address in addresses:
+                self.inventory.add_device(managementIpAddress=address,
+                                          hostname=address)
+
+        return self._start_task(action, 'inventory-service')
+
+    @route('PUT', INTENT_API + '/network-device')
+    def sync_devices(self, request):
+        self._payload(request)
+        return self._start_task(service_type='inventory-service')
+
+    @route('PUT', INTENT_API + '/network-device/sync')
+    def sync_devices_using_forcesync(self, request):
+        ids = self._payload(request, list)
+        for value in ids:
+            self._device(value)
+        return self._start_task(service_type='inventory-service')
+
+    @route('PUT', INTENT_API + '/network-device/brief')
+    def update_device_role(self, request):
+        payload = self._payload(request)
+        index = self._device(payload.get('id'))
+        fields = {'role': payload.get('role'),
+                  'roleSource': payload.get('roleSource') or 'MANUAL'}
+
+        def action():
+            if not self.inventory.exists(index):
+                raise TaskFailure('Device {} not found'.format(payload['id']))
+            self.inventory.update_device(index, **fields)
+
+        return self._start_task(action, 'inventory-service')
+
+    @route('DELETE', INTENT_API + '/network-device/${id}')
+    def delete_device_by_id(self, request, id):
+        index = self._device(id)
+        return self._start_task(lambda: self.inventory.delete_device(index),
+                                'inventory-service')
+
+    # Interfaces
+
+    @route('GET', INTENT_API + '/interface')
+    def get_all_interfaces(self, request):
+        offset = request.integer('offset', 1)
+        limit = min(request.integer('limit', self.max_page_size),
+                    self.max_page_size)
+        return _wrap(_page(self.inventory.interfaces(max(0, offset - 1)),
+                           0, limit))
+
+    @route('GET', INTENT_API + '/interface/count')
+    def get_device_interface_count(self, request):
+        return _wrap(self.inventory.interface_count)
+
+    @route('GET', INTENT_API + '/interface/${id}')
+    def get_interface_by_id(self, request, id):
+        record = self.inventory.interface_by_id(id)
+        if record is None:
+            raise SimulatorError(404, 'Interface {} not found'.format(id))
+        return _wrap(record)
+
+    def _device_interfaces(self, device):
+        index = self._device(device)
+        return (self.inventory.interface(index, port)
+                for port in range(self.inventory.interfaces_per_device))
+
+    @route('GET', INTENT_API + '/interface/network-device/${deviceId}')
+    def get_interface_info_by_id(self, request, deviceId):
+        return _wrap(list(self._device_interfaces(deviceId)))
+
+    @route('GET', INTENT_API + '/interface/network-device/${deviceId}/count')
+    def get_device_interface_count_by_id(self, request, deviceId):
+        self._device(deviceId)
+        return _wrap(self.inventory.interfaces_per_device)
+
+    @route('GET', INTENT_API + '/interface/network-device/${deviceId}/'
+                               '${startIndex}/${recordsToReturn}')
+    def get_device_interfaces_by_specified_range(self, request, deviceId,
+                                                 startIndex,
+                                                 recordsToReturn):
+        try:
+            start, count = int(startIndex), int(recordsToReturn)
+        except ValueError:
+            raise SimulatorError(400, 'Invalid range')
+        return _wrap(_page(self._device_interfaces(deviceId), start - 1,
+                           count))
+
+    # Sites
+
+    def _add_site(self, name, parent, site_type):
+        site_id = self._new_id()
+        hierarchy = '{}/{}'.format(parent['siteNameHierarchy'], name) \
+            if parent else name
+        self._sites[site_id] = {
+            'id': site_id,
+            'name': name,
+            'parentId': parent['id'] if parent else None,
+            'siteNameHierarchy': hierarchy,
+            'siteHierarchy': '{}/{}'.format(parent['siteHierarchy'], site_id)
+            if parent else site_id,
+            'additionalInfo': [{'nameSpace': 'Location',
+                                'attributes': {'type': site_type}}],
+            'instanceTenantId': 'simulator',
+        }
+        return self._sites[site_id]
+
+    def _seed_sites(self, count):
+        root = self._add_site('Global', None, 'area')
+        for number in range(1, count + 1):
+            area = self._add_site('Area-{}'.format(number), root, 'area')
+            self._add_site('Building-1', area, 'building')
+
+    def _site_by_hierarchy(self, hierarchy):
+        for site in self._sites.values():
+            if site['siteNameHierarchy'] == hierarchy:
+                return site
+        return None
+
+    @staticmethod
+    def _site_type(site):
+        return site['additionalInfo'][0]['attributes']['type']
+
+    @route('GET', INTENT_API + '/site')
+    def get_site(self, request):
+        names = request.values('name')
+        ids = request.values('siteId')
+        types = request.values('type')
+        sites = [s for s in self._sites.values()
+                 if (not names or s['siteNameHierarchy'] in names)
+                 and (not ids or s['id'] in ids)
+                 and (not types or self._site_type(s) in types)]
+        if (names or ids) and not sites:
+            raise SimulatorError(404, 'Site not found')
+        offset = request.integer('offset', 1)
+        limit = request.integer('limit', self.max_page_size)
+        return _wrap(_page(sites, offset - 1, limit))
+
+    @route('GET', INTENT_API + '/site/count')
+    def get_site_count(self, request):
+        ids = request.values('siteId')
+        return _wrap(len([s for s in self._sites.values()
+                          if not ids or s['id'] in ids]))
+
+    @route('POST', INTENT_API + '/site')
+    @route('POST', '/dna/system/api/v1/site')
+    def create_site(self, request):
+        payload = self._payload(request)
+        site_type = payload.get('type')
+        fields = (payload.get('site') or {}).get(site_type) or {}
+        if site_type not in ('area', 'building', 'floor') or \
+                not fields.get('name'):
+            raise SimulatorError(400, 'Invalid site definition')
+
+        def action():
+            parent = self._site_by_hierarchy(
+                fields.get('parentName') or 'Global'
+            )
+            if parent is None:
+                raise TaskFailure('Parent site not found')
+            hierarchy = '{}/{}'.format(parent['siteNameHierarchy'],
+                                       fields['name'])
+            if self._site_by_hierarchy(hierarchy):
+                raise TaskFailure('Site {} already exists'.format(hierarchy))
+            self._add_site(fields['name'], parent, site_type)
+
+        return self._start_execution('Create Site', action)
+
+    @route('PUT', INTENT_API + '/site/${siteId}')
+    def update_site(self, request, siteId):
+        payload = self._payload(request)
+        if siteId not in self._sites:
+            raise SimulatorError(404, 'Site not found')
+        site_type = payload.get('type') or self._site_type(self._sites[siteId])
+        name = ((payload.get('site') or {}).get(site_type) or {}).get('name')
+
+        def action():
+            site = self._sites.get(siteId)
+            if site is None:
+                raise TaskFailure('Site not found')
+            if name and name != site['name']:
+                old = site['siteNameHierarchy']
+                new = old[:-len(site['name'])] + name
+                site['name'] = name
+                for other in self._sites.values():
+                    hierarchy = other['siteNameHierarchy']
+                    if hierarchy == old or hierarchy.startswith(old + '/'):
+                        other['siteNameHierarchy'] = new + hierarchy[len(old):]
+
+        return self._start_execution('Update Site', action)
+
+    @route('DELETE', INTENT_API + '/site/${siteId}')
+    def delete_site(self, request, siteId):
+        if siteId not in self._sites:
+            raise SimulatorError(404, 'Site not found')
+
+        def action():
+            if any(s['parentId'] == siteId for s in self._sites.values()):
+                raise TaskFailure('Site has child sites')
+            self._sites.pop(siteId, None)
+
+        return self._start_execution('Delete Site', action)
+
+    @route('POST', '/dna/system/api/v1/site/${siteId}/device')
+    @route('POST', INTENT_API + '/site/${siteId}/device')
+    def assign_device_to_site(self, request, siteId):
+        payload = self._payload(request)
+        if siteId not in self._sites:
+            raise SimulatorError(404, 'Site not found')
+        indexes = [self._device(device.get('ip'), 'managementIpAddress')
+                   for device in payload.get('device') or []]
+
+        def action():
+            site = self._sites.get(siteId)
+            if site is None:
+                raise TaskFailure('Site not found')
+            for index in indexes:
+                self.inventory.update_device(
+                    index, location=siteId,
+                    locationName=site['siteNameHierarchy'],
+                )
+
+        return self._start_execution('Assign Device To Site', action)
+
+    @route('GET', EXECUTION_STATUS_PATH + '/${executionId}')
+    def get_execution_status(self, request, executionId):
+        if executionId not in self._executions:
+            raise SimulatorError(404, 'Execution not found')
+        return self._executions[executionId]
+
+    # Tags
+
+    def _tag(self, tag_id):
+        if tag_id not in self._tags:
+            raise SimulatorError(404, 'Tag {} not found'.format(tag_id))
+        return self._tags[tag_id]
+
+    @route('GET', INTENT_API + '/tag')
+    def get_tag(self, request):
+        names = request.values('name')
+        tags = [t for t in self._tags.values()
+                if not names or t['name'] in names]
+        offset = request.integer('offset', 1)
+        limit = request.integer('limit', self.max_page_size)
+        return _wrap(_page(tags, offset - 1, limit))
+
+    @route('GET', INTENT_API + '/tag/count')
+    def get_tag_count(self, request):
+        return _wrap(len(self._tags))
+
+    @route('GET', INTENT_API + '/tag/${id}')
+    def get_tag_by_id(self, request, id):
+        return _wrap(self._tag(id))
+
+    @route('POST', INTENT_API + '/tag')
+    def create_tag(self, request):
+        payload = self._payload(request)
+        if not payload.get('name'):
+            raise SimulatorError(400, 'Tag name is required')
+        tag_id = self._new_id()
+
+        def action():
+            if any(t['name'] == payload['name'] for t in self._tags.values()):
+                raise TaskFailure('Tag {} already exists'
+                                  ''.format(payload['name']))
+            tag = {'systemTag': False, 'dynamicRules': [],
+                   'description': '', 'instanceTenantId': 'simulator'}
+            tag.update(payload)
+            tag['id'] = tag_id
+            self._tags[tag_id] = tag
+            self._tag_members[tag_id] = collections.OrderedDict()
+            return tag_id
+
+        return self._start_task(action, 'tagging-service')
+
+    @route('PUT', INTENT_API + '/tag')
+    def update_tag(self, request):
+        payload = self._payload(request)
+        self._tag(payload.get('id'))
+
+        def action():
+            self._tag(payload['id']).update(payload)
+
+        return self._start_task(action, 'tagging-service')
+
+    @route('DELETE', INTENT_API + '/tag/${id}')
+    def delete_tag(self, request, id):
+        self._tag(id)
+
+        def action():
+            self._tags.pop(id, None)
+            self._tag_members.pop(id, None)
+
+        return self._start_task(action, 'tagging-service')
+
+    def _member_record(self, member_id, member_type):
+        if member_type == 'networkdevice':
+            index = self.inventory.index_of('id', member_id)
+            if index is not None:
+                return self.inventory.device(index)
+        return {'id': member_id, 'instanceUuid': member_id}
+
+    @route('GET', INTENT_API + '/tag/${id}/member')
+    def get_tag_members_by_id(self, request, id):
+        self._tag(id)
+        member_type = request.value('memberType')
+        if not member_type:
+            raise SimulatorError(400, 'memberType is required')
+        members = [m for m, t in self._tag_members[id].items()
+                   if t == member_type]
+        offset = request.integer('offset', 1)
+        limit = request.integer('limit', self.max_page_size)
+        return _wrap([self._member_record(m, member_type)
+                      for m in _page(members, offset - 1, limit)])
+
+    @route('GET', INTENT_API + '/tag/${id}/member/count')
+    def get_tag_member_count(self, request, id):
+        self._tag(id)
+        member_type = request.value('memberType')
+        return _wrap(len([t for t in self._tag_members[id].values()
+                          if not member_type or t == member_type]))
+
+    @route('POST', INTENT_API + '/tag/${id}/member')
+    def add_members_to_the_tag(self, request, id):
+        self._tag(id)
+        payload = self._payload(request)
+
+        def action():
+            members = self._tag_members.get(id)
+            if members is None:
+                raise TaskFailure('Tag {} not found'.format(id))
+            for member_type, member_ids in payload.items():
+                for member_id in member_ids or []:
+                    members[member_id] = member_type
+
+        return self._start_task(action, 'tagging-service')
+
+    @route('DELETE', INTENT_API + '/tag/${id}/member/${memberId}')
+    def remove_tag_member(self, request, id, memberId):
+        self._tag(id)
+
+        def action():
+            self._tag_members.get(id, {}).pop(memberId, None)
+
+        return self._start_task(action, 'tagging-service')
+
+    @route('PUT', INTENT_API + '/tag/member')
+    def updates_tag_membership(self, request):
+        payload = self._payload(request)
+        member_type = payload.get('memberType') or 'networkdevice'
+        member_to_tags = payload.get('memberToTags') or {}
+
+        def action():
+            for member_id, tag_ids in member_to_tags.items():
+                for members in self._tag_members.values():
+                    members.pop(member_id, None)
+                for tag_id in tag_ids:
+                    if tag_id in self._tag_members:
+                        self._tag_members[tag_id][member_id] = member_type
+
+        return self._start_task(action, 'tagging-service')
+
+    # Tasks
+
+    def _task(self, task_id):
+        if task_id not in self._tasks:
+            raise SimulatorError(404, 'Task {} not found'.format(task_id))
+        return self._tasks[task_id]
+
+    def _find_tasks(self, request):
+        # startTime and endTime bound the start time of the tasks
+        start_time = request.integer('startTime', None)
+        end_time = request.integer('endTime', None)
+        filters = [(k, request.values(k)) for k in request.query
+                   if k not in ('offset', 'limit', 'sortBy', 'order',
+                                'startTime', 'endTime')]
+        for task in self._tasks.values():
+            if start_time is not None and task['startTime'] < start_time:
+                continue
+            if end_time is not None and task['startTime'] > end_time:
+                continue
+            if all(str(task.get(k)).lower() in [v.lower() for v in values]
+                   for k, values in filters if values):
+                yield task
+
+    @route('GET', INTENT_API + '/task')
+    def get_tasks(self, request):
+        offset = request.integer('offset', 1)
+        limit = request.integer('limit', self.max_page_size)
+        return _wrap(_page(self._find_tasks(request), offset - 1, limit))
+
+    @route('GET', INTENT_API + '/task/count')
+    def get_task_count(self, request):
+        return _wrap(sum(1 for _ in self._find_tasks(request)))
+
+    @route('GET', INTENT_API + '/task/${taskId}')
+    def get_task_by_id(self, request, taskId):
+        return _wrap(self._task(taskId))
+
+    @route('GET', INTENT_API + '/task/${taskId}/tree')
+    def get_task_tree(self, request, taskId):
+        return _wrap([self._task(taskId)])
+
+    @route('GET', INTENT_API + '/task/operation/${operationId}/'
+                               '${offset}/${limit}')
+    def get_task_by_operationid(self, request, operationId, offset, limit):
+        return _wrap([])
+
+    # PnP
+
+    def _pnp_device(self, pnp_id):
+        if pnp_id not in self._pnp_devices:
+            raise SimulatorError(404, 'Device {} not found'.format(pnp_id))
+        return self._pnp_devices[pnp_id]
+
+    def _pnp_event(self, serial_number, details, error=False):
+        self._pnp_history[serial_number].append(
+            {'timestamp': self._now(), 'details': details,
+             'errorFlag': error, 'historyTaskInfo': {}}
+        )
+
+    def _add_pnp_device(self, device):
+        info = dict(device.get('deviceInfo') or {})
+        serial_number = info.get('serialNumber')
+        if not serial_number:
+            raise ValueError('serialNumber is required')
+        if serial_number in self._pnp_serials:
+            raise ValueError('Device with serial number {} already exists'
+                             ''.format(serial_number))
+        now = self._now()
+        record = {
+            'id': self._new_id(),
+            'version': 1,
+            'deviceInfo': {
+                'name': serial_number, 'pid': None, 'source': 'User',
+                'stack': False, 'sudiRequired': False,
+            },
+            'tenantId': 'simulator',
+        }
+        record['deviceInfo'].update(info)
+        record['deviceInfo'].update(state='Unclaimed',
+                                    onbState='Not Contacted',
+                                    addedOn=now, lastUpdateOn=now)
+        self._pnp_devices[record['id']] = record
+        self._pnp_serials[serial_number] = record['id']
+        self._pnp_event(serial_number, 'Device added')
+        return record
+
+    def _set_pnp_state(self, record, state, details):
+        info = record['deviceInfo']
+        info.update(state=state, lastUpdateOn=self._now())
+        record['version'] += 1
+        self._pnp_event(info['serialNumber'], details)
+
+    def _claim_pnp_device(self, pnp_id, **fields):
+        record = self._pnp_device(pnp_id)
+        record['deviceInfo'].update(fields)
+        self._set_pnp_state(record, 'Planned', 'Device claimed')
+        fails = self.task_failure_rate and \
+            self._random.random() < self.task_failure_rate
+
+        def provision():
+            if pnp_id not in self._pnp_devices:
+                return
+            if fails:
+                record['deviceInfo']['onbState'] = 'Error'
+                self._set_pnp_state(record, 'Error', 'Provisioning failed')
+            else:
+                record['deviceInfo']['onbState'] = 'Provisioned'
+                self._set_pnp_state(record, 'Provisioned',
+                                    'Device provisioned')
+
+        self._defer(self.task_duration, provision)
+
+    def _find_pnp_devices(self, request):
+        filters = [(k, request.values(k)) for k in
+                   ('serialNumber', 'state', 'onbState', 'name', 'pid',
+                    'siteId', 'workflowId', 'source')]
+        for device in self._pnp_devices.values():
+            if all(str(device['deviceInfo'].get(k)) in values
+                   for k, values in filters if values):
+                yield device
+
+    @route('GET', INTENT_API + '/onboarding/pnp-device')
+    def pnp_get_device_list(self, request):
+        offset = request.integer('offset', 0)
+        limit = request.integer('limit', len(self._pnp_devices))
+        return _page(self._find_pnp_devices(request), offset, limit)
+
+    @route('GET', INTENT_API + '/onboarding/pnp-device/count')
+    def pnp_get_device_count(self, request):
+        return _wrap(sum(1 for _ in self._find_pnp_devices(request)))
+
+    @route('GET', INTENT_API + '/onboarding/pnp-device/history')
+    def get_device_history(self, request):
+        serial_number = request.value('serialNumber')
+        if not serial_number:
+            raise SimulatorError(400, 'serialNumber is required')
+        return {'response': list(self._pnp_history.get(serial_number, [])),
+                'statusCode': 200}
+
+    @route('GET', INTENT_API + '/onboarding/pnp-device/${id}')
+    def get_device_by_id_pnp(self, request, id):
+        return self._pnp_device(id)
+
+    @route('POST', INTENT_API + '/onboarding/pnp-device')
+    def add_pnp_device(self, request):
+        try:
+            return self._add_pnp_device(self._payload(request))
+        except ValueError as e:
+            raise SimulatorError(409, str(e))
+
+    @route('PUT', INTENT_API + '/onboarding/pnp-device/${id}')
+    def update_pnp_device(self, request, id):
+        record = self._pnp_device(id)
+        payload = self._payload(request)
+        record['deviceInfo'].update(payload.get('deviceInfo') or {})
+        record['version'] += 1
+        return record
+
+    @route('DELETE', INTENT_API + '/onboarding/pnp-device/${id}')
+    def delete_device_by_id_from_pnp(self, request, id):
+        record = self._pnp_devices.pop(self._pnp_device(id)['id'])
+        self._pnp_serials.pop(record['deviceInfo']['serialNumber'], None)
+        return record
+
+    @route('POST', INTENT_API + '/onboarding/pnp-device/import')
+    def import_devices_in_bulk(self, request):
+        success, failure = [], []
+        for position, device in enumerate(self._payload(request, list)):
+            try:
+                success.append(self._add_pnp_device(device))
+            except (ValueError, AttributeError) as e:
+                if not isinstance(device, dict):
+                    device = {}
+                failure.append({
+                    'index': position,
+                    'serialNum': (device.get('deviceInfo') or {}).get(
+                        'serialNumber'),
+                    'id': device.get('id'),
+                    'msg': str(e),
+                })
+        return {'successList': success, 'failureList': failure}
+
+    @route('POST', INTENT_API + '/onboarding/pnp-device/site-claim')
+    def claim_a_device_to_a_site(self, request):
+        payload = self._payload(request)
+        if payload.get('siteId') not in self._sites:
+            raise SimulatorError(400, 'Site {} not found'
+                                      ''.format(payload.get('siteId')))
+        self._claim_pnp_device(payload.get('deviceId'),
+                               siteId=payload['siteId'])
+        return _wrap('Device Claimed')
+
+    @route('POST', INTENT_API + '/onboarding/pnp-device/claim')
+    def claim_device(self, request):
+        payload = self._payload(request)
+        claims = payload.get('deviceClaimList') or []
+        for claim in claims:
+            self._pnp_device(claim.get('deviceId'))
+        for claim in claims:
+            self._claim_pnp_device(claim['deviceId'])
+        return {'jsonArrayResponse': [], 'jsonResponse': {},
+                'message': 'Device(s) Claimed', 'statusCode': 200}
+
+    # Command runner
+
+    @route('GET', INTENT_API + '/network-device-poller/cli/legit-reads')
+    def get_all_keywords_of_clis_accepted(self, request):
+        return _wrap(list(LEGIT_READS))
+
+    @route('POST', INTENT_API + '/network-device-poller/cli/read-request')
+    def run_read_only_commands_on_devices(self, request):
+        payload = self._payload(request)
+        commands = payload.get('commands') or []
+        device_ids = payload.get('deviceUuids') or []
+        if not commands or not device_ids:
+            raise SimulatorError(400, 'commands and deviceUuids are required')
+        if len(commands) > COMMAND_RUNNER_MAX_COMMANDS:
+            raise SimulatorError(400, 'At most {} commands are accepted'
+                                      ''.format(COMMAND_RUNNER_MAX_COMMANDS))
+        if len(device_ids) > COMMAND_RUNNER_MAX_DEVICES:
+            raise SimulatorError(400, 'At most {} devices are accepted'
+                                      ''.format(COMMAND_RUNNER_MAX_DEVICES))
+
+        def action():
+            results = []
+            for device_id in device_ids:
+                responses = {'SUCCESS': {}, 'FAILURE': {}, 'BLACKLISTED': {}}
+                index = self.inventory.index_of('id', device_id)
+                for command in commands:
+                    if command.split()[0].lower() not in LEGIT_READS:
+                        responses['BLACKLISTED'][command] = \
+                            'Command is not a read-only command'
+                    elif index is None:
+                        responses['FAILURE'][command] = \
+                            'Device {} not found'.format(device_id)
+                    else:
+                        device = self.inventory.device(index)
+                        responses['SUCCESS'][command] = \
+                            '{}#{}\n{} output of {}\n'.format(
+                                device['hostname'], command, command,
+                                device['hostname'])
+                results.append({'deviceUuid': device_id,
+                                'commandResponses': responses})
+            file_id = self.add_file(
+                'command-runner-{}.json'.format(self._new_id()),
+                json.dumps(results).encode('utf-8'), 'command-runner'
+            )
+            return json.dumps({'fileId': file_id})
+
+        return self._start_task(action, 'command-runner-service')
+
+    # Files
+
+    def add_file(self, name, content, namespace='config'):
+        """Store a file served by the file endpoints and return its id.
+
+        Args:
+            name(basestring): The file name.
+            content(bytes): The file content.
+            namespace(basestring): The file namespace.
+
+        """
+        with self._lock:
+            file_id = self._new_id()
+            self._files[file_id] = {
+                'id': file_id, 'name': name, 'nameSpace': namespace,
+                'fileSize': str(len(content)),
+                'md5Checksum': hashlib.md5(content).hexdigest(),
+                'sha1Checksum': hashlib.sha1(content).hexdigest(),
+                'downloadPath': '/file/' + file_id,
+                'content': content,
+            }
+            return file_id
+
+    @staticmethod
+    def _file_record(record):
+        return dict((k, v) for k, v in record.items() if k != 'content')
+
+    @route('GET', INTENT_API + '/file/namespace')
+    def get_list_of_available_namespaces(self, request):
+        return _wrap(sorted(set(f['nameSpace'] for f in self._files.values())))
+
+    @route('GET', INTENT_API + '/file/namespace/${nameSpace}')
+    def get_list_of_files(self, request, nameSpace):
+        return _wrap([self._file_record(f) for f in self._files.values()
+                      if f['nameSpace'] == nameSpace])
+
+    @route('GET', INTENT_API + '/file/${fileId}')
+    def download_a_file_by_fileid(self, request, fileId):
+        record = self._files.get(fileId)
+        if record is None:
+            raise SimulatorError(404, 'File {} not found'.format(fileId))
+        content = record['content']
+        headers = {
+            'Content-Type': 'application/octet-stream',
+            'Accept-Ranges': 'bytes',
+            'fileName': record['name'],
+            'Content-Disposition': 'attachment; filename="{}"'
+                                   ''.format(record['name']),
+        }
+        match = re.match(r'bytes=(\d*)-(\d*)$',
+                         request.headers.get('range', ''))
+        if not match or not any(match.groups()):
+            return SimulatorResponse(200, headers, content)
+        # A single byte range, or the last bytes when the start is omitted
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = min(int(last), len(content) - 1) if last \
+                else len(content) - 1
+        else:
+            start = max(len(content) - int(last), 0)
+            end = len(content) - 1
+        if start >= len(content) or end < start:
+            raise SimulatorError(416, 'Range not satisfiable', {
+                'Content-Range': 'bytes */{}'.format(len(content)),
+            })
+        headers['Content-Range'] = 'bytes {}-{}/{}'.format(start, end,
+                                                           len(content))
+        return SimulatorResponse(206, headers, content[start:end + 1])
+
+    # Software images
+
+    def add_image(self, name, content=b'', version='17.1.1', **fields):
+        """Store a software image and return its id.
+
+        Args:
+            name(basestring): The image name.
+            content(bytes): The image content, used for its checksums.
+            version(basestring): The software version installed on the
+                devices the image is activated on.
+            **fields: Other fields of the image record.
+
+        """
+        with self._lock:
+            image_uuid = self._new_id()
+            image = {
+                'imageUuid': image_uuid, 'name': name, 'imageName': name,
+                'family': 'CAT9K', 'vendor': 'CISCO', 'applicationType': '',
+                'version': version, 'displayVersion': version,
+                'imageType': 'SYSTEM_SW', 'importSourceType': 'FILESYSTEM',
+                'imageIntegrityStatus': 'VERIFIED',
+                'isTaggedGolden': False,
+                'fileSize': '{} bytes'.format(len(content)),
+                'md5Checksum': hashlib.md5(content).hexdigest(),
+                'shaCheckSum': hashlib.sha512(content).hexdigest(),
+                'createdTime': self._now(),
+            }
+            image.update(fields)
+            self._images[image_uuid] = image
+            return image_uuid
+
+    @staticmethod
+    def _multipart_file(request):
+        """The file name and content of a multipart/form-data request."""
+        content_type = request.headers.get('content-type', '')
+        if not content_type.startswith('multipart/form-data'):
+            raise SimulatorError(415, 'Expected a multipart/form-data body')
+        message = email.parser.BytesParser().parsebytes(
+            b'Content-Type: ' + content_type.encode('latin-1')
+            + b'\r\n\r\n' + request.body
+        )
+        for part in message.get_payload() if message.is_multipart() else ():
+            if part.get_filename():
+                return part.get_filename(), part.get_payload(decode=True)
+        raise SimulatorError(400, 'No file in the request body')
+
+    @route('POST', INTENT_API + '/image/importation/source/file')
+    def import_local_software_image(self, request):
+        name, content = self._multipart_file(request)
+        third_party = request.value('isThirdParty', '').lower() == 'true'
+
+        def action():
+            if any(i['name'] == name for i in self._images.values()):
+                raise TaskFailure('Image {} already exists'.format(name))
+            image_uuid = self.add_image(
+                name, content,
+                family=request.value('thirdPartyImageFamily')
+                or ('THIRD-PARTY' if third_party else 'CAT9K'),
+                vendor=request.value('thirdPartyVendor')
+                or ('' if third_party else 'CISCO'),
+                applicationType=request.value('thirdPartyApplicationType')
+                or '',
+            )
+            return json.dumps({'imageUuid': image_uuid})
+
+        return self._start_task(action, 'swim-service')
+
+    @route('GET', INTENT_API + '/image/importation')
+    def get_software_image_details(self, request):
+        filters = [(key, request.value(key))
+                   for key in ('imageUuid', 'name', 'family', 'version',
+                               'imageName', 'applicationType',
+                               'imageIntegrityStatus')
+                   if request.value(key)]
+        images = (i for i in self._images.values()
+                  if all(i.get(k) == v for k, v in filters))
+        offset = request.integer('offset', 1)
+        limit = min(request.integer('limit', self.max_page_size),
+                    self.max_page_size)
+        return _wrap(_page(images, offset - 1, limit))
+
+    def _swim_device(self, device_id):
+        index = self.inventory.index_of('id', device_id)
+        if index is None:
+            raise TaskFailure('Device {} not found'.format(device_id))
+        return index
+
+    def _swim_image(self, image_uuid):
+        image = self._images.get(image_uuid)
+        if image is None:
+            raise TaskFailure('Image {} not found'.format(image_uuid))
+        return image
+
+    @route('POST', INTENT_API + '/image/distribution')
+    def trigger_software_image_distribution(self, request):
+        payload = self._payload(request, list)
+
+        def action():
+            for item in payload:
+                self._swim_device(item.get('deviceUuid'))
+                self._swim_image(item.get('imageUuid'))
+            for item in payload:
+                self._distributed[item['deviceUuid']].add(item['imageUuid'])
+
+        return self._start_task(action, 'swim-service')
+
+    @route('POST', INTENT_API + '/image/activation/device')
+    def trigger_software_image_activation(self, request):
+        payload = self._payload(request, list)
+
+        def action():
+            activations = []
+            for item in payload:
+                device_id = item.get('deviceUuid')
+                index = self._swim_device(device_id)
+                images = [self._swim_image(i)
+                          for i in item.get('imageUuidList') or ()]
+                if not images:
+                    raise TaskFailure('No image to activate')
+                for image in images:
+                    if image['imageUuid'] not in self._distributed[device_id] \
+                            and not item.get('distributeIfNeeded'):
+                        raise TaskFailure('Image {} is not distributed to '
+                                          'device {}'.format(image['name'],
+                                                             device_id))
+                activations.append((device_id, index, images))
+            for device_id, index, images in activations:
+                for image in images:
+                    self._distributed[device_id].add(image['imageUuid'])
+                self.inventory.update_device(
+                    index, softwareVersion=images[0]['version']
+                )
+
+        return self._start_task(action, 'swim-service')
+
+    # Templates
+
+    def add_template(self, name, content, project_name='Onboarding',
+                     software_type='IOS-XE', **fields):
+        """Store a configuration template and return its id.
+
+        Args:
+            name(basestring): The template name.
+            content(basestring): The template content.
+            project_name(basestring): The name of its project.
+            software_type(basestring): Its software type.
+            **fields: Other fields of the template record.
+
+        """
+        with self._lock:
+            template_id = self._new_id()
+            project_id = next(
+                (t['projectId'] for t in self._templates.values()
+                 if t['projectName'] == project_name),
+                None,
+            ) or self._new_id()
+            now = self._now()
+            template = {
+                'id': template_id, 'name': name, 'projectId': project_id,
+                'projectName': project_name, 'templateContent': content,
+                'softwareType': software_type, 'softwareVariant': 'XE',
+                'deviceTypes': [{'productFamily': 'Switches and Hubs'}],
+                'templateParams': [], 'composite': False,
+                'version': '1', 'createTime': now, 'lastUpdateTime': now,
+            }
+            template.update(fields)
+            self._templates[template_id] = template
+            self._template_versions[template_id] = [
+                self._template_version(template, 'Initial version'),
+            ]
+            return template_id
+
+    def _template_version(self, template, comments):
+        return {'id': template['id'], 'version': template['version'],
+                'versionTime': self._now(), 'description': comments}
+
+    def _template(self, template_id):
+        template = self._templates.get(template_id)
+        if template is None:
+            raise SimulatorError(404, 'Template {} not found'
+                                      ''.format(template_id))
+        return template
+
+    def _template_summary(self, template):
+        return {'name': template['name'],
+                'projectName': template['projectName'],
+                'projectId': template['projectId'],
+                'templateId': template['id'],
+                'versionsInfo': list(self._template_versions[template['id']])}
+
+    @route('GET', INTENT_API + '/template-programmer/project')
+    def get_projects(self, request):
+        names = request.values('name')
+        projects = collections.OrderedDict()
+        for template in self._templates.values():
+            if names and template['projectName'] not in names:
+                continue
+            project = projects.setdefault(template['projectId'], {
+                'id': template['projectId'],
+                'name': template['projectName'], 'templates': [],
+            })
+            project['templates'].append({'id': template['id'],
+                                         'name': template['name'],
+                                         'composite': template['composite']})
+        return list(projects.values())
+
+    @route('GET', INTENT_API + '/template-programmer/template')
+    def gets_the_templates_available(self, request):
+        filters = [(k, request.values(k))
+                   for k in ('projectId', 'softwareType', 'softwareVariant')]
+        return [self._template_summary(t) for t in self._templates.values()
+                if all(t.get(k) in values for k, values in filters
+                       if values)]
+
+    @route('GET', INTENT_API
+           + '/template-programmer/template/version/${templateId}')
+    def get_template_versions(self, request, templateId):
+        return [self._template_summary(self._template(templateId))]
+
+    @route('PUT', INTENT_API + '/template-programmer/template')
+    def update_template(self, request):
+        payload = self._payload(request)
+        template = self._template(payload.get('id'))
+        fields = dict((k, v) for k, v in payload.items()
+                      if k not in ('id', 'version', 'createTime'))
+
+        def action():
+            template.update(fields, lastUpdateTime=self._now())
+
+        return self._start_task(action, 'template-service')
+
+    @route('POST', INTENT_API + '/template-programmer/template/version')
+    def version_template(self, request):
+        payload = self._payload(request)
+        template = self._template(payload.get('templateId'))
+
+        def action():
+            template['version'] = str(int(template['version']) + 1)
+            self._template_versions[template['id']].append(
+                self._template_version(template, payload.get('comments'))
+            )
+
+        return self._start_task(action, 'template-service')
+
+    @route('GET', INTENT_API + '/template-programmer/template/${templateId}')
+    def get_template_details(self, request, templateId):
+        return self._template(templateId)
+
+    @route('POST', INTENT_API + '/template-programmer/template/deploy')
+    def deploy_template(self, request):
+        payload = self._payload(request)
+        template = self._template(payload.get('templateId'))
+        deployment_id = self._new_id()
+        now = self._now()
+        devices = []
+        for target in payload.get('targetInfo') or ():
+            field = TEMPLATE_TARGET_FIELDS.get(target.get('type'))
+            index = self.inventory.index_of(field, target.get('id')) \
+                if field else None
+            device = {'deviceId': target.get('id'), 'ipAddress': None,
+                      'name': None, 'status': 'IN_PROGRESS',
+                      'startTime': now}
+            if index is not None:
+                record = self.inventory.device(index)
+                device.update(deviceId=record['id'],
+                              ipAddress=record['managementIpAddress'],
+                              name=record['hostname'])
+            devices.append((device, index))
+        deployment = {
+            'deploymentId': deployment_id,
+            'deploymentName': template['name'],
+            'projectName': template['projectName'],
+            'templateName': template['name'],
+            'templateVersion': template['version'],
+            'status': 'IN_PROGRESS', 'startTime': now,
+            'devices': [device for device, _ in devices],
+        }
+        self._deployments[deployment_id] = deployment
+
+        def complete():
+            end = self._now()
+            for device, index in devices:
+                failed = self.task_failure_rate and \
+                    self._random.random() < self.task_failure_rate
+                if index is None:
+                    message = 'Device not found'
+                elif failed:
+                    message = 'Simulated deployment failure'
+                else:
+                    message = 'Provisioning success for template {}' \
+                              ''.format(template['name'])
+                device.update(
+                    status='FAILURE' if index is None or failed
+                    else 'SUCCESS',
+                    detailedStatusMessage=message, endTime=end,
+                    duration=end - device['startTime'],
+                )
+            deployment.update(
+                status='FAILURE' if any(d['status'] == 'FAILURE'
+                                        for d in deployment['devices'])
+                else 'SUCCESS',
+                endTime=end, duration=end - now,
+            )
+
+        self._defer(self.task_duration, complete)
+        return deployment
+
+    @route('GET', INTENT_API
+           + '/template-programmer/template/deploy/status/${deploymentId}')
+    def get_template_deployment_status(self, request, deploymentId):
+        deployment = self._deployments.get(deploymentId)
+        if deployment is None:
+            raise SimulatorError(404, 'Deployment {} not found'
+                                      ''.format(deploymentId))
+        return deployment
+
+    # Path trace
+
+    def _flow_analysis(self, flow_analysis_id):
+        analysis = self._flow_analyses.get(flow_analysis_id)
+        if analysis is None:
+            raise SimulatorError(404, 'Flow analysis {} not found'
+                                      ''.format(flow_analysis_id))
+        return analysis
+
+    def _network_element(self, ip_address, role):
+        index = self.inventory.index_of('managementIpAddress', ip_address)
+        if index is None:
+            return {'ip': ip_address, 'type': 'wired', 'role': role}
+        device = self.inventory.device(index)
+        return {'id': device['id'], 'name': device['hostname'],
+                'ip': ip_address, 'type': device['family'],
+                'role': device['role'], 'linkInformationSource': 'OSPF'}
+
+    @route('POST', INTENT_API + '/flow-analysis')
+    def initiate_a_new_pathtrace(self, request):
+        payload = self._payload(request)
+        if not payload.get('sourceIP') or not payload.get('destIP'):
+            raise SimulatorError(400, 'sourceIP and destIP are required')
+        flow_analysis_id = self._new_id()
+        now = self._now()
+        trace = dict((k, payload.get(k)) for k in
+                     ('sourceIP', 'destIP', 'sourcePort', 'destPort',
+                      'protocol', 'periodicRefresh', 'inclusions',
+                      'controlPath'))
+        trace.update(id=flow_analysis_id, status='INPROGRESS',
+                     createTime=now, lastUpdateTime=now)
+        analysis = {'request': trace, 'networkElementsInfo': [],
+                    'lastUpdate': time.ctime()}
+        self._flow_analyses[flow_analysis_id] = analysis
+        fails = self.task_failure_rate and \
+            self._random.random() < self.task_failure_rate
+
+        def complete():
+            source = self.inventory.index_of('managementIpAddress',
+                                             trace['sourceIP'])
+            if fails or source is None:
+                trace.update(status='FAILED', failureReason=(
+                    'Simulated path trace failure' if fails else
+                    'Unable to find the source {}'.format(trace['sourceIP'])
+                ))
+            else:
+                trace['status'] = 'COMPLETED'
+                analysis['networkElementsInfo'] = [
+                    self._network_element(trace['sourceIP'], 'ACCESS'),
+                    self._network_element(trace['destIP'], 'ACCESS'),
+                ]
+            trace['lastUpdateTime'] = self._now()
+            analysis['lastUpdate'] = time.ctime()
+
+        self._defer(self.task_duration, complete)
+        return _wrap({'flowAnalysisId': flow_analysis_id,
+                      'taskId': self._new_id(),
+                      'url': '/api/v1/flow-analysis/' + flow_analysis_id})
+
+    @route('GET', INTENT_API + '/flow-analysis')
+    def retrives_all_previous_pathtraces_summary(self, request):
+        filters = [(k, request.value(k)) for k in
+                   ('sourceIP', 'destIP', 'sourcePort', 'destPort',
+                    'protocol', 'status', 'periodicRefresh')]
+        after = request.integer('gtCreateTime', None)
+        before = request.integer('ltCreateTime', None)
+        traces = (a['request'] for a in self._flow_analyses.values()
+                  if all(str(a['request'].get(k)) == v
+                         for k, v in filters if v)
+                  and (after is None or a['request']['createTime'] > after)
+                  and (before is None
+                       or a['request']['createTime'] < before))
+        offset = request.integer('offset', 1)
+        limit = min(request.integer('limit', self.max_page_size),
+                    self.max_page_size)
+        return _wrap(_page(traces, offset - 1, limit))
+
+    @route('GET', INTENT_API + '/flow-analysis/${flowAnalysisId}')
+    def retrieves_previous_pathtrace(self, request, flowAnalysisId):
+        return _wrap(self._flow_analysis(flowAnalysisId))
+
+    @route('DELETE', INTENT_API + '/flow-analysis/${flowAnalysisId}')
+    def deletes_pathtrace_by_id(self, request, flowAnalysisId):
+        self._flow_analysis(flowAnalysisId)
+
+        def action():
+            self._flow_analyses.pop(flowAnalysisId, None)
+
+        return self._start_task(action, 'flow-analysis-service')
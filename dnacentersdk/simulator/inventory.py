@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""Synthetic network inventory served by the DNA Center simulator.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import re
+import threading
+from builtins import *
+
+from past.builtins import basestring
+
+
+DEFAULT_DEVICES = 1000
+DEFAULT_INTERFACES_PER_DEVICE = 10
+
+DEVICE_ID_PREFIX = '5e1d0000-0000-4000-8000-'
+INTERFACE_ID_PREFIX = '1f000000-0000-4000-8000-'
+
+# Fields for which a filter value identifies at most one generated device
+_UNIQUE_DEVICE_FIELDS = ('id', 'serialNumber', 'managementIpAddress',
+                         'hostname', 'macAddress')
+
+
+def device_id(index):
+    """The instance UUID of the device at `index`."""
+    return '{}{:012d}'.format(DEVICE_ID_PREFIX, index)
+
+
+def interface_id(index, port):
+    """The instance UUID of interface `port` of the device at `index`."""
+    return '{}{:08d}{:04d}'.format(INTERFACE_ID_PREFIX, index, port)
+
+
+def _parse_index(value, prefix, width):
+    if not isinstance(value, basestring) or not value.startswith(prefix):
+        return None
+    digits = value[len(prefix):]
+    if (width and len(digits) != width) or not digits.isdigit():
+        return None
+    return int(digits)
+
+
+def _parse_ip(value):
+    parts = value.split('.')
+    if len(parts) != 4 or parts[0] != '10' \
+            or not all(p.isdigit() and int(p) < 256 for p in parts):
+        return None
+    return (int(parts[1]) << 16) | (int(parts[2]) << 8) | int(parts[3])
+
+
+def _parse_mac(value):
+    parts = value.lower().split(':')
+    if len(parts) != 6 or parts[:2] != ['00', '00']:
+        return None
+    try:
+        return int(''.join(parts[2:]), 16)
+    except ValueError:
+        return None
+
+
+def _match(value, wanted):
+    """Match a record value against filter values (`*` is a wildcard)."""
+    if value is None:
+        return False
+    value = str(value)
+    for pattern in wanted:
+        if '*' in pattern:
+            if re.match(pattern + '$', value):
+                return True
+        elif value == pattern:
+            return True
+    return False
+
+
+class Inventory(object):
+    """A synthetic inventory of network devices and their interfaces.
+
+    Records are generated on demand from their index, so an inventory of
+    100,000 devices with 1,000,000 interfaces costs no memory until records
+    are requested. Only the changes made through the API (added, updated and
+    deleted devices) are stored.
+    """
+
+    def __init__(self, devices=DEFAULT_DEVICES,
+                 interfaces_per_device=DEFAULT_INTERFACES_PER_DEVICE):
+        """Initialize a new Inventory object.
+
+        Args:
+            devices(int): The number of generated devices.
+            interfaces_per_device(int): The number of interfaces generated
+                for every device.
+
+        """
+        assert devices >= 0 and interfaces_per_device >= 0
+        self.interfaces_per_device = interfaces_per_device
+        self._size = devices
+        self._changes = {}
+        self._lookup = {}
+        self._deleted = set()
+        self._lock = threading.Lock()
+
+    @property
+    def device_count(self):
+        """The number of devices currently in the inventory."""
+        return self._size - len(self._deleted)
+
+    @property
+    def interface_count(self):
+        """The number of interfaces currently in the inventory."""
+        return self.device_count * self.interfaces_per_device
+
+    def _generate(self, index):
+        return {
+            'id': device_id(index),
+            'instanceUuid': device_id(index),
+            'hostname': 'edge-{:06d}.example.com'.format(index),
+            'managementIpAddress': '10.{}.{}.{}'.format(
+                (index >> 16) & 255, (index >> 8) & 255, index & 255),
+            'macAddress': '00:00:{:02x}:{:02x}:{:02x}:{:02x}'.format(
+                (index >> 24) & 255, (index >> 16) & 255,
+                (index >> 8) & 255, index & 255),
+            'serialNumber': 'FOC{:08d}'.format(index),
+            'platformId': 'C9300-48U',
+            'family': 'Switches and Hubs',
+            'type': 'Cisco Catalyst 9300 Switch',
+            'series': 'Cisco Catalyst 9300 Series Switches',
+            'role': 'ACCESS',
+            'roleSource': 'AUTO',
+            'softwareType': 'IOS-XE',
+            'softwareVersion': '16.12.1',
+            'reachabilityStatus': 'Reachable',
+            'collectionStatus': 'Managed',
+            'collectionInterval': 'Global Default',
+            'upTime': '10 days, 2:03:04.00',
+            'lastUpdated': '2019-10-01 10:00:00',
+            'lastUpdateTime': 1569924000000,
+            'bootDateTime': '2019-09-21 08:00:00',
+            'interfaceCount': str(self.interfaces_per_device),
+            'lineCardCount': '2',
+            'memorySize': 'NA',
+            'locationName': None,
+            'location': None,
+            'snmpContact': '',
+            'snmpLocation': 'San Jose',
+            'tagCount': '0',
+            'errorCode': None,
+            'errorDescription': None,
+            'instanceTenantId': 'simulator',
+        }
+
+    def exists(self, index):
+        """Whether the device at `index` is in the inventory."""
+        return 0 <= index < self._size and index not in self._deleted
+
+    def device(self, index):
+        """The device record at `index`, or None if there is none."""
+        if not self.exists(index):
+            return None
+        record = self._generate(index)
+        changes = self._changes.get(index)
+        if changes:
+            record.update(changes)
+        return record
+
+    def index_of(self, field, value):
+        """Resolve a unique device field value to a device index.
+
+        Returns:
+            int: The device index, or None if no device matches.
+
+        """
+        if (field, value) in self._lookup:
+            index = self._lookup[(field, value)]
+        elif field == 'id':
+            index = _parse_index(value, DEVICE_ID_PREFIX, 12)
+        elif field == 'serialNumber':
+            index = _parse_index(value, 'FOC', 8)
+        elif field == 'managementIpAddress':
+            index = _parse_ip(value)
+        elif field == 'macAddress':
+            index = _parse_mac(value)
+        elif field == 'hostname':
+            index = _parse_index(value.replace('.example.com', ''),
+                                 'edge-', None)
+        else:
+            raise ValueError('{} is not a unique device field'.format(field))
+        if index is None or not self.exists(index):
+            return None
+        if self.device(index)[field] != value:
+            return None
+        return index
+
+    def find_devices(self, filters=None):
+        """Iterate over the indexes of the devices matching `filters`.
+
+        Args:
+            filters(dict): Maps device fields to lists of accepted values. A
+                value containing `*` is matched as a regular expression.
+
+        """
+        filters = dict((k, v) for k, v in (filters or {}).items() if v)
+        direct = [k for k in _UNIQUE_DEVICE_FIELDS
+                  if k in filters and not any('*' in v for v in filters[k])]
+        if direct:
+            field = direct[0]
+            candidates = sorted(set(
+                i for i in (self.index_of(field, v) for v in filters[field])
+                if i is not None
+            ))
+            del filters[field]
+        else:
+            candidates = range(self._size)
+        for index in candidates:
+            if index in self._deleted:
+                continue
+            if filters:
+                record = self.device(index)
+                if not all(_match(record.get(k), v)
+                           for k, v in filters.items()):
+                    continue
+            yield index
+
+    def add_device(self, **fields):
+        """Add a device and return its index."""
+        with self._lock:
+            index = self._size
+            self._size += 1
+        self.update_device(index, **fields)
+        return index
+
+    def update_device(self, index, **fields):
+        """Update fields of the device at `index`."""
+        with self._lock:
+            self._changes.setdefault(index, {}).update(fields)
+            for field in _UNIQUE_DEVICE_FIELDS:
+                if field in fields:
+                    self._lookup[(field, fields[field])] = index
+
+    def delete_device(self, index):
+        """Remove the device at `index` from the inventory."""
+        with self._lock:
+            self._deleted.add(index)
+
+    def interface(self, index, port):
+        """Interface `port` of the device at `index`, or None."""
+        if not self.exists(index) or \
+                not 0 <= port < self.interfaces_per_device:
+            return None
+        return {
+            'id': interface_id(index, port),
+            'instanceUuid': interface_id(index, port),
+            'deviceId': device_id(index),
+            'portName': 'GigabitEthernet1/0/{}'.format(port + 1),
+            'portType': 'Ethernet Port',
+            'portMode': 'access',
+            'interfaceType': 'Physical',
+            'adminStatus': 'UP',
+            'status': 'up' if port % 4 else 'down',
+            'speed': '1000000',
+            'duplex': 'FullDuplex',
+            'mtu': '1500',
+            'vlanId': str(1 + port % 10),
+            'macAddress': '00:01:{:02x}:{:02x}:{:02x}:{:02x}'.format(
+                (index >> 16) & 255, (index >> 8) & 255, index & 255,
+                port & 255),
+            'ipv4Address': None,
+            'ipv4Mask': None,
+            'description': '',
+            'serialNo': 'FOC{:08d}'.format(index),
+            'series': 'Cisco Catalyst 9300 Series Switches',
+            'lastUpdated': '2019-10-01 10:00:00',
+            'instanceTenantId': 'simulator',
+        }
+
+    def interface_by_id(self, value):
+        """The interface record with the instance UUID `value`, or None."""
+        position = _parse_index(value, INTERFACE_ID_PREFIX, 12)
+        if position is None:
+            return None
+        return self.interface(position // 10000, position % 10000)
+
+    def interfaces(self, start=0):
+        """Iterate over all interfaces, skipping the first `start`."""
+        per_device = self.interfaces_per_device
+        if not per_device:
+            return
+        if not self._deleted:
+            first, port = divmod(start, per_device)
+            indexes = range(first, self._size)
+        else:
+            port = 0
+            skip = start
+            indexes = []
+            for index in range(self._size):
+                if index in self._deleted:
+                    continue
+                if skip >= per_device:
+                    skip -= per_device
+                    continue
+                indexes = range(index, self._size)
+                port = skip
+                break
+        for index in indexes:
+            if index in self._deleted:
+                continue
+            while port < per_device:
+                yield self.interface(index, port)
+                port += 1
+            port = 0
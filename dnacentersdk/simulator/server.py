@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""HTTP front end of the DNA Center simulator.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+from future import standard_library
+standard_library.install_aliases()
+
+import threading
+from builtins import *
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from .app import Simulator
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _SimulatorHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _read_body(self):
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b';')[0], 16)
+                if not size:
+                    # Trailer section
+                    while self.rfile.readline() not in (b'\r\n', b'\n', b''):
+                        pass
+                    return b''.join(chunks)
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _reply(self):
+        response = self.server.simulator.handle(
+            self.command, self.path, dict(self.headers.items()),
+            self._read_body(),
+        )
+        if response.status is None:
+            # A dropped request: close the connection without a response
+            self.close_connection = True
+            return
+        self.send_response(response.status)
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(response.body)))
+        # Send the headers and the body in a single segment
+        self._headers_buffer.append(b'\r\n' + response.body)
+        self.flush_headers()
+
+    do_GET = do_POST = do_PUT = do_DELETE = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SimulatorServer(object):
+    """Serve a :class:`Simulator` over HTTP from a background thread.
+
+    Use it as a context manager, and point a DNACenterAPI object at its
+    `base_url`::
+
+        with SimulatorServer(latency=0.05) as server:
+            api = DNACenterAPI(username='admin', password='secret',
+                               base_url=server.base_url, verify=False)
+
+    """
+
+    def __init__(self, simulator=None, host='127.0.0.1', port=0, **options):
+        """Initialize a new SimulatorServer object.
+
+        Args:
+            simulator(Simulator): The simulator to serve. A new Simulator is
+                created with `options` when it is not provided.
+            host(basestring): The address to bind to.
+            port(int): The port to bind to; 0 picks a free port.
+            **options: Simulator options, see :class:`Simulator`.
+
+        """
+        self.simulator = simulator or Simulator(**options)
+        self._httpd = _ThreadingHTTPServer((host, port), _SimulatorHandler)
+        self._httpd.simulator = self.simulator
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """The base URL of the server."""
+        host, port = self._httpd.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def serve_forever(self):
+        """Serve requests from the calling thread until interrupted."""
+        self._httpd.serve_forever()
+
+    def start(self):
+        """Serve requests from a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the listening socket."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+"""Waiting for the asynchronous tasks started by DNA Center operations.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import threading
+import time
+from builtins import *
+from concurrent.futures import Future
+
+import requests
+from past.builtins import basestring
+
+from .config import (
+    DEFAULT_PAGE_SIZE, DEFAULT_TASK_MAX_POLL_INTERVAL,
+    DEFAULT_TASK_POLL_INTERVAL,
+)
+from .exceptions import (
+    ApiError, MalformedRequest, TaskError, TaskTimeoutError,
+    dnacentersdkException,
+)
+from .utils import check_type
+
+
+def task_id_of(task):
+    """The id of a task, from the response of the operation that started it.
+
+    Args:
+        task(basestring,dict): A task id, or a response containing a
+            `taskId`, such as the response of `devices.sync_devices`.
+
+    Raises:
+        ValueError: If the response has no task id.
+
+    """
+    if isinstance(task, basestring):
+        return task
+    if isinstance(task, dict):
+        data = task.get('response', task)
+        if isinstance(data, dict) and data.get('taskId'):
+            return data['taskId']
+    raise ValueError('No task id in {!r}'.format(task))
+
+
+def is_complete(task):
+    """Whether a task record describes a completed task."""
+    return bool(task.get('endTime') or task.get('isError'))
+
+
+def _transient(error):
+    # Server errors, rate limits and failed connections; reading the task
+    # again may succeed
+    if isinstance(error, ApiError):
+        return error.status_code >= 500 or error.status_code == 429
+    if isinstance(error, MalformedRequest):
+        return False
+    return isinstance(error, (dnacentersdkException,
+                              requests.exceptions.RequestException))
+
+
+class _Waited(object):
+    """A task being waited for."""
+
+    def __init__(self, task_id, interval, deadline):
+        self.task_id = task_id
+        self.future = Future()
+        self.interval = interval
+        self.due = time.time() + interval
+        self.deadline = deadline
+        self.added = int(time.time() * 1000)
+        self.start_time = None
+        self.task = None
+
+
+class TaskWaiter(object):
+    """Wait for many asynchronous tasks with few status requests.
+
+    Each task is polled with an exponential backoff, from `interval` to
+    `max_interval` seconds. While `batch_threshold` or more tasks are waited
+    for, each polling round reads their statuses from `get_tasks` pages
+    covering the time window in which they started, instead of making one
+    `get_task_by_id` request per task; the due tasks missing from the
+    window are then polled individually.
+
+    The tasks are polled by a background thread, which runs while there are
+    tasks to wait for. Their futures are resolved with the completed task
+    records, or fail with a TaskError (carrying the task tree when
+    `expand_failures` is True) or a TaskTimeoutError. A task whose status
+    cannot be read because of a server error, a rate limit or a connection
+    failure is polled again after its backoff delay; other errors, such as
+    an unknown task id, fail its future.
+    """
+
+    def __init__(self, task_api, interval=DEFAULT_TASK_POLL_INTERVAL,
+                 max_interval=DEFAULT_TASK_MAX_POLL_INTERVAL, backoff=2.0,
+                 batch_threshold=5, window_margin=60, window_limit=2000,
+                 expand_failures=True):
+        """Initialize a new TaskWaiter object.
+
+        Args:
+            task_api: The Task API wrapper of a DNACenterAPI object.
+            interval(float,int): The first delay between two polls of a
+                task, in seconds.
+            max_interval(float,int): The longest delay between two polls of
+                a task, in seconds.
+            backoff(float,int): The factor applied to the delay after each
+                poll of a task.
+            batch_threshold(int): The number of waited tasks from which
+                their statuses are read from a time window of get_tasks
+                results.
+            window_margin(float,int): Seconds subtracted from the local time
+                at which a task was added to start its time window, until its
+                start time is known; covers the clock skew with DNA Center.
+            window_limit(int): The most tasks read per time window query.
+            expand_failures(bool): Fetch the task tree of the failed tasks.
+
+        """
+        check_type(interval, (float, int), may_be_none=False)
+        check_type(max_interval, (float, int), may_be_none=False)
+        check_type(backoff, (float, int), may_be_none=False)
+        check_type(batch_threshold, int, may_be_none=False)
+        check_type(window_margin, (float, int), may_be_none=False)
+        check_type(window_limit, int, may_be_none=False)
+        check_type(expand_failures, bool, may_be_none=False)
+        if interval <= 0 or max_interval < interval or backoff < 1:
+            raise ValueError('Invalid polling intervals')
+
+        self._task_api = task_api
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.batch_threshold = batch_threshold
+        self.window_margin = window_margin
+        self.window_limit = window_limit
+        self.expand_failures = expand_failures
+        self._waited = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def wait_for(self, task, timeout=None, callback=None):
+        """Wait for a task in the background.
+
+        Args:
+            task(basestring,dict): A task id, or the response of the
+                operation that started the task.
+            timeout(float,int): Fail the future with a TaskTimeoutError if
+                the task is not complete after this many seconds.
+            callback(callable): Called with the future once it is resolved.
+
+        Returns:
+            concurrent.futures.Future: Resolved with the completed task.
+
+        """
+        check_type(timeout, (float, int))
+        task_id = task_id_of(task)
+        with self._lock:
+            waited = self._waited.get(task_id)
+            if waited is None:
+                deadline = None if timeout is None else time.time() + timeout
+                waited = _Waited(task_id, self.interval, deadline)
+                self._waited[task_id] = waited
+            elif timeout is not None:
+                deadline = time.time() + timeout
+                if waited.deadline is None or deadline < waited.deadline:
+                    waited.deadline = deadline
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+        self._wakeup.set()
+        if callback is not None:
+            waited.future.add_done_callback(callback)
+        return waited.future
+
+    def wait(self, tasks, timeout=None):
+        """Wait for tasks to complete.
+
+        Args:
+            tasks(iterable): Task ids, or responses of the operations that
+                started the tasks.
+            timeout(float,int): Seconds before an incomplete task fails
+                with a TaskTimeoutError.
+
+        Returns:
+            list: The completed tasks, in the order of `tasks`.
+
+        Raises:
+            TaskError: If a task completes with an error.
+            TaskTimeoutError: If a task does not complete in time.
+
+        """
+        futures = [self.wait_for(task, timeout=timeout) for task in tasks]
+        return [future.result() for future in futures]
+
+    @property
+    def pending(self):
+        """The number of tasks being waited for."""
+        with self._lock:
+            return len(self._waited)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._waited:
+                    self._thread = None
+                    return
+                self._wakeup.clear()
+            delay = self.poll()
+            self._wakeup.wait(delay)
+
+    def poll(self):
+        """Poll the tasks that are due.
+
+        Returns:
+            float: The number of seconds until the next task is due.
+
+        """
+        now = time.time()
+        with self._lock:
+            waited = list(self._waited.values())
+        for item in waited:
+            if item.deadline is not None and now >= item.deadline:
+                self._resolve(item, error=TaskTimeoutError(item.task_id,
+                                                           item.task))
+        waited = [item for item in waited if not item.future.done()]
+        due = [item for item in waited if item.due <= now]
+
+        # A time window query reads the statuses of all the waited tasks,
+        # including those that are not due yet
+        found = {}
+        if due and len(waited) >= self.batch_threshold:
+            try:
+                found = self._window(waited)
+            except Exception:
+                found = {}
+        for item in waited:
+            task = found.get(item.task_id)
+            if item.due > now:
+                if task is not None and is_complete(task):
+                    self._update(item, task)
+                continue
+            if task is None:
+                try:
+                    task = self._task_api.get_task_by_id(item.task_id).response
+                except Exception as e:
+                    if _transient(e):
+                        self._backoff(item)
+                    else:
+                        self._resolve(item, error=e)
+                    continue
+            self._update(item, task)
+
+        with self._lock:
+            remaining = list(self._waited.values())
+        if not remaining:
+            return 0
+        next_time = min(min(item.due, item.deadline or item.due)
+                        for item in remaining)
+        return max(next_time - time.time(), 0)
+
+    def _window(self, waited):
+        """Read the statuses of tasks from a get_tasks time window."""
+        start = min(item.start_time
+                    or item.added - int(self.window_margin * 1000)
+                    for item in waited)
+        wanted = set(item.task_id for item in waited)
+        found = {}
+        scanned = 0
+        tasks = self._task_api.iter_tasks(start_time=str(start),
+                                          page_size=min(self.window_limit,
+                                                        DEFAULT_PAGE_SIZE))
+        for task in tasks:
+            scanned += 1
+            if task.get('id') in wanted:
+                found[task['id']] = task
+                if len(found) == len(wanted):
+                    break
+            if scanned >= self.window_limit:
+                break
+        return found
+
+    def _update(self, item, task):
+        item.task = task
+        item.start_time = item.start_time or task.get('startTime')
+        if not is_complete(task):
+            self._backoff(item)
+            return
+        if not task.get('isError'):
+            self._resolve(item, result=task)
+            return
+        tree = None
+        if self.expand_failures:
+            try:
+                tree = self._task_api.get_task_tree(item.task_id).response
+            except Exception:
+                pass
+        self._resolve(item, error=TaskError(task, tree))
+
+    def _backoff(self, item):
+        item.due = time.time() + item.interval
+        item.interval = min(item.interval * self.backoff, self.max_interval)
+
+    def _resolve(self, item, result=None, error=None):
+        with self._lock:
+            if self._waited.get(item.task_id) is not item:
+                return
+            del self._waited[item.task_id]
+        if error is not None:
+            item.future.set_exception(error)
+        else:
+            item.future.set_result(result)
@@ -0,0 +1,496 @@
+# -*- coding: utf-8 -*-
+"""Configuration template deployment.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+from future import standard_library
+standard_library.install_aliases()
+
+import collections
+import difflib
+import itertools
+import queue
+import threading
+import time
+from builtins import *
+from concurrent.futures import ThreadPoolExecutor
+
+from past.builtins import basestring
+
+from .config import (
+    DEFAULT_BULK_WORKERS, DEFAULT_MAX_TEMPLATE_DEPLOYMENTS,
+    DEFAULT_TASK_MAX_POLL_INTERVAL, DEFAULT_TASK_POLL_INTERVAL,
+    DEFAULT_TEMPLATE_CACHE_MAX_AGE, DEFAULT_TEMPLATE_DEPLOYMENT_SIZE,
+)
+from .exceptions import dnacentersdkException
+from .models.mydict import MyDict
+from .utils import check_type
+
+
+DEPLOYMENT_DONE = ('SUCCESS', 'FAILURE')
+"""The statuses of completed deployments and deployment targets."""
+
+TargetResult = collections.namedtuple(
+    'TargetResult', ['target', 'deployment_id', 'status', 'message', 'error']
+)
+"""The outcome of the deployment of a template to a target: its `status`
+is SUCCESS or FAILURE, as reported by DNA Center with its detailed status
+`message`, ERROR when the deployment request failed or returned no
+deployment id (with the exception as `error`), or TIMEOUT when the
+deployment did not complete in time."""
+
+
+def _target_info(target):
+    if isinstance(target, basestring):
+        return {'id': target, 'type': 'MANAGED_DEVICE_UUID'}
+    return target
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = [_target_info(t) for t in itertools.islice(iterator, size)]
+        if not batch:
+            return
+        yield batch
+
+
+def _target_results(deployment_id, targets, status):
+    """The TargetResult of each target of a completed deployment."""
+    devices = status.get('devices') or []
+    for target in targets:
+        device = next((d for d in devices
+                       if target.get('id') in (d.get('deviceId'),
+                                               d.get('ipAddress'),
+                                               d.get('name'))), None)
+        if device is None:
+            yield TargetResult(target, deployment_id, status.get('status'),
+                               'No status reported for the target', None)
+        else:
+            yield TargetResult(target, deployment_id, device.get('status'),
+                               device.get('detailedStatusMessage'), None)
+
+
+def deploy_template(api, template_id, targets,
+                    deployment_size=DEFAULT_TEMPLATE_DEPLOYMENT_SIZE,
+                    max_deployments=DEFAULT_MAX_TEMPLATE_DEPLOYMENTS,
+                    force_push=None, workers=DEFAULT_BULK_WORKERS,
+                    interval=DEFAULT_TASK_POLL_INTERVAL,
+                    max_interval=DEFAULT_TASK_MAX_POLL_INTERVAL,
+                    backoff=2.0, timeout=None):
+    """Deploy a template to many targets, streaming the result of each one.
+
+    The targets are split into deployments of `deployment_size` targets,
+    and at most `max_deployments` deployments are in progress at once, so
+    that the load on DNA Center stays bounded; the next deployment starts
+    as soon as one completes. The statuses of all the deployments in
+    progress are read together by one poller, every `interval` seconds
+    while they progress, backing off up to `max_interval` seconds while
+    none of them changes.
+
+    Args:
+        api(DNACenterAPI): The API used to deploy the template.
+        template_id(basestring): The id of the template.
+        targets(iterable): The targetInfo entries of the deployments (with
+            their `id`, `type` and `params`), or managed device ids;
+            consumed lazily.
+        deployment_size(int): The most targets per deployment.
+        max_deployments(int): The most deployments in progress at once.
+        force_push(bool): The forcePushTemplate field of the deployments.
+        workers(int): The number of requests sent concurrently.
+        interval(float,int): The shortest delay between two status reads.
+        max_interval(float,int): The longest delay between two status
+            reads.
+        backoff(float,int): The factor applied to the delay when no
+            deployment has changed.
+        timeout(float,int): Seconds after its start before a deployment
+            that has not completed yields TIMEOUT results.
+
+    Returns:
+        generator: A :class:`TargetResult` per target, in the order in
+        which their deployments complete.
+
+    """
+    check_type(template_id, basestring, may_be_none=False)
+    check_type(deployment_size, int, may_be_none=False)
+    check_type(max_deployments, int, may_be_none=False)
+    check_type(force_push, bool)
+    check_type(workers, int, may_be_none=False)
+    check_type(interval, (float, int), may_be_none=False)
+    check_type(max_interval, (float, int), may_be_none=False)
+    check_type(backoff, (float, int), may_be_none=False)
+    check_type(timeout, (float, int))
+    if deployment_size <= 0 or max_deployments <= 0 or workers <= 0:
+        raise ValueError('The deployment limits must be positive')
+    if interval <= 0 or max_interval < interval or backoff < 1:
+        raise ValueError('Invalid polling intervals')
+
+    programmer = api.template_programmer
+    started = queue.Queue()
+    requests = ThreadPoolExecutor(workers)
+
+    def deploy(batch):
+        return programmer.deploy_template(templateId=template_id,
+                                          targetInfo=batch,
+                                          forcePushTemplate=force_push)
+
+    def sent(batch):
+        def callback(future):
+            started.put((batch, future))
+        return callback
+
+    batches = _batches(targets, deployment_size)
+    exhausted = False
+    sending = 0
+    # The deployments in progress: their targets, start and last status
+    deployments = collections.OrderedDict()
+    delay = interval
+    next_poll = time.time() + delay
+    try:
+        while True:
+            while not exhausted \
+                    and sending + len(deployments) < max_deployments:
+                batch = next(batches, None)
+                if batch is None:
+                    exhausted = True
+                    break
+                sending += 1
+                requests.submit(deploy, batch).add_done_callback(sent(batch))
+            if not sending and not deployments:
+                return
+            try:
+                wait = max(next_poll - time.time(), 0) if deployments \
+                    else None
+                batch, future = started.get(timeout=wait)
+            except queue.Empty:
+                pass
+            else:
+                sending -= 1
+                try:
+                    response = future.result()
+                except Exception as e:
+                    for target in batch:
+                        yield TargetResult(target, None, 'ERROR', None, e)
+                else:
+                    deployment_id = response.get('deploymentId')
+                    if deployment_id:
+                        deployments[deployment_id] = [batch, time.time(),
+                                                      None]
+                    else:
+                        # Nothing to poll; the deployment did not start
+                        error = dnacentersdkException(
+                            'No deploymentId in the deployment response: '
+                            '{}'.format(response)
+                        )
+                        for target in batch:
+                            yield TargetResult(target, None, 'ERROR', None,
+                                               error)
+            if not deployments or time.time() < next_poll:
+                continue
+
+            deployment_ids = list(deployments)
+            statuses = requests.map(_read_status(programmer), deployment_ids)
+            changed = False
+            for deployment_id, status in zip(deployment_ids, statuses):
+                batch, since, last = deployments[deployment_id]
+                if isinstance(status, Exception):
+                    # Read again at the next poll
+                    status = last
+                elif status != last:
+                    changed = True
+                    deployments[deployment_id][2] = status
+                if status is not None \
+                        and status.get('status') in DEPLOYMENT_DONE:
+                    del deployments[deployment_id]
+                    for result in _target_results(deployment_id, batch,
+                                                  status):
+                        yield result
+                elif timeout is not None and time.time() - since >= timeout:
+                    del deployments[deployment_id]
+                    for target in batch:
+                        yield TargetResult(target, deployment_id, 'TIMEOUT',
+                                           None, None)
+            delay = interval if changed else min(delay * backoff,
+                                                 max_interval)
+            next_poll = time.time() + delay
+    finally:
+        requests.shutdown(wait=False)
+
+
+def _read_status(programmer):
+    def read(deployment_id):
+        try:
+            return programmer.get_template_deployment_status(deployment_id)
+        except Exception as e:
+            return e
+    return read
+
+
+def _latest_version(summary):
+    versions = summary.get('versionsInfo') or []
+    if not versions:
+        return None
+    return max(versions, key=lambda v: v.get('versionTime') or 0)['version']
+
+
+class TemplateCache(object):
+    """A local copy of the configuration templates, by id and version.
+
+    The cache is synchronized with one `gets_the_templates_available`
+    request, whose results carry the versions of every template; the
+    details of a template are only read when its latest version is not
+    cached yet. The projects, templates and versions are then answered
+    from the cache, and template contents are compared locally::
+
+        template = api.template_cache.find('Onboarding', 'banner')
+        changes = api.template_cache.update(template.id, new_content)
+
+    :meth:`update` only updates and commits a template whose content (or
+    other fields) differs from its cached latest version. Changes made by
+    other clients are seen at the next synchronization, once they are
+    committed.
+    """
+
+    def __init__(self, api, max_age=DEFAULT_TEMPLATE_CACHE_MAX_AGE):
+        """Initialize a new TemplateCache object.
+
+        Args:
+            api(DNACenterAPI): The API used to read and update the
+                templates.
+            max_age(float,int): Seconds after which the cache is
+                synchronized again when it is read. When None, it is only
+                synchronized on first use and by :meth:`sync`.
+
+        """
+        check_type(max_age, (float, int))
+
+        self._api = api
+        self._programmer = api.template_programmer
+        self.max_age = max_age
+        self.stats = collections.Counter()
+        """Counters: `syncs` (template list requests), `details` (template
+        details requests), `updates` (templates updated and committed) and
+        `unchanged` (updates skipped)."""
+
+        self._lock = threading.RLock()
+        self._summaries = collections.OrderedDict()
+        self._details = {}
+        self._synced = None
+
+    def sync(self, force=True):
+        """Read the template list and the details of new versions.
+
+        Args:
+            force(bool): Synchronize even when the cache is not older than
+                `max_age`.
+
+        """
+        with self._lock:
+            if not force and self._synced is not None and (
+                    self.max_age is None
+                    or time.time() - self._synced < self.max_age):
+                return
+            self.stats['syncs'] += 1
+            summaries = collections.OrderedDict(
+                (summary.templateId, summary) for summary in
+                self._programmer.gets_the_templates_available() or ()
+            )
+            for template_id in list(self._summaries):
+                if template_id not in summaries:
+                    self._forget(template_id)
+            self._summaries = summaries
+            self._synced = time.time()
+            for template_id, summary in summaries.items():
+                if (template_id, _latest_version(summary)) \
+                        not in self._details:
+                    self._read(template_id)
+
+    def _forget(self, template_id):
+        for key in [k for k in self._details if k[0] == template_id]:
+            del self._details[key]
+
+    def _read(self, template_id):
+        self.stats['details'] += 1
+        record = self._programmer.get_template_details(template_id)
+        self._details[(template_id, record.get('version'))] = record
+        return record
+
+    def _summary(self, template_id):
+        self.sync(force=False)
+        summary = self._summaries.get(template_id)
+        if summary is None:
+            raise dnacentersdkException('Template {} not found'
+                                        ''.format(template_id))
+        return summary
+
+    def projects(self):
+        """The projects of the cached templates.
+
+        Returns:
+            list: A dict per project, with its `id`, `name` and `templates`
+            (their `id` and `name`).
+
+        """
+        with self._lock:
+            self.sync(force=False)
+            projects = collections.OrderedDict()
+            for summary in self._summaries.values():
+                project = projects.setdefault(summary.projectId, {
+                    'id': summary.projectId, 'name': summary.projectName,
+                    'templates': [],
+                })
+                project['templates'].append({'id': summary.templateId,
+                                             'name': summary.name})
+            return list(projects.values())
+
+    def templates(self, project_name=None):
+        """The templates, as listed by `gets_the_templates_available`.
+
+        Args:
+            project_name(basestring): Only list the templates of this
+                project.
+
+        """
+        with self._lock:
+            self.sync(force=False)
+            return [s for s in self._summaries.values()
+                    if project_name is None
+                    or s.projectName == project_name]
+
+    def versions(self, template_id):
+        """The versions of a template, as in its `versionsInfo`."""
+        with self._lock:
+            return list(self._summary(template_id).get('versionsInfo') or ())
+
+    def template(self, template_id, version=None):
+        """The details of a template.
+
+        Args:
+            template_id(basestring): The id of the template.
+            version(basestring): The version; defaults to the latest one.
+
+        Returns:
+            MyDict: The template, as returned by `get_template_details`.
+
+        """
+        with self._lock:
+            summary = self._summary(template_id)
+            version = version or _latest_version(summary)
+            record = self._details.get((template_id, version))
+            if record is None:
+                # Versions committed by other clients
+                record = self._read(template_id)
+                if record.get('version') != version:
+                    raise dnacentersdkException(
+                        'Version {} of template {} is not available'
+                        ''.format(version, template_id)
+                    )
+            return record
+
+    def find(self, project_name, name):
+        """The latest version of the template `name` of a project."""
+        with self._lock:
+            for summary in self.templates(project_name):
+                if summary.name == name:
+                    return self.template(summary.templateId)
+        raise dnacentersdkException('Template {}/{} not found'
+                                    ''.format(project_name, name))
+
+    def diff(self, template_id, content, version=None):
+        """Compare a content with a version of a template.
+
+        Returns:
+            list: The lines of a unified diff from the template content to
+            `content`; empty when they are identical.
+
+        """
+        template = self.template(template_id, version)
+        old = template.get('templateContent') or ''
+        return list(difflib.unified_diff(
+            old.splitlines(True), content.splitlines(True),
+            '{} v{}'.format(template.get('name'), template.get('version')),
+            '{} (new)'.format(template.get('name')),
+        ))
+
+    def update(self, template_id, content, comments=None, timeout=None,
+               **fields):
+        """Update and commit a template, if its content has changed.
+
+        Args:
+            template_id(basestring): The id of the template.
+            content(basestring): The new template content.
+            comments(basestring): The comments of the committed version.
+            timeout(float,int): The most seconds to wait for each of the
+                update and commit tasks.
+            **fields: Other fields of the template to update.
+
+        Returns:
+            list: The lines of the unified diff of the content; empty when
+            only other fields changed, or when nothing changed, in which
+            case no request is sent.
+
+        Raises:
+            TaskError: If the update or the commit fails.
+
+        """
+        check_type(content, basestring, may_be_none=False)
+        check_type(comments, basestring)
+        with self._lock:
+            template = self.template(template_id)
+            changes = self.diff(template_id, content)
+            if not changes and all(template.get(k) == v
+                                   for k, v in fields.items()):
+                self.stats['unchanged'] += 1
+                return changes
+            payload = dict(template)
+            payload.update(fields, templateContent=content)
+            self._api.wait_for_task(
+                self._programmer.update_template(payload=payload),
+                timeout=timeout,
+            )
+            self._api.wait_for_task(
+                self._programmer.version_template(templateId=template_id,
+                                                  comments=comments),
+                timeout=timeout,
+            )
+            self.stats['updates'] += 1
+            record = self._read(template_id)
+            versions = self._summaries[template_id].setdefault(
+                'versionsInfo', []
+            )
+            # Keep the committed version the latest one until the next
+            # synchronization, whatever the clock skew with DNA Center
+            version_time = max([v.get('versionTime') or 0 for v in versions]
+                               + [int(time.time() * 1000) - 1]) + 1
+            versions.append(MyDict({'id': template_id,
+                                    'version': record.get('version'),
+                                    'versionTime': version_time,
+                                    'description': comments}))
+            return changes
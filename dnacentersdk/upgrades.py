@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""Rolling software image distribution and activation.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+from future import standard_library
+standard_library.install_aliases()
+
+import collections
+import queue
+from builtins import *
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import DEFAULT_BULK_WORKERS
+from .utils import check_type
+
+
+DEFAULT_MAX_DISTRIBUTIONS = 50
+"""The default number of devices whose image is distributed at once."""
+
+DEFAULT_MAX_ACTIVATIONS = 20
+"""The default number of devices whose image is activated at once."""
+
+DISTRIBUTION = 'DISTRIBUTION'
+ACTIVATION = 'ACTIVATION'
+
+UpgradeEvent = collections.namedtuple(
+    'UpgradeEvent',
+    ['device_id', 'image_id', 'stage', 'status', 'task', 'error']
+)
+"""The completion of a stage (DISTRIBUTION or ACTIVATION) of the upgrade of
+a device: its `status` is SUCCESS or FAILURE; `task` is the completed task,
+if any, and `error` the exception of a failure."""
+
+
+def upgrade_devices(api, upgrades, activate=True,
+                    max_distributions=DEFAULT_MAX_DISTRIBUTIONS,
+                    max_activations=DEFAULT_MAX_ACTIVATIONS,
+                    activation_options=None, schedule_validate=None,
+                    workers=DEFAULT_BULK_WORKERS, task_timeout=None):
+    """Distribute software images to devices and activate them.
+
+    Each device is upgraded by its own distribution request, then by its own
+    activation request, so that its failures do not affect other devices.
+    At most `max_distributions` distributions and `max_activations`
+    activations are in progress at once: a device is activated as soon as
+    its distribution completes, and the next device starts its distribution
+    as soon as one completes, without waiting for the rest of its wave. The
+    tasks are waited for together by the API's task waiter, which batches
+    their status requests.
+
+    An event is yielded when a stage of a device completes, in the order of
+    completion, so that the progress of the upgrade can be reported while
+    it runs. A device whose distribution fails is not activated.
+
+    Args:
+        api(DNACenterAPI): The API used to upgrade the devices.
+        upgrades(iterable): The (device id, image id) pairs to upgrade;
+            consumed lazily.
+        activate(bool): Activate the images after their distribution.
+        max_distributions(int): The most distributions in progress at once.
+        max_activations(int): The most activations in progress at once.
+        activation_options(dict): Additional fields of each activation
+            request, for example `{'activateLowerImageVersion': True}`.
+        schedule_validate(bool): The scheduleValidate parameter of the
+            activation requests.
+        workers(int): The number of requests sent concurrently.
+        task_timeout(float,int): Seconds before the task of a request fails
+            with a TaskTimeoutError.
+
+    Returns:
+        generator: An :class:`UpgradeEvent` per device and completed stage.
+
+    """
+    check_type(activate, bool, may_be_none=False)
+    check_type(max_distributions, int, may_be_none=False)
+    check_type(max_activations, int, may_be_none=False)
+    check_type(activation_options, dict)
+    check_type(schedule_validate, bool)
+    check_type(workers, int, may_be_none=False)
+    check_type(task_timeout, (float, int))
+    if max_distributions <= 0 or max_activations <= 0 or workers <= 0:
+        raise ValueError('The concurrency limits must be positive')
+
+    swim = api.swim
+    events = queue.Queue()
+    requests = ThreadPoolExecutor(workers)
+
+    def distribute(device_id, image_id):
+        return swim.trigger_software_image_distribution(
+            payload=[{'deviceUuid': device_id, 'imageUuid': image_id}]
+        )
+
+    def activation(device_id, image_id):
+        request = {'deviceUuid': device_id, 'imageUuidList': [image_id],
+                   'distributeIfNeeded': False}
+        request.update(activation_options or {})
+        return swim.trigger_software_image_activation(
+            payload=[request], schedule_validate=schedule_validate
+        )
+
+    def failed(stage, upgrade, error, task=None):
+        events.put(UpgradeEvent(upgrade[0], upgrade[1], stage, 'FAILURE',
+                                task, error))
+
+    def task_completed(stage, upgrade):
+        def callback(future):
+            try:
+                task = future.result()
+            except Exception as e:
+                failed(stage, upgrade, e, getattr(e, 'task', None))
+            else:
+                events.put(UpgradeEvent(upgrade[0], upgrade[1], stage,
+                                        'SUCCESS', task, None))
+        return callback
+
+    def sent(stage, upgrade):
+        def callback(future):
+            try:
+                task = api.task_waiter.wait_for(future.result(),
+                                                timeout=task_timeout)
+            except Exception as e:
+                failed(stage, upgrade, e)
+            else:
+                task.add_done_callback(task_completed(stage, upgrade))
+        return callback
+
+    def start(stage, upgrade):
+        call = distribute if stage == DISTRIBUTION else activation
+        future = requests.submit(call, *upgrade)
+        future.add_done_callback(sent(stage, upgrade))
+
+    upgrades = iter(upgrades)
+    exhausted = False
+    distributed = collections.deque()
+    in_progress = collections.Counter()
+    try:
+        while True:
+            while distributed and in_progress[ACTIVATION] < max_activations:
+                in_progress[ACTIVATION] += 1
+                start(ACTIVATION, distributed.popleft())
+            while not exhausted \
+                    and in_progress[DISTRIBUTION] < max_distributions:
+                upgrade = next(upgrades, None)
+                if upgrade is None:
+                    exhausted = True
+                    break
+                in_progress[DISTRIBUTION] += 1
+                start(DISTRIBUTION, tuple(upgrade))
+            if not sum(in_progress.values()):
+                return
+            event = events.get()
+            in_progress[event.stage] -= 1
+            if activate and event.stage == DISTRIBUTION \
+                    and event.status == 'SUCCESS':
+                distributed.append((event.device_id, event.image_id))
+            yield event
+    finally:
+        requests.shutdown(wait=False)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Streaming file uploads.
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import collections
+import hashlib
+import mimetypes
+import os
+import uuid
+from builtins import *
+
+
+UploadResult = collections.namedtuple(
+    'UploadResult', ['response', 'size', 'digests']
+)
+"""The outcome of an upload: the response of DNA Center, the size of the
+uploaded file and the hex digests of its content, by algorithm."""
+
+
+class MultipartFile(object):
+    """A multipart/form-data body made of one file, read from its path.
+
+    The body is an iterable of chunks of at most `chunk_size` bytes, read
+    sequentially from the file as they are sent, so that the memory used by
+    an upload does not depend on the size of the file. Each iteration reads
+    the file again from its start, so that a request can be sent again
+    after a failure, and computes the digests of the file content.
+
+    The file is neither memory-mapped nor sent with sendfile(): requests
+    writes the body through its TLS socket from Python, and the digests
+    need the bytes anyway, so a zero-copy path would not avoid the copy.
+    Unbuffered reads of `chunk_size` bytes keep it to one copy per chunk.
+    """
+
+    def __init__(self, path, field_name='file', file_name=None,
+                 content_type=None, chunk_size=1024 * 1024,
+                 hash_algorithms=None, progress=None):
+        """Initialize a new MultipartFile object.
+
+        Args:
+            path(basestring): The path of the file.
+            field_name(basestring): The name of the form field.
+            file_name(basestring): The file name sent; defaults to the base
+                name of `path`.
+            content_type(basestring): The content type of the file; guessed
+                from its name by default.
+            chunk_size(int): The number of bytes read at a time.
+            hash_algorithms(list): The hashlib algorithms whose digests of
+                the file are computed while it is sent.
+            progress(callable): Called after each chunk with the number of
+                bytes of the file sent and its size.
+
+        """
+        self.path = path
+        self.file_name = file_name or os.path.basename(path)
+        self.chunk_size = chunk_size
+        self.hash_algorithms = list(hash_algorithms or ())
+        self.progress = progress
+        self.size = os.path.getsize(path)
+        self.digests = {}
+        content_type = content_type \
+            or mimetypes.guess_type(self.file_name)[0] \
+            or 'application/octet-stream'
+        boundary = uuid.uuid4().hex
+        self.content_type = 'multipart/form-data; boundary={}'.format(boundary)
+        self._head = (
+            '--{}\r\n'
+            'Content-Disposition: form-data; name="{}"; filename="{}"\r\n'
+            'Content-Type: {}\r\n\r\n'
+            ''.format(boundary, field_name,
+                      self.file_name.replace('"', '%22'), content_type)
+        ).encode('utf-8')
+        self._tail = '\r\n--{}--\r\n'.format(boundary).encode('utf-8')
+
+    def __len__(self):
+        return len(self._head) + self.size + len(self._tail)
+
+    def __iter__(self):
+        hashes = [(name, hashlib.new(name)) for name in self.hash_algorithms]
+        sent = 0
+        yield self._head
+        with open(self.path, 'rb', buffering=0) as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                for _, digest in hashes:
+                    digest.update(chunk)
+                sent += len(chunk)
+                yield chunk
+                if self.progress is not None:
+                    self.progress(sent, self.size)
+        yield self._tail
+        self.digests = dict((name, digest.hexdigest())
+                            for name, digest in hashes)
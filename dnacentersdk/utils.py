@@ -140,9 +140,6 @@ def check_type(o, acceptable_types, may_be_none=True):
             object is not an instance of one of the acceptable types.
 
     """
-    if not isinstance(acceptable_types, tuple):
-        acceptable_types = (acceptable_types,)
-
     if may_be_none and o is None:
         # Object is None, and that is OK!
         pass
@@ -151,6 +148,8 @@ def check_type(o, acceptable_types, may_be_none=True):
         pass
     else:
         # Object is something else.
+        if not isinstance(acceptable_types, tuple):
+            acceptable_types = (acceptable_types,)
         error_message = (
             "We were expecting to receive an instance of one of the following "
             "types: {types}{none}; but instead we received {o} which is a "
@@ -175,10 +174,12 @@ def dict_from_items_with_values(*dictionaries, **items):
         dict: A dictionary containing all of the items with a 'non-None' value.
 
     """
-    dict_list = list(dictionaries)
-    dict_list.append(items)
+    if len(dictionaries) == 1 and not items:
+        # Fast path used by the API wrappers
+        return {key: value for key, value in dictionaries[0].items()
+                if value is not None}
     result = {}
-    for d in dict_list:
+    for d in dictionaries + (items,):
         for key, value in d.items():
             if value is not None:
                 result[key] = value
@@ -262,12 +263,86 @@ def json_dict(json_data):
         )
 
 
+class _PathTemplate(object):
+    """A URL template split once into literal and `${name}` segments."""
+
+    def __init__(self, URL, keys):
+        self.keys = keys
+        self.segments = []
+        remainder = URL
+        literal_parts = []
+        while remainder:
+            start = remainder.find('${')
+            end = remainder.find('}', start)
+            if start < 0 or end < 0:
+                self.segments.append((remainder, None))
+                literal_parts.append(remainder)
+                break
+            name = remainder[start + 2:end]
+            if name in keys:
+                self.segments.append((remainder[:start], name))
+                literal_parts.append(remainder[:start])
+            else:
+                self.segments.append((remainder[:end + 1], None))
+                literal_parts.append(remainder[:end + 1])
+            remainder = remainder[end + 1:]
+        # A key found outside of its `${key}` placeholder is replaced as a
+        # bare word (e.g. 'sda/border-device'); keep the generic algorithm.
+        literal = '\n'.join(literal_parts)
+        self.compiled = not any(k in literal for k in keys)
+
+    def render(self, path_params):
+        values = {}
+        for k in self.keys:
+            value = str(path_params[k])
+            if any(key in value for key in self.keys):
+                return None
+            values[k] = value
+        return ''.join(literal if name is None else literal + values[name]
+                       for literal, name in self.segments)
+
+
+_path_templates = {}
+
+
+def _legacy_apply_path_params(URL, path_params):
+    for k in path_params:
+        URL = URL.replace('${' + k + '}', str(path_params[k]))
+        URL = URL.replace(k, str(path_params[k]))
+    return URL
+
+
 def apply_path_params(URL, path_params):
+    """Replace the path parameters of an endpoint URL by their values.
+
+    The URL template is split once per (URL, parameter names) pair and the
+    result is cached, so repeated calls to the same endpoint only join the
+    pre-split segments with the new values.
+
+    Args:
+        URL(str): The endpoint URL with `${name}` placeholders.
+        path_params(dict): The path parameter values, keyed by name.
+
+    Returns:
+        str: The URL with the path parameters applied.
+
+    Raises:
+        TypeError: If the parameter types are incorrect.
+
+    """
     if isinstance(URL, str) and isinstance(path_params, dict):
-        for k in path_params:
-            URL = URL.replace('${' + k + '}', str(path_params[k]))
-            URL = URL.replace(k, str(path_params[k]))
-        return URL
+        if not path_params:
+            return URL
+        keys = tuple(path_params)
+        template = _path_templates.get((URL, keys))
+        if template is None:
+            template = _PathTemplate(URL, keys)
+            _path_templates[(URL, keys)] = template
+        if template.compiled:
+            rendered = template.render(path_params)
+            if rendered is not None:
+                return rendered
+        return _legacy_apply_path_params(URL, path_params)
     else:
         raise TypeError(
             "'URL' must be a string; "
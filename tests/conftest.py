@@ -24,6 +24,9 @@ SOFTWARE.
 
 import pytest
 
+import dnacentersdk
+from dnacentersdk.simulator import Inventory, Simulator, SimulatorServer
+
 pytest_plugins = [
     'tests.test_dnacentersdk',
     'tests.api',
@@ -39,6 +42,9 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "dnacentersdk: dnacentersdk test"
     )
+    config.addinivalue_line(
+        "markers", "simulator: local DNA Center simulator test"
+    )
     config.addinivalue_line(
         "markers", "authentication: authentication wrapper test"
     )
@@ -93,3 +99,57 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "template_programmer: template_programmer wrapper test"
     )
+
+
+# Simulator fixtures
+
+INVENTORY_OPTIONS = ('devices', 'interfaces_per_device')
+
+
+def _options(request, defaults):
+    """The module's `defaults` dict, updated by an indirect parameter."""
+    options = dict(getattr(request.module, defaults, {}))
+    options.update(getattr(request, 'param', None) or {})
+    return options
+
+
+@pytest.fixture()
+def simulator(request):
+    """A DNA Center simulator.
+
+    Its Inventory and Simulator arguments are read from the
+    SIMULATOR_OPTIONS dict of the test module, updated by the parameter of
+    an indirect parametrization, for example::
+
+        @pytest.mark.parametrize('simulator', [{'latency': 0.2}],
+                                 indirect=True)
+
+    """
+    options = _options(request, 'SIMULATOR_OPTIONS')
+    inventory = Inventory(**dict((k, options.pop(k))
+                                 for k in INVENTORY_OPTIONS if k in options))
+    return Simulator(inventory, **options)
+
+
+@pytest.fixture()
+def simulator_server(simulator):
+    """The simulator, served over HTTP for the duration of the test."""
+    with SimulatorServer(simulator) as server:
+        yield server
+
+
+@pytest.fixture()
+def dnac(request, simulator_server):
+    """A DNACenterAPI connected to the simulator.
+
+    Its other arguments, such as `workers` or `version` (1.3.0 by
+    default), are read from the API_OPTIONS dict of the test module,
+    updated by an indirect parameter.
+    """
+    options = {'version': '1.3.0'}
+    options.update(_options(request, 'API_OPTIONS'))
+    api = dnacentersdk.DNACenterAPI(username='admin', password='secret',
+                                    base_url=simulator_server.base_url,
+                                    verify=False, **options)
+    yield api
+    api.close()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""dnacentersdk/batching.py Tests
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import pytest
+
+import dnacentersdk
+
+
+DEVICE_LIST = 'GET /dna/intent/api/v1/network-device'
+
+
+SIMULATOR_OPTIONS = {'devices': 100}
+
+
+@pytest.mark.simulator
+def test_batched_lookups(dnac, simulator):
+    devices = [simulator.inventory.device(i) for i in range(60)]
+    with dnac.batching(max_batch=25) as batch:
+        by_id = [batch.get_device_by_id(d['id']) for d in devices]
+        by_serial = [batch.get_device_by_serial_number(d['serialNumber'])
+                     for d in devices[:10]]
+        by_ip = batch.get_network_device_by_ip(
+            devices[0]['managementIpAddress']
+        )
+        duplicate = batch.get_device_by_id(devices[0]['id'])
+        missing = batch.get_device_by_hostname('missing.example.com')
+        # Only the two full batches of ids are sent before the flush
+        assert simulator.stats[DEVICE_LIST] == 2
+    assert [f.result().id for f in by_id] == [d['id'] for d in devices]
+    assert ([f.result().serialNumber for f in by_serial]
+            == [d['serialNumber'] for d in devices[:10]])
+    assert by_ip.result().id == devices[0]['id']
+    assert duplicate.result().id == devices[0]['id']
+    with pytest.raises(dnacentersdk.dnacentersdkException):
+        missing.result()
+    # 3 id batches, and one query per value of the other fields
+    assert simulator.stats[DEVICE_LIST] == 15
+    assert batch.stats['lookups'] == 73
+    assert batch.stats['requests'] == 15
+
+
+@pytest.mark.simulator
+def test_single_value_filters(dnac, simulator):
+    devices = [simulator.inventory.device(i) for i in range(2)]
+    # Only the ids are documented as comma-separated lists
+    assert len(dnac.devices.get_device_list(
+        id=','.join(d['id'] for d in devices)
+    ).response) == 2
+    assert dnac.devices.get_device_list(
+        serial_number=','.join(d['serialNumber'] for d in devices)
+    ).response == []
+
+
+@pytest.mark.simulator
+def test_batching_window(dnac, simulator):
+    batch = dnac.batching(window=0.05)
+    future = batch.get_device_by_id(simulator.inventory.device(3)['id'])
+    assert future.result(timeout=5).hostname == 'edge-000003.example.com'
+    batch.close()
+    with pytest.raises(dnacentersdk.dnacentersdkException):
+        batch.get_device_by_id('late')
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""dnacentersdk/bulk.py Tests
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import threading
+import warnings
+
+import pytest
+
+import dnacentersdk
+from dnacentersdk.bulk import bulk
+
+
+SIMULATOR_OPTIONS = {'devices': 100, 'latency': 0.01}
+
+
+@pytest.mark.simulator
+def test_bulk(dnac, simulator):
+    ids = [simulator.inventory.device(i)['id'] for i in range(100)]
+    outcomes = list(dnac.bulk(dnac.devices.get_device_by_id,
+                              ids + ['missing'], workers=8))
+    assert len(outcomes) == 101
+    failed = [o for o in outcomes if o.error is not None]
+    assert [o.arguments for o in failed] == ['missing']
+    assert isinstance(failed[0].error, dnacentersdk.ApiError)
+    assert sorted(o.result.response.id for o in outcomes
+                  if o.error is None) == sorted(ids)
+
+
+@pytest.mark.simulator
+def test_bulk_arguments(dnac, simulator):
+    ids = [simulator.inventory.device(i)['id'] for i in range(20)]
+    outcomes = dnac.bulk(dnac.devices.get_device_by_id,
+                         ([i] if n % 2 else {'id': i}
+                          for n, i in enumerate(ids)),
+                         workers=4, ordered=True)
+    assert [o.index for o in outcomes] == list(range(20))
+
+
+@pytest.mark.dnacentersdk
+def test_bulk_checks():
+    # Checked at the call, before the results are iterated
+    with pytest.raises(ValueError):
+        bulk(len, [], workers=0)
+    with pytest.raises(TypeError):
+        bulk(len, [], workers='8')
+
+
+@pytest.mark.simulator
+def test_bulk_pool_size(dnac, simulator):
+    ids = [simulator.inventory.device(i)['id'] for i in range(60)]
+    lock = threading.Lock()
+    active = [0]
+    peak = [0]
+
+    def get_device(device_id):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        try:
+            return dnac.devices.get_device_by_id(device_id)
+        finally:
+            with lock:
+                active[0] -= 1
+
+    outcomes = list(dnac.bulk(get_device, ids, workers=50))
+    assert all(o.error is None for o in outcomes)
+    # No more calls than pooled connections
+    assert peak[0] <= dnac.session.pool_size == 10
+
+
+@pytest.mark.simulator
+@pytest.mark.parametrize('simulator', [{'rate_limit': 20}], indirect=True)
+def test_bulk_rate_limit(dnac, simulator):
+    ids = [simulator.inventory.device(i)['id'] for i in range(40)]
+    with warnings.catch_warnings(record=True):
+        warnings.simplefilter('always')
+        outcomes = list(dnac.bulk(dnac.devices.get_device_by_id, ids,
+                                  workers=8))
+    assert all(o.error is None for o in outcomes)
+    assert simulator.stats['throttled'] > 0
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""dnacentersdk/cache.py Tests
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import time
+
+import pytest
+
+from dnacentersdk.cache import ResponseCache
+
+
+SITE = '/dna/intent/api/v1/site'
+DEVICE = '/dna/intent/api/v1/network-device/${id}'
+
+
+SIMULATOR_OPTIONS = {'devices': 20, 'etags': True}
+
+
+@pytest.mark.dnacentersdk
+def test_templates_and_keys():
+    cache = ResponseCache(ttls={SITE: 300, DEVICE: 60})
+    assert cache.ttl_for('https://dnac' + SITE) == 300
+    assert cache.ttl_for('https://dnac/dna/intent/api/v1/network-device/'
+                         'abc') == 60
+    assert cache.ttl_for('https://dnac/dna/intent/api/v1/network-device/'
+                         'abc/config') is None
+    assert cache.template_for('https://dnac/dna/intent/api/v1/'
+                              'network-device/abc') == DEVICE
+    assert cache.key('u', {'b': 1, 'a': None, 'c': [1, 2]},
+                     {'X-Auth-Token': 't', '__runsync': 'true'}) == \
+        ('u', (('b', 1), ('c', (1, 2))), (('__runsync', 'true'),))
+
+
+@pytest.mark.dnacentersdk
+def test_lru_eviction():
+    cache = ResponseCache(default_ttl=60, maxsize=2)
+    for name in ('a', 'b'):
+        cache.store(cache.key(name), name, 60)
+    cache.lookup(cache.key('a'))
+    cache.store(cache.key('c'), 'c', 60)
+    assert cache.lookup(cache.key('b')) is None
+    assert cache.lookup(cache.key('a')).data == 'a'
+    assert cache.stats['evictions'] == 1
+
+
+@pytest.mark.simulator
+def test_cached_get(dnac, simulator):
+    dnac.session.cache = ResponseCache(ttls={SITE: 60})
+    first = dnac.sites.get_site(name='Global/Area-1')
+    assert dnac.sites.get_site(name='Global/Area-1') == first
+    dnac.sites.get_site(name='Global/Area-2')
+    assert simulator.stats['GET ' + SITE] == 2
+    assert dnac.session.cache.stats['hits'] == 1
+    assert dnac.session.cache.stats['misses'] == 2
+
+    # Not configured, not cached
+    dnac.devices.get_device_count()
+    dnac.devices.get_device_count()
+    assert simulator.stats['GET /dna/intent/api/v1/network-device/count'] \
+        == 2
+
+
+@pytest.mark.simulator
+def test_revalidation(dnac, simulator):
+    dnac.session.cache = ResponseCache(ttls={DEVICE: 0.1})
+    device_id = simulator.inventory.device(1)['id']
+    first = dnac.devices.get_device_by_id(device_id)
+    time.sleep(0.15)
+    assert dnac.devices.get_device_by_id(device_id) == first
+    assert simulator.stats['not_modified'] == 1
+    assert dnac.session.cache.stats['revalidated'] == 1
+
+    # A changed resource is downloaded again
+    simulator.inventory.update_device(1, role='CORE')
+    time.sleep(0.15)
+    assert dnac.devices.get_device_by_id(device_id).response.role == 'CORE'
+    assert dnac.session.cache.stats['revalidated'] == 1
+
+
+@pytest.mark.simulator
+def test_disable_cache(dnac, simulator):
+    dnac.session.cache = ResponseCache(ttls={SITE: 60})
+    dnac.sites.get_site()
+    dnac.session.cache = None
+    dnac.sites.get_site()
+    assert simulator.stats['GET ' + SITE] == 2
+
+
+@pytest.mark.simulator
+def test_write_invalidation(dnac, simulator):
+    simulator.task_duration = 0.2
+    dnac.session.cache = ResponseCache(ttls={DEVICE: 60})
+    devices = [simulator.inventory.device(i)['id'] for i in (1, 2)]
+    for device_id in devices:
+        dnac.devices.get_device_by_id(device_id)
+    task = dnac.devices.update_device_role(id=devices[0], role='CORE',
+                                           roleSource='MANUAL')
+    # Only the updated device is dropped
+    assert dnac.session.cache.stats['invalidations'] == 1
+    assert len(dnac.session.cache) == 1
+
+    # Reading the device before the task completes caches the old role,
+    # so polling the completed task invalidates it again
+    assert dnac.devices.get_device_by_id(devices[0]).response.role == \
+        'ACCESS'
+    time.sleep(0.3)
+    assert dnac.task.get_task_by_id(task.response.taskId).response.endTime
+    assert dnac.devices.get_device_by_id(devices[0]).response.role == 'CORE'
+
+
+@pytest.mark.simulator
+@pytest.mark.parametrize('dnac', [{'version': '1.2.10'}], indirect=True)
+def test_write_invalidation_1_2_10(dnac, simulator):
+    dnac.session.cache = ResponseCache(ttls={SITE: 60, DEVICE: 60})
+
+    def completed():
+        # The site writes complete as executions
+        deadline = time.time() + 5
+        while time.time() < deadline and not all(
+                'endTime' in e for e in simulator._executions.values()):
+            time.sleep(0.01)
+
+    # 1.2.10 has no get_site wrapper; read the site list directly
+    sites = dnac.session.get(SITE)['response']
+    dnac.sites.create_site(type='area',
+                           site={'area': {'name': 'Area-New',
+                                          'parentName': 'Global'}})
+    completed()
+    assert len(dnac.session.get(SITE)['response']) == len(sites) + 1
+    assert simulator.stats['GET ' + SITE] == 2
+
+    device = simulator.inventory.device(1)
+    assert dnac.devices.get_device_by_id(device['id']).response \
+        .locationName is None
+    site = simulator._site_by_hierarchy('Global/Area-1')
+    dnac.sites.assign_device_to_site(
+        site['id'], device=[{'ip': device['managementIpAddress']}]
+    )
+    completed()
+    assert dnac.devices.get_device_by_id(device['id']).response \
+        .locationName == 'Global/Area-1'
+    assert simulator.stats['GET ' + DEVICE] == 2
+
+
+@pytest.mark.dnacentersdk
+def test_manual_invalidation():
+    cache = ResponseCache(default_ttl=60)
+    for device_id in ('a', 'b'):
+        cache.store(cache.key('https://dnac/dna/intent/api/v1/'
+                              'network-device/' + device_id), device_id, 60)
+    cache.store(cache.key('https://dnac' + SITE), [], 60)
+    assert cache.invalidate(DEVICE, id='a') == 1
+    assert cache.invalidate(DEVICE) == 1
+    assert cache.invalidate() == 1
+    assert len(cache) == 0
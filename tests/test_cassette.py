@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""dnacentersdk/cassette.py Tests
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import time
+
+import pytest
+
+import dnacentersdk
+from dnacentersdk.cassette import ReplayAdapter, request_fingerprint
+from dnacentersdk.simulator import Inventory, Simulator, SimulatorServer
+
+
+@pytest.fixture()
+def recorded(tmpdir):
+    """Record a few calls against the simulator, then stop the simulator."""
+    path = str(tmpdir.join('cassette.json'))
+    simulator = Simulator(Inventory(devices=50), latency=0.05)
+    file_id = simulator.add_file('config.txt', b'hostname edge\n' * 100)
+    with SimulatorServer(simulator) as server:
+        api = dnacentersdk.DNACenterAPI(username='admin', password='secret',
+                                        base_url=server.base_url,
+                                        version='1.3.0', verify=False)
+        api.session.use_cassette(path, record=True)
+        devices = api.devices.get_device_list(offset=1, limit=20)
+        count = api.devices.get_device_count()
+        with tmpdir.as_cwd():
+            api.file.download_a_file_by_fileid(file_id, stream=True)
+        api.session.eject_cassette()
+    return api, path, devices, count, file_id
+
+
+@pytest.mark.dnacentersdk
+def test_request_fingerprint():
+    assert request_fingerprint('get', 'https://a/x?b=1&a=2') == \
+        request_fingerprint('GET', 'https://b/x?a=2&b=1')
+    assert request_fingerprint('POST', '/x', b'{"a": 1, "b": 2}') == \
+        request_fingerprint('POST', '/x', '{"b":2,"a":1}')
+    assert request_fingerprint('POST', '/x', b'{"a": 1}') != \
+        request_fingerprint('POST', '/x', b'{"a": 2}')
+
+
+@pytest.mark.simulator
+def test_replay(recorded, tmpdir):
+    api, path, devices, count, file_id = recorded
+    cassette = api.session.use_cassette(path)
+    assert len(cassette.interactions) == 3
+
+    start = time.time()
+    assert api.devices.get_device_list(offset=1, limit=20) == devices
+    assert api.devices.get_device_count() == count
+    assert time.time() - start < 0.05
+
+    # Served again once the recorded responses are exhausted
+    assert api.devices.get_device_count() == count
+
+    download = tmpdir.mkdir('replay')
+    with download.as_cwd():
+        api.file.download_a_file_by_fileid(file_id, stream=True)
+    assert download.join('config.txt').read() == 'hostname edge\n' * 100
+
+    with pytest.raises(dnacentersdk.CassetteError):
+        api.devices.get_device_list(offset=21, limit=20)
+    api.session.eject_cassette()
+
+
+@pytest.mark.simulator
+def test_replay_at_recorded_latency(recorded):
+    api, path, devices, count, file_id = recorded
+    api.session.use_cassette(path, realtime=True)
+    start = time.time()
+    assert api.devices.get_device_count() == count
+    assert time.time() - start >= 0.05
+    api.session.eject_cassette()
+
+
+@pytest.mark.simulator
+def test_unreadable_cassette(recorded, tmpdir):
+    api, path, devices, count, file_id = recorded
+    adapters = dict(api.session._req_session.adapters)
+    malformed = tmpdir.join('malformed.json')
+    malformed.write('{"version": 1')
+    for unreadable in (str(tmpdir.join('missing.json')), str(malformed)):
+        with pytest.raises((IOError, ValueError)):
+            api.session.use_cassette(unreadable)
+        assert api.session._req_session.adapters == adapters
+    # The session can still replay a cassette
+    api.session.use_cassette(path)
+    assert isinstance(api.session._req_session.adapters['https://'],
+                      ReplayAdapter)
+    assert api.devices.get_device_count() == count
+    api.session.eject_cassette()
+    assert api.session._req_session.adapters == adapters
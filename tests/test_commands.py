@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""dnacentersdk/commands.py Tests
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import collections
+
+import pytest
+
+import dnacentersdk
+
+
+READ_REQUEST = ('POST /dna/intent/api/v1/network-device-poller/cli/'
+                'read-request')
+DOWNLOAD = 'GET /dna/intent/api/v1/file/${fileId}'
+
+
+SIMULATOR_OPTIONS = {'devices': 250, 'task_duration': 0.2}
+
+
+@pytest.mark.simulator
+def test_run_commands(dnac, simulator):
+    device_ids = [simulator.inventory.device(i)['id'] for i in range(250)]
+    commands = ['show version', 'show clock', 'show ip int brief',
+                'show inventory', 'show vlan', 'show cdp neighbors',
+                'configure terminal']
+    outputs = list(dnac.run_commands(commands, iter(device_ids + ['gone'])))
+    assert len(outputs) == 251 * 7
+    statuses = collections.Counter(o.status for o in outputs)
+    assert statuses == {'SUCCESS': 250 * 6, 'BLACKLISTED': 251,
+                        'FAILURE': 6}
+    first = [o for o in outputs if o.device_id == device_ids[0]
+             and o.command == 'show clock']
+    assert first[0].output.startswith('edge-000000.example.com#show clock')
+    # 3 device chunks, 2 command chunks each
+    assert simulator.stats[READ_REQUEST] == 6
+    assert simulator.stats[DOWNLOAD] == 6
+
+
+@pytest.mark.simulator
+def test_run_commands_errors(dnac, simulator):
+    device_ids = [simulator.inventory.device(i)['id'] for i in range(10)]
+    simulator.task_failure_rate = 1.0
+    outputs = list(dnac.run_commands(['show version'], device_ids,
+                                     devices_per_request=5))
+    assert len(outputs) == 10
+    assert all(o.status == 'ERROR' for o in outputs)
+    assert isinstance(outputs[0].error, dnacentersdk.TaskError)
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""dnacentersdk/download.py Tests
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import hashlib
+import io
+import threading
+
+import pytest
+import requests
+
+import dnacentersdk
+from dnacentersdk.download import resume_download
+
+
+CONTENT = b''.join(b'line %d\n' % i for i in range(20000))
+
+
+SIMULATOR_OPTIONS = {'devices': 1}
+
+
+@pytest.fixture()
+def file_id(simulator):
+    return simulator.add_file('archive.txt', CONTENT)
+
+
+@pytest.mark.simulator
+def test_download_to_path(dnac, file_id, tmpdir):
+    calls = []
+    path = str(tmpdir.join('saved.txt'))
+    result = dnac.file.download_a_file_by_fileid(
+        file_id, sink=path, chunk_size=4096, hash_algorithms=['md5', 'sha1'],
+        progress=lambda done, total: calls.append((done, total)),
+    )
+    assert tmpdir.join('saved.txt').read_binary() == CONTENT
+    assert result.file_name == 'archive.txt'
+    assert result.path == path
+    assert result.size == len(CONTENT)
+    assert result.digests == {'md5': hashlib.md5(CONTENT).hexdigest(),
+                              'sha1': hashlib.sha1(CONTENT).hexdigest()}
+    assert len(calls) == -(-len(CONTENT) // 4096)
+    assert calls[-1] == (len(CONTENT), len(CONTENT))
+    # No temporary file is left behind
+    assert tmpdir.listdir() == [tmpdir.join('saved.txt')]
+
+
+@pytest.mark.simulator
+def test_download_sinks(dnac, file_id, tmpdir):
+    result = dnac.file.download_a_file_by_fileid(file_id, sink=str(tmpdir))
+    assert result.path == str(tmpdir.join('archive.txt'))
+    assert tmpdir.join('archive.txt').read_binary() == CONTENT
+
+    buffer = io.BytesIO()
+    result = dnac.file.download_a_file_by_fileid(file_id, sink=buffer)
+    assert buffer.getvalue() == CONTENT
+    assert result.path is None
+
+    # The headers keep their position after the file id
+    buffer = io.BytesIO()
+    dnac.file.download_a_file_by_fileid(file_id, {'Accept': '*/*'}, None,
+                                        True, buffer)
+    assert buffer.getvalue() == CONTENT
+
+    chunks = []
+    dnac.file.download_a_file_by_fileid(file_id, sink=chunks.append,
+                                        chunk_size=1000)
+    assert max(len(c) for c in chunks) <= 1000
+    assert b''.join(chunks) == CONTENT
+
+    chunks = dnac.file.iter_file_content(file_id, chunk_size=1000)
+    assert b''.join(chunks) == CONTENT
+
+    with tmpdir.as_cwd():
+        dnac.file.download_a_file_by_fileid(file_id)
+    assert tmpdir.join('archive.txt').read_binary() == CONTENT
+
+
+@pytest.mark.simulator
+def test_concurrent_downloads(dnac, simulator, tmpdir):
+    contents = [bytes([65 + i]) * 100000 for i in range(8)]
+    file_ids = [simulator.add_file('same.txt', c) for c in contents]
+    results = []
+
+    def download(file_id):
+        results.append(dnac.file.download_a_file_by_fileid(
+            file_id, sink=str(tmpdir), chunk_size=1024
+        ))
+
+    threads = [threading.Thread(target=download, args=(i,))
+               for i in file_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 8
+    # The file is one of the downloads, never a mix of them
+    assert tmpdir.join('same.txt').read_binary() in contents
+    assert tmpdir.listdir() == [tmpdir.join('same.txt')]
+
+
+@pytest.mark.simulator
+def test_resume_download(dnac, file_id, tmpdir):
+    path = str(tmpdir.join('saved.txt'))
+
+    def interrupt(done, total):
+        if done >= 50000:
+            raise KeyboardInterrupt()
+
+    with pytest.raises(KeyboardInterrupt):
+        dnac.file.download_a_file_by_fileid(file_id, sink=path, resume=True,
+                                            chunk_size=10000,
+                                            progress=interrupt)
+    partial = tmpdir.join('saved.txt.part')
+    assert partial.size() == 50000
+
+    calls = []
+    result = dnac.file.download_a_file_by_fileid(
+        file_id, sink=path, resume=True, chunk_size=10000,
+        hash_algorithms=['sha1'],
+        progress=lambda done, total: calls.append((done, total)),
+    )
+    assert tmpdir.join('saved.txt').read_binary() == CONTENT
+    assert not partial.exists()
+    assert calls[0] == (60000, len(CONTENT))
+    assert result.size == len(CONTENT)
+    assert result.digests['sha1'] == hashlib.sha1(CONTENT).hexdigest()
+
+    # A partial file longer than the file is discarded
+    partial.write_binary(CONTENT + b'stale')
+    dnac.file.download_a_file_by_fileid(file_id, sink=path, resume=True)
+    assert tmpdir.join('saved.txt').read_binary() == CONTENT
+
+
+@pytest.mark.dnacentersdk
+def test_resume_unsatisfiable(tmpdir):
+    response = requests.Response()
+    response.status_code = 416
+    response.reason = 'Requested Range Not Satisfiable'
+    response.request = requests.Request('GET', 'https://dnac/file').prepare()
+    response.raw = io.BytesIO(b'')
+    # Without a partial file, no range is requested
+    with pytest.raises(dnacentersdk.ApiError) as e:
+        resume_download(lambda headers: response,
+                        str(tmpdir.join('saved.txt')))
+    assert e.value.status_code == 416
+    assert tmpdir.listdir() == []
+
+
+@pytest.mark.simulator
+def test_segmented_download(dnac, simulator, file_id, tmpdir):
+    path = str(tmpdir.join('saved.txt'))
+    calls = []
+    result = dnac.file.download_a_file_by_fileid(
+        file_id, sink=path, workers=4, segment_size=20000,
+        hash_algorithms=['md5'],
+        progress=lambda done, total: calls.append((done, total)),
+    )
+    assert tmpdir.join('saved.txt').read_binary() == CONTENT
+    assert result.size == len(CONTENT)
+    assert result.digests['md5'] == hashlib.md5(CONTENT).hexdigest()
+    assert max(calls) == (len(CONTENT), len(CONTENT))
+    assert simulator.stats['GET /dna/intent/api/v1/file/${fileId}'] == \
+        -(-len(CONTENT) // 20000)
+    assert tmpdir.listdir() == [tmpdir.join('saved.txt')]
+
+    with pytest.raises(ValueError):
+        dnac.file.download_a_file_by_fileid(file_id, sink=path, workers=4,
+                                            resume=True)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""dnacentersdk/executor.py Tests
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import inspect
+from concurrent.futures import wait
+
+import pytest
+
+import dnacentersdk
+
+
+SIMULATOR_OPTIONS = {'devices': 20, 'latency': 0.01}
+
+API_OPTIONS = {'workers': 4}
+
+
+@pytest.mark.simulator
+def test_submit(dnac, simulator):
+    ids = [simulator.inventory.device(i)['id'] for i in range(20)]
+    futures = [dnac.devices.get_device_by_id.submit(i) for i in ids]
+    missing = dnac.devices.get_device_by_id.submit(id='missing')
+    count = dnac.submit(dnac.devices.get_device_count)
+    wait(futures + [missing, count])
+    assert [f.result().response.id for f in futures] == ids
+    assert isinstance(missing.exception(), dnacentersdk.ApiError)
+    assert count.result().response == 20
+
+
+@pytest.mark.simulator
+def test_submittable_method(dnac):
+    method = dnac.devices.get_device_by_id
+    assert method.__name__ == 'get_device_by_id'
+    assert 'id' in inspect.signature(method).parameters
+    assert method.__doc__ == dnac.devices.__class__.get_device_by_id.__doc__
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""dnacentersdk/onboarding.py Tests
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import time
+
+import pytest
+
+import dnacentersdk
+
+
+IMPORT = 'POST /dna/intent/api/v1/onboarding/pnp-device/import'
+
+
+SIMULATOR_OPTIONS = {'devices': 1}
+
+
+def device(index):
+    return {'deviceInfo': {'serialNumber': 'FDO{:08d}'.format(index),
+                           'pid': 'C9300-24U'}}
+
+
+@pytest.mark.simulator
+def test_import_pnp_devices(dnac, simulator):
+    devices = [device(i) for i in range(2500)]
+    devices[10] = {'deviceInfo': {'serialNumber': 10}}
+    devices[1500] = device(3)
+    calls = []
+    report = dnac.import_pnp_devices(
+        iter(devices), chunk_size=300, workers=4,
+        progress=lambda imported, failed: calls.append((imported, failed)),
+    )
+    assert len(report.success_list) == 2498
+    assert [f['index'] for f in report.failure_list] == [10, 1500]
+    assert 'must be string' in report.failure_list[0]['msg']
+    assert report.failure_list[1]['serialNum'] == 'FDO00000003'
+    assert 'already exists' in report.failure_list[1]['msg']
+    assert simulator.stats[IMPORT] == 9
+    assert len(calls) == 9
+    assert calls[-1] == (2498, 2)
+    assert dnac.pnp.get_device_count().response == 2498
+
+
+@pytest.mark.simulator
+def test_import_pnp_devices_retries(dnac, simulator):
+    simulator.drop_requests(IMPORT, 2)
+    report = dnac.import_pnp_devices([device(i) for i in range(10)],
+                                     chunk_size=10)
+    assert len(report.success_list) == 10
+    assert simulator.stats[IMPORT] == 3
+
+    simulator.drop_requests(IMPORT, 6)
+    report = dnac.import_pnp_devices([device(i) for i in range(10, 20)],
+                                     chunk_size=5, workers=1, retries=1)
+    # The first chunk fails twice, with one session retry each time
+    assert len(report.success_list) == 5
+    assert [f['index'] for f in report.failure_list] == [0, 1, 2, 3, 4]
+    assert report.failure_list[0]['serialNum'] == 'FDO00000010'
+
+
+CLAIM = 'POST /dna/intent/api/v1/onboarding/pnp-device/site-claim'
+PNP_LIST = 'GET /dna/intent/api/v1/onboarding/pnp-device'
+PNP_DEVICE = 'GET /dna/intent/api/v1/onboarding/pnp-device/${id}'
+
+
+def site_id(simulator):
+    return simulator._site_by_hierarchy('Global/Area-1/Building-1')['id']
+
+
+@pytest.mark.simulator
+@pytest.mark.parametrize('simulator', [{'task_duration': 0.3}], indirect=True)
+def test_claim_pnp_devices(dnac, simulator):
+    devices = dnac.import_pnp_devices(
+        [device(i) for i in range(500)]
+    ).success_list
+    devices.append({'id': 'gone', 'deviceInfo': {'serialNumber': 'GONE'}})
+    events = list(dnac.claim_pnp_devices(site_id(simulator), iter(devices),
+                                         workers=16, interval=0.1,
+                                         timeout=30))
+    assert len(events) == 501
+    failure = [e for e in events if e.status != 'SUCCESS']
+    assert [e.device_id for e in failure] == ['gone']
+    assert isinstance(failure[0].error, dnacentersdk.ApiError)
+    success = [e for e in events if e.status == 'SUCCESS']
+    assert set(e.serial_number for e in success) == \
+        set(d['deviceInfo']['serialNumber'] for d in devices[:500])
+    assert success[0].device.deviceInfo.siteId == site_id(simulator)
+    assert simulator.stats[CLAIM] == 501
+    # Batched state reads, never one request per device
+    assert simulator.stats[PNP_LIST] < 100
+    assert simulator.stats[PNP_DEVICE] == 0
+    # The serial number filter takes repeated parameters, not a
+    # comma-separated list
+    serials = [d['deviceInfo']['serialNumber'] for d in devices[:2]]
+    assert dnac.pnp.get_device_list(serial_number=','.join(serials)) == []
+
+
+@pytest.mark.simulator
+@pytest.mark.parametrize('simulator', [{'task_duration': 0.2}], indirect=True)
+def test_claim_pnp_devices_poll_errors(dnac, simulator):
+    devices = dnac.import_pnp_devices(
+        [device(i) for i in range(20)]
+    ).success_list
+    # Two failed state reads, each retried once by the session
+    simulator.drop_requests(PNP_LIST, 4)
+    events = list(dnac.claim_pnp_devices(site_id(simulator), devices,
+                                         workers=4, interval=0.05,
+                                         timeout=30))
+    assert [e.status for e in events] == ['SUCCESS'] * 20
+    assert simulator.stats['dropped'] == 4
+
+
+@pytest.mark.simulator
+@pytest.mark.parametrize('simulator', [{'task_duration': 0.2,
+                                        'latency': 0.02}], indirect=True)
+def test_claim_pnp_devices_close(dnac, simulator):
+    devices = dnac.import_pnp_devices(
+        [device(i) for i in range(200)]
+    ).success_list
+    events = dnac.claim_pnp_devices(site_id(simulator), devices, workers=2,
+                                    interval=0.05)
+    next(events)
+    events.close()
+    time.sleep(0.1)
+    claims = simulator.stats[CLAIM]
+    time.sleep(0.3)
+    # No claim is sent once the generator is closed
+    assert simulator.stats[CLAIM] == claims < 200
+
+
+@pytest.mark.simulator
+def test_claim_pnp_devices_failures(dnac, simulator):
+    devices = dnac.import_pnp_devices(
+        [device(i) for i in range(10)]
+    ).success_list
+    simulator.task_failure_rate = 1.0
+    events = list(dnac.claim_pnp_devices(site_id(simulator), devices[:5],
+                                         interval=0.05))
+    assert [e.status for e in events] == ['FAILURE'] * 5
+    assert events[0].device.deviceInfo.state == 'Error'
+
+    simulator.task_failure_rate = 0.0
+    simulator.task_duration = 60
+    events = list(dnac.claim_pnp_devices(site_id(simulator), devices[5:],
+                                         interval=0.05, timeout=0.2))
+    assert [e.status for e in events] == ['TIMEOUT'] * 5
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""dnacentersdk/pagination.py Tests
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import pytest
+
+from dnacentersdk.pagination import paginate, paginated, prefetch
+
+
+DEVICES = 'GET /dna/intent/api/v1/network-device'
+
+
+SIMULATOR_OPTIONS = {'devices': 1200, 'interfaces_per_device': 2}
+
+
+@pytest.mark.simulator
+def test_iter_device_list(dnac, simulator):
+    devices = dnac.devices.iter_device_list(page_size=300)
+    assert [d.id for d in devices] == \
+        [simulator.inventory.device(i)['id'] for i in range(1200)]
+    # Four full pages and an empty one
+    assert simulator.stats[DEVICES] == 5
+    # The container can be iterated again
+    assert sum(1 for _ in devices) == 1200
+
+
+@pytest.mark.simulator
+def test_slicing(dnac, simulator):
+    devices = dnac.devices.iter_device_list(page_size=300)
+    assert [d.hostname for d in devices[250:260]] == \
+        [simulator.inventory.device(i)['hostname'] for i in range(250, 260)]
+    assert simulator.stats[DEVICES] == 1
+    assert len(list(devices[1190:])) == 10
+    assert len(list(devices[:600])) == 600
+    assert len(list(dnac.devices.iter_all_interfaces(page_size=1000)
+                    [2000:2500])) == 400
+
+
+@pytest.mark.simulator
+def test_pnp_and_tasks(dnac, simulator):
+    dnac.pnp.import_devices_in_bulk(payload=[
+        {'deviceInfo': {'serialNumber': 'FOC{:04d}'.format(i)}}
+        for i in range(25)
+    ])
+    serials = [d.deviceInfo.serialNumber
+               for d in dnac.pnp.iter_device_list(page_size=10)]
+    assert serials == ['FOC{:04d}'.format(i) for i in range(25)]
+    assert len(list(dnac.pnp.iter_device_list(page_size=10)[5:15])) == 10
+
+    for i in range(3):
+        dnac.devices.sync_devices_using_forcesync(
+            payload=[simulator.inventory.device(i)['id']]
+        )
+    assert len(list(dnac.task.iter_tasks(page_size=2))) == 3
+
+
+@pytest.mark.dnacentersdk
+def test_unpaged_endpoint():
+    calls = []
+
+    def fetch(**params):
+        calls.append(params)
+        return {'response': list(range(12))}
+
+    assert list(paginate(fetch, {}, page_size=5)) == list(range(12))
+    assert list(paginated(fetch, {}, page_size=5)[3:6]) == [3, 4, 5]
+    assert len(calls) == 2
+    with pytest.raises(TypeError):
+        paginated(fetch, {'offset': 1})
+
+
+@pytest.mark.simulator
+def test_prefetch(dnac, simulator):
+    simulator.latency = 0.01
+    expected = [simulator.inventory.device(i)['id'] for i in range(1200)]
+    devices = dnac.devices.iter_device_list(page_size=100, workers=4)
+    assert [d.id for d in devices] == expected
+    # Twelve pages and a check for devices added since the count
+    assert simulator.stats[DEVICES] == 13
+    assert simulator.stats[DEVICES + '/count'] == 1
+
+    devices = dnac.devices.iter_device_list(page_size=100, workers=4,
+                                            ordered=False)
+    assert sorted(d.id for d in devices) == expected
+    assert sorted(d.id for d in devices[150:450]) == expected[150:450]
+
+    # The device count does not apply to a filtered list
+    devices = dnac.devices.iter_device_list(page_size=100, workers=4,
+                                            hostname='edge-00000.*')
+    assert len(list(devices)) == 10
+    assert simulator.stats[DEVICES + '/count'] == 3
+
+
+@pytest.mark.dnacentersdk
+def test_prefetch_count_drift():
+    records = list(range(23))
+
+    def fetch(offset, limit):
+        return {'response': records[offset - 1:offset - 1 + limit]}
+
+    # More records than counted
+    assert list(prefetch(fetch, {}, 10, page_size=5)) == records
+    # Fewer records than counted
+    assert sorted(prefetch(fetch, {}, 40, page_size=5, workers=3,
+                           ordered=False)) == records
+    assert list(prefetch(fetch, {}, 10, page_size=5, start=8, max=4)) == \
+        records[8:12]
+
+
+@pytest.mark.simulator
+def test_range_endpoints(dnac, simulator):
+    expected = [simulator.inventory.device(i)['id'] for i in range(1200)]
+    devices = dnac.devices.iter_network_device_by_pagination_range(
+        page_size=1000, workers=3
+    )
+    assert [d.id for d in devices] == expected
+    # Pages are capped to the 500 records the endpoint returns
+    assert simulator.stats['GET /dna/intent/api/v1/network-device/'
+                           '${startIndex}/${recordsToReturn}'] == 4
+    assert [d.id for d in devices[1:3]] == expected[1:3]
+
+    interfaces = dnac.devices.iter_device_interfaces_by_specified_range(
+        expected[5], page_size=1
+    )
+    assert [i.deviceId for i in interfaces] == [expected[5]] * 2
+
+
+@pytest.mark.simulator
+def test_read_ahead(dnac, simulator):
+    expected = [simulator.inventory.device(i)['id'] for i in range(1200)]
+    devices = dnac.devices.iter_device_list(page_size=300, read_ahead=2)
+    assert [d.id for d in devices] == expected
+    # The empty page after the last one, and at most one more read ahead
+    assert 5 <= simulator.stats[DEVICES] <= 6
+    assert [d.id for d in devices[10:1000]] == expected[10:1000]
+    assert list(paginate(lambda offset, limit: {'response': [1, 2]}, {},
+                         page_size=5, read_ahead=3)) == [1, 2]
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""dnacentersdk/path_trace.py Tests
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import collections
+import time
+
+import pytest
+
+from dnacentersdk.models.mydict import MyDict
+from dnacentersdk.path_trace import PathTraceCache, _read_statuses
+
+
+INITIATE = 'POST /dna/intent/api/v1/flow-analysis'
+SUMMARY = 'GET /dna/intent/api/v1/flow-analysis'
+DETAILS = 'GET /dna/intent/api/v1/flow-analysis/${flowAnalysisId}'
+DELETE = 'DELETE /dna/intent/api/v1/flow-analysis/${flowAnalysisId}'
+
+
+SIMULATOR_OPTIONS = {'devices': 100, 'task_duration': 0.3}
+
+
+def flows(simulator, count):
+    address = [simulator.inventory.device(i)['managementIpAddress']
+               for i in range(count + 1)]
+    return [{'sourceIP': address[0], 'destIP': address[i], 'destPort': 22,
+             'protocol': 'TCP'} for i in range(1, count + 1)]
+
+
+@pytest.mark.simulator
+def test_trace_paths(dnac, simulator):
+    sweep = flows(simulator, 40) + [('10.99.99.99', '10.0.0.1')]
+    # A flow repeated while it is traced is traced once
+    sweep.insert(1, dict(sweep[0], destPort='22'))
+    results = list(dnac.trace_paths(iter(sweep), max_traces=8,
+                                    interval=0.1))
+    assert len(results) == 42
+    statuses = collections.Counter(r.status for r in results)
+    assert statuses == {'COMPLETED': 41, 'FAILED': 1}
+    failed = [r for r in results if r.status == 'FAILED'][0]
+    assert failed.flow['sourceIP'] == '10.99.99.99'
+    assert 'Unable to find' in failed.result.request.failureReason
+    completed = [r for r in results if r.status == 'COMPLETED']
+    assert all(len(r.result.networkElementsInfo) == 2 for r in completed)
+    assert not any(r.cached for r in results)
+    assert simulator.stats[INITIATE] == 41
+    # The statuses are read with one summary query per poll
+    assert simulator.stats[SUMMARY] < 41
+    assert simulator.stats[DETAILS] == 41
+    assert simulator.stats[DELETE] == 41
+    time.sleep(0.4)
+    simulator.run_pending()
+    assert not simulator._flow_analyses
+
+
+@pytest.mark.simulator
+def test_trace_paths_cache(dnac, simulator):
+    sweep = flows(simulator, 10) + [('10.99.99.99', '10.0.0.1')]
+    list(dnac.trace_paths(sweep, interval=0.1))
+    assert len(dnac.path_trace_cache) == 10
+
+    start = time.time()
+    results = list(dnac.trace_paths(sweep, interval=0.1))
+    assert [r.cached for r in results].count(True) == 10
+    # Only the failed trace is started again
+    assert simulator.stats[INITIATE] == 12
+    cached = [r for r in results if r.cached]
+    assert all(r.status == 'COMPLETED' for r in cached)
+    assert time.time() - start < 5
+
+    list(dnac.trace_paths(sweep[:2], use_cache=False, interval=0.1))
+    assert simulator.stats[INITIATE] == 14
+
+
+@pytest.mark.simulator
+def test_trace_paths_errors(dnac, simulator):
+    sweep = flows(simulator, 3) + [{'sourceIP': '10.0.0.1'}]
+    results = list(dnac.trace_paths(sweep, use_cache=False, cleanup=False,
+                                    interval=0.1))
+    statuses = collections.Counter(r.status for r in results)
+    assert statuses == {'COMPLETED': 3, 'ERROR': 1}
+    assert simulator.stats[DELETE] == 0
+    assert len(simulator._flow_analyses) == 3
+
+    simulator.task_duration = 60
+    results = list(dnac.trace_paths(sweep[:2], use_cache=False, timeout=0.5,
+                                    interval=0.1))
+    assert [r.status for r in results] == ['TIMEOUT'] * 2
+    assert all(r.flow_analysis_id for r in results)
+
+
+@pytest.mark.dnacentersdk
+def test_read_statuses_window():
+    offsets = []
+
+    class PathTrace(object):
+        # An endless history of traces in progress, oldest first
+
+        def retrives_all_previous_pathtraces_summary(self, gt_create_time,
+                                                     offset, limit):
+            offsets.append(int(offset))
+            start = int(offset) - 1
+            return {'response': [{'id': str(i), 'status': 'INPROGRESS'}
+                                 for i in range(start, start + int(limit))]}
+
+        def retrieves_previous_pathtrace(self, flow_analysis_id):
+            return MyDict({'response': {'request': {'status': 'COMPLETED'}}})
+
+    now = time.time()
+    traces = {'5': [None, now, None], '700': [None, now, None]}
+    statuses = _read_statuses(PathTrace(), traces, 60, 2000)
+    # The scan stops once every trace is found
+    assert statuses == {'5': 'INPROGRESS', '700': 'INPROGRESS'}
+    assert offsets == [1, 501]
+
+    del offsets[:]
+    traces['missing'] = [None, now, None]
+    statuses = _read_statuses(PathTrace(), traces, 60, 1000)
+    # At most window_limit summaries are read; the rest one by one
+    assert offsets == [1, 501]
+    assert statuses['missing'] == 'COMPLETED'
+
+
+@pytest.mark.dnacentersdk
+def test_path_trace_cache_ttl():
+    cache = PathTraceCache(ttl=0.2)
+    flow = {'sourceIP': '10.0.0.1', 'destIP': '10.0.0.2', 'destPort': 22}
+    cache.put(flow, 'result')
+    assert cache.get(dict(flow, destPort='22')) == 'result'
+    assert cache.get(('10.0.0.1', '10.0.0.2')) is None
+    time.sleep(0.3)
+    assert cache.get(flow) is None
+    assert cache.stats == {'hits': 1, 'misses': 2, 'expired': 1}
+    assert len(cache) == 0
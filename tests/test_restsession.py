@@ -24,6 +24,7 @@ SOFTWARE.
 
 
 import logging
+import threading
 import warnings
 
 import pytest
@@ -60,3 +61,29 @@ def test_rate_limit_retry(api):
             if rate_limit_detected(w):
                 break
     api._session.wait_on_rate_limit = original_wait_on_rate_limit
+
+
+@pytest.mark.simulator
+@pytest.mark.parametrize('simulator', [{'devices': 10, 'latency': 0.2}],
+                         indirect=True)
+def test_coalesced_get(dnac, simulator):
+    dnac._session.coalesce = True
+    results = []
+
+    def get_site():
+        results.append(dnac.sites.get_site(name='Global/Area-1'))
+
+    threads = [threading.Thread(target=get_site) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    calls = simulator.stats['GET /dna/intent/api/v1/site']
+    assert len(results) == 8
+    assert all(result == results[0] for result in results)
+    assert calls < 8
+    assert calls + dnac._session.stats['coalesced'] == 8
+
+    # Different parameters are not shared
+    dnac.sites.get_site(name='Global/Area-2')
+    assert simulator.stats['GET /dna/intent/api/v1/site'] == calls + 1
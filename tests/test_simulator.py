@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""dnacentersdk/simulator Tests
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import time
+
+import pytest
+
+import dnacentersdk
+from dnacentersdk.simulator import Inventory, SimulatorServer
+
+
+def connect(server):
+    return dnacentersdk.DNACenterAPI(username='admin', password='secret',
+                                     base_url=server.base_url,
+                                     version='1.3.0', verify=False)
+
+
+SIMULATOR_OPTIONS = {'devices': 1200, 'interfaces_per_device': 4}
+
+
+@pytest.mark.simulator
+def test_inventory_scale():
+    inventory = Inventory(devices=100000, interfaces_per_device=10)
+    assert inventory.device_count == 100000
+    assert inventory.interface_count == 1000000
+    device = inventory.device(99999)
+    for field in ('id', 'hostname', 'serialNumber', 'managementIpAddress',
+                  'macAddress'):
+        assert inventory.index_of(field, device[field]) == 99999
+    interface = inventory.interface(99999, 9)
+    assert inventory.interface_by_id(interface['id']) == interface
+    assert inventory.device(100000) is None
+
+
+@pytest.mark.simulator
+def test_device_pagination(dnac):
+    seen = []
+    offset = 1
+    while True:
+        page = dnac.devices.get_device_list(offset=offset, limit=500).response
+        seen.extend(device.id for device in page)
+        if len(page) < 500:
+            break
+        offset += 500
+    assert len(seen) == len(set(seen)) == 1200
+    assert dnac.devices.get_device_count().response == 1200
+    assert dnac.devices.get_device_interface_count().response == 4800
+
+
+@pytest.mark.simulator
+def test_device_filters(dnac, simulator):
+    wanted = [simulator.inventory.device(i) for i in (7, 1100)]
+    devices = dnac.devices.get_device_list(
+        id=','.join(d['id'] for d in wanted)
+    ).response
+    assert [d.hostname for d in devices] == [d['hostname'] for d in wanted]
+    devices = dnac.devices.get_device_list(
+        hostname='edge-00110.*', limit=100
+    ).response
+    assert len(devices) == 10
+
+
+@pytest.mark.simulator
+def test_task_lifecycle(dnac, simulator):
+    simulator.task_duration = 0.2
+    device = simulator.inventory.device(3)
+    task = dnac.devices.update_device_role(id=device['id'], role='CORE',
+                                           roleSource='MANUAL')
+    task_id = task.response.taskId
+    assert 'endTime' not in dnac.task.get_task_by_id(task_id).response
+    assert dnac.devices.get_device_by_id(device['id']).response.role == \
+        'ACCESS'
+    time.sleep(0.3)
+    status = dnac.task.get_task_by_id(task_id).response
+    assert status.endTime and not status.isError
+    assert dnac.devices.get_device_by_id(device['id']).response.role == 'CORE'
+
+
+@pytest.mark.simulator
+@pytest.mark.parametrize('simulator', [{'task_failure_rate': 1.0}],
+                         indirect=True)
+def test_failed_task(dnac, simulator):
+    device = simulator.inventory.device(3)
+    task = dnac.devices.delete_device_by_id(device['id'])
+    status = dnac.task.get_task_by_id(task.response.taskId).response
+    assert status.isError and status.failureReason
+    assert dnac.devices.get_device_count().response == 1200
+
+
+@pytest.mark.simulator
+@pytest.mark.parametrize('simulator',
+                         [{'throttle_rate': 1.0, 'retry_after': 7}],
+                         indirect=True)
+def test_rate_limit_injection(dnac, simulator):
+    dnac._session.wait_on_rate_limit = False
+    with pytest.raises(dnacentersdk.RateLimitError) as e:
+        dnac.devices.get_device_count()
+    assert e.value.retry_after == 7
+    assert simulator.stats['throttled'] == 1
+
+
+@pytest.mark.simulator
+@pytest.mark.parametrize('simulator', [{'token_ttl': 0.1}], indirect=True)
+def test_token_expiry(simulator):
+    with SimulatorServer(simulator) as server:
+        api = connect(server)
+        time.sleep(0.2)
+        # The expired token is refreshed transparently
+        assert api.devices.get_device_count().response == 1200
+    assert simulator.stats['unauthorized'] == 1
+    assert simulator.stats['POST /dna/system/api/v1/auth/token'] == 2
+
+
+@pytest.mark.simulator
+def test_authentication_failure():
+    with SimulatorServer(credentials=('admin', 'secret')) as server:
+        with pytest.raises(dnacentersdk.ApiError):
+            dnacentersdk.DNACenterAPI(username='admin', password='wrong',
+                                      base_url=server.base_url,
+                                      version='1.3.0', verify=False)
+
+
+@pytest.mark.simulator
+def test_pnp_import_and_claim(dnac, simulator):
+    result = dnac.pnp.import_devices_in_bulk(payload=[
+        {'deviceInfo': {'serialNumber': 'FOC0001'}},
+        {'deviceInfo': {'serialNumber': 'FOC0001'}},
+        {'deviceInfo': {'serialNumber': 'FOC0002'}},
+    ])
+    assert len(result.successList) == 2
+    assert [f.index for f in result.failureList] == [1]
+
+    site = dnac.sites.get_site(name='Global/Area-1').response[0]
+    device_id = result.successList[0].id
+    dnac.pnp.claim_a_device_to_a_site(deviceId=device_id, siteId=site.id,
+                                      type='Default')
+    device = dnac.pnp.get_device_list(serial_number='FOC0001')[0]
+    assert device.deviceInfo.state == 'Provisioned'
+    history = dnac.pnp.get_device_history(serial_number='FOC0001').response
+    assert [event.details for event in history][-1] == 'Device provisioned'
+
+
+@pytest.mark.simulator
+def test_file_download(dnac, simulator, tmpdir):
+    file_id = simulator.add_file('running-config.txt', b'hostname edge\n')
+    namespaces = dnac.file.get_list_of_available_namespaces().response
+    assert namespaces == ['config']
+    with tmpdir.as_cwd():
+        dnac.file.download_a_file_by_fileid(file_id, stream=True)
+    assert tmpdir.join('running-config.txt').read() == 'hostname edge\n'
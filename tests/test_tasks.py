@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""dnacentersdk/tasks.py Tests
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import pytest
+
+import dnacentersdk
+from dnacentersdk.tasks import TaskWaiter, task_id_of
+
+
+TASK_LIST = 'GET /dna/intent/api/v1/task'
+TASK_BY_ID = 'GET /dna/intent/api/v1/task/${taskId}'
+TASK_TREE = 'GET /dna/intent/api/v1/task/${taskId}/tree'
+
+
+SIMULATOR_OPTIONS = {'devices': 10, 'task_duration': 0.3}
+
+
+def create_tags(dnac, count):
+    return [dnac.tag.create_tag(name='tag-{}'.format(i))
+            for i in range(count)]
+
+
+def test_task_id_of():
+    assert task_id_of('abc') == 'abc'
+    assert task_id_of({'response': {'taskId': 'abc', 'url': '/'}}) == 'abc'
+    with pytest.raises(ValueError):
+        task_id_of({'response': {}})
+
+
+@pytest.mark.simulator
+def test_wait_batched(dnac, simulator):
+    waiter = TaskWaiter(dnac.task, interval=0.1, batch_threshold=5)
+    responses = create_tags(dnac, 20)
+    tasks = waiter.wait(responses, timeout=10)
+    assert [t.id for t in tasks] == [task_id_of(r) for r in responses]
+    assert all(t.endTime and not t.isError for t in tasks)
+    # The statuses were read from time windows of the task list
+    assert simulator.stats[TASK_LIST] >= 1
+    assert simulator.stats[TASK_BY_ID] == 0
+    assert waiter.pending == 0
+
+
+@pytest.mark.simulator
+def test_wait_for_task(dnac, simulator):
+    callbacks = []
+    response = dnac.tag.create_tag(name='single')
+    future = dnac.task_waiter.wait_for(response, callback=callbacks.append)
+    task = dnac.wait_for_task(response, timeout=10)
+    assert task.id == task_id_of(response)
+    assert callbacks == [future]
+    assert simulator.stats[TASK_BY_ID] >= 1
+
+
+@pytest.mark.simulator
+@pytest.mark.parametrize('simulator', [{'task_failure_rate': 1.0}],
+                         indirect=True)
+def test_task_failure(dnac, simulator):
+    response = dnac.tag.create_tag(name='failing')
+    with pytest.raises(dnacentersdk.TaskError) as e:
+        dnac.wait_for_task(response, timeout=10)
+    assert e.value.task.isError
+    assert [t.id for t in e.value.tree] == [task_id_of(response)]
+    assert simulator.stats[TASK_TREE] == 1
+
+
+@pytest.mark.simulator
+@pytest.mark.parametrize('simulator', [{'task_duration': 30}], indirect=True)
+def test_task_timeout(dnac, simulator):
+    response = dnac.tag.create_tag(name='slow')
+    with pytest.raises(dnacentersdk.TaskTimeoutError) as e:
+        dnac.wait_for_task(response, timeout=0.2)
+    assert e.value.task_id == task_id_of(response)
+
+
+@pytest.mark.simulator
+def test_transient_poll_errors(dnac, simulator):
+    response = dnac.tag.create_tag(name='flaky')
+    # The connection is closed unanswered at the first status reads
+    simulator.drop_requests(TASK_BY_ID, 2)
+    waiter = TaskWaiter(dnac.task, interval=0.05)
+    task = waiter.wait_for(response, timeout=10).result()
+    assert task.id == task_id_of(response)
+    assert simulator.stats['dropped'] == 2
+
+
+@pytest.mark.simulator
+def test_unknown_task(dnac, simulator):
+    waiter = TaskWaiter(dnac.task, interval=0.05)
+    with pytest.raises(dnacentersdk.ApiError) as e:
+        waiter.wait_for('00000000-0000-4000-8000-000000000000',
+                        timeout=10).result()
+    assert e.value.status_code == 404
+    assert simulator.stats[TASK_BY_ID] == 1
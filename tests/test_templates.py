@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""dnacentersdk/templates.py Tests
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import collections
+
+import pytest
+
+import dnacentersdk
+
+
+DEPLOY = 'POST /dna/intent/api/v1/template-programmer/template/deploy'
+STATUS = ('GET /dna/intent/api/v1/template-programmer/template/deploy/'
+          'status/${deploymentId}')
+
+
+SIMULATOR_OPTIONS = {'devices': 5000, 'task_duration': 0.3}
+
+
+@pytest.fixture()
+def template_id(simulator):
+    return simulator.add_template('banner', 'banner motd ${message}')
+
+
+@pytest.mark.simulator
+def test_deploy_template(dnac, simulator, template_id):
+    device_ids = [simulator.inventory.device(i)['id'] for i in range(5000)]
+    targets = iter(device_ids[:4998] + [
+        {'id': 'edge-004998.example.com', 'type': 'MANAGED_DEVICE_HOSTNAME',
+         'params': {'message': 'hello'}},
+        {'id': '10.99.99.99', 'type': 'MANAGED_DEVICE_IP'},
+    ])
+    results = list(dnac.deploy_template(template_id, targets,
+                                        deployment_size=250,
+                                        max_deployments=8, interval=0.1))
+    assert len(results) == 5000
+    statuses = collections.Counter(r.status for r in results)
+    assert statuses == {'SUCCESS': 4999, 'FAILURE': 1}
+    failure = [r for r in results if r.status == 'FAILURE'][0]
+    assert failure.target['id'] == '10.99.99.99'
+    assert failure.message == 'Device not found'
+    assert set(r.target['id'] for r in results
+               if r.status == 'SUCCESS') >= set(device_ids[:4998])
+    assert simulator.stats[DEPLOY] == 20
+    # One status read per deployment in progress and poll
+    assert simulator.stats[STATUS] < 20 * 10
+
+
+@pytest.mark.simulator
+def test_deploy_template_errors(dnac, simulator, template_id):
+    device_ids = [simulator.inventory.device(i)['id'] for i in range(10)]
+    results = list(dnac.deploy_template('missing', device_ids,
+                                        deployment_size=4))
+    assert [r.status for r in results] == ['ERROR'] * 10
+    assert isinstance(results[0].error, dnacentersdk.ApiError)
+
+    simulator.task_duration = 60
+    results = list(dnac.deploy_template(template_id, device_ids,
+                                        deployment_size=5, interval=0.05,
+                                        timeout=0.3))
+    assert [r.status for r in results] == ['TIMEOUT'] * 10
+    assert len(set(r.deployment_id for r in results)) == 2
+
+
+@pytest.mark.simulator
+def test_deploy_template_without_id(dnac, simulator, template_id,
+                                    monkeypatch):
+    device_ids = [simulator.inventory.device(i)['id'] for i in range(10)]
+    deploy = dnac.template_programmer.deploy_template
+    calls = []
+
+    def rejected(**kwargs):
+        # The first two deployments start nothing
+        calls.append(kwargs)
+        if len(calls) <= 2:
+            return {'message': 'Invalid deployment'}
+        return deploy(**kwargs)
+
+    monkeypatch.setattr(dnac.template_programmer, 'deploy_template',
+                        rejected)
+    results = list(dnac.deploy_template(template_id, device_ids,
+                                        deployment_size=2, interval=0.05))
+    assert len(results) == 10
+    errors = [r for r in results if r.status == 'ERROR']
+    assert len(errors) == 4
+    assert isinstance(errors[0].error, dnacentersdk.dnacentersdkException)
+    assert [r.status for r in results if r not in errors] == \
+        ['SUCCESS'] * 6
+    assert set(r.target['id'] for r in results) == set(device_ids)
+
+
+TEMPLATE_LIST = 'GET /dna/intent/api/v1/template-programmer/template'
+TEMPLATE_DETAILS = ('GET /dna/intent/api/v1/template-programmer/template/'
+                    '${templateId}')
+TEMPLATE_UPDATE = 'PUT /dna/intent/api/v1/template-programmer/template'
+TEMPLATE_COMMIT = \
+    'POST /dna/intent/api/v1/template-programmer/template/version'
+
+
+@pytest.mark.simulator
+def test_template_cache(dnac, simulator, template_id):
+    simulator.task_duration = 0.0
+    other_id = simulator.add_template('ntp', 'ntp server 10.0.0.1\n')
+    simulator.add_template('aaa', 'aaa new-model\n', project_name='Security')
+    cache = dnac.template_cache
+
+    assert [p['name'] for p in cache.projects()] == ['Onboarding',
+                                                     'Security']
+    assert [t.name for t in cache.templates('Onboarding')] == ['banner',
+                                                               'ntp']
+    assert cache.find('Onboarding', 'ntp').id == other_id
+    assert [v.version for v in cache.versions(other_id)] == ['1']
+    assert cache.stats == {'syncs': 1, 'details': 3}
+    assert simulator.stats[TEMPLATE_LIST] == 1
+    assert simulator.stats[TEMPLATE_DETAILS] == 3
+
+    assert cache.update(other_id, 'ntp server 10.0.0.1\n') == []
+    assert simulator.stats[TEMPLATE_UPDATE] == 0
+
+    changes = cache.update(other_id, 'ntp server 10.0.0.2\n',
+                           comments='New NTP server')
+    assert changes[2:] == ['@@ -1 +1 @@\n', '-ntp server 10.0.0.1\n',
+                           '+ntp server 10.0.0.2\n']
+    assert simulator.stats[TEMPLATE_UPDATE] == 1
+    assert simulator.stats[TEMPLATE_COMMIT] == 1
+    assert cache.template(other_id).version == '2'
+    assert cache.template(other_id).templateContent == \
+        'ntp server 10.0.0.2\n'
+    assert cache.diff(other_id, 'ntp server 10.0.0.2\n') == []
+    assert cache.diff(other_id, 'ntp server 10.0.0.2\n', version='1')
+    assert [v.version for v in cache.versions(other_id)] == ['1', '2']
+    assert simulator.stats[TEMPLATE_LIST] == 1
+
+    # A version committed by another client is read at the next sync
+    dnac.wait_for_task(dnac.template_programmer.update_template(
+        payload=dict(cache.template(template_id),
+                     templateContent='banner motd ${msg}'),
+    ))
+    dnac.wait_for_task(dnac.template_programmer.version_template(
+        templateId=template_id,
+    ))
+    details = simulator.stats[TEMPLATE_DETAILS]
+    cache.sync()
+    assert simulator.stats[TEMPLATE_DETAILS] == details + 1
+    assert cache.template(template_id).templateContent == \
+        'banner motd ${msg}'
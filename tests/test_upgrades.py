@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""dnacentersdk/upgrades.py Tests
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import collections
+
+import pytest
+
+import dnacentersdk
+
+
+DISTRIBUTION = 'POST /dna/intent/api/v1/image/distribution'
+ACTIVATION = 'POST /dna/intent/api/v1/image/activation/device'
+
+
+SIMULATOR_OPTIONS = {'devices': 60, 'task_duration': 0.2}
+
+
+@pytest.mark.simulator
+def test_upgrade_devices(dnac, simulator):
+    image_id = simulator.add_image('cat9k_iosxe.17.03.01.bin',
+                                   version='17.3.1')
+    device_ids = [simulator.inventory.device(i)['id'] for i in range(60)]
+    upgrades = [(device_id, image_id) for device_id in device_ids]
+    events = list(dnac.upgrade_devices(iter(upgrades + [('gone', image_id)]),
+                                       max_distributions=20,
+                                       max_activations=10))
+
+    statuses = collections.Counter((e.stage, e.status) for e in events)
+    assert statuses == {('DISTRIBUTION', 'SUCCESS'): 60,
+                        ('DISTRIBUTION', 'FAILURE'): 1,
+                        ('ACTIVATION', 'SUCCESS'): 60}
+    failure = [e for e in events if e.status == 'FAILURE'][0]
+    assert failure.device_id == 'gone'
+    assert isinstance(failure.error, dnacentersdk.TaskError)
+    assert failure.task.isError
+    # Devices are activated while others are still distributing
+    stages = [e.stage for e in events]
+    assert stages.index('ACTIVATION') < len(stages) - stages[::-1].index(
+        'DISTRIBUTION') - 1
+    for device_id in device_ids:
+        device = dnac.devices.get_device_by_id(device_id).response
+        assert device.softwareVersion == '17.3.1'
+    assert simulator.stats[DISTRIBUTION] == 61
+    assert simulator.stats[ACTIVATION] == 60
+
+
+@pytest.mark.simulator
+def test_upgrade_devices_failures(dnac, simulator):
+    image_id = simulator.add_image('cat9k_iosxe.17.03.01.bin')
+    device_ids = [simulator.inventory.device(i)['id'] for i in range(5)]
+    events = list(dnac.upgrade_devices(
+        [(d, image_id) for d in device_ids], activate=False,
+    ))
+    assert [e.stage for e in events] == ['DISTRIBUTION'] * 5
+    assert simulator.stats[ACTIVATION] == 0
+
+    simulator.task_failure_rate = 1.0
+    events = list(dnac.upgrade_devices([(d, image_id) for d in device_ids]))
+    assert len(events) == 5
+    assert all(e.status == 'FAILURE' for e in events)
+    assert simulator.stats[ACTIVATION] == 0
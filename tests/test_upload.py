@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""dnacentersdk/upload.py Tests
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import hashlib
+import json
+
+import pytest
+
+import dnacentersdk
+
+
+IMPORT_ROUTE = 'POST /dna/intent/api/v1/image/importation/source/file'
+CONTENT = bytes(bytearray(i % 251 for i in range(3 * 1024 * 1024 + 17)))
+
+
+SIMULATOR_OPTIONS = {'devices': 1}
+
+
+@pytest.fixture()
+def image_path(tmpdir):
+    path = tmpdir.join('cat9k_iosxe.17.01.bin')
+    path.write_binary(CONTENT)
+    return str(path)
+
+
+def imported_image(dnac, result):
+    task = dnac.wait_for_task(result.response, timeout=10)
+    image_uuid = json.loads(task.progress)['imageUuid']
+    images = dnac.swim.get_software_image_details(image_uuid=image_uuid)
+    assert len(images.response) == 1
+    return images.response[0]
+
+
+@pytest.mark.simulator
+def test_upload_image(dnac, simulator, image_path):
+    calls = []
+    result = dnac.swim.import_local_software_image_file(
+        image_path, chunk_size=256 * 1024, hash_algorithms=['md5', 'sha512'],
+        progress=lambda done, total: calls.append((done, total)),
+    )
+    assert result.size == len(CONTENT)
+    assert result.digests == {
+        'md5': hashlib.md5(CONTENT).hexdigest(),
+        'sha512': hashlib.sha512(CONTENT).hexdigest(),
+    }
+    assert len(calls) == -(-len(CONTENT) // (256 * 1024))
+    assert calls[-1] == (len(CONTENT), len(CONTENT))
+
+    image = imported_image(dnac, result)
+    assert image.name == 'cat9k_iosxe.17.01.bin'
+    assert image.md5Checksum == result.digests['md5']
+    assert image.shaCheckSum == result.digests['sha512']
+    assert simulator.stats[IMPORT_ROUTE] == 1
+
+
+@pytest.mark.simulator
+def test_upload_image_again_after_connection_failure(dnac, simulator,
+                                                     image_path):
+    simulator.drop_requests(IMPORT_ROUTE, 2)
+    result = dnac.swim.import_local_software_image_file(
+        image_path, hash_algorithms=['md5'], retries=1,
+    )
+    assert simulator.stats['dropped'] == 2
+    assert simulator.stats[IMPORT_ROUTE] == 3
+    image = imported_image(dnac, result)
+    assert image.md5Checksum == hashlib.md5(CONTENT).hexdigest()
+
+
+@pytest.mark.simulator
+def test_upload_image_gives_up(dnac, simulator, image_path):
+    simulator.drop_requests(IMPORT_ROUTE, 10)
+    with pytest.raises(dnacentersdk.dnacentersdkException):
+        dnac.swim.import_local_software_image_file(image_path, retries=1)
+    # One retry of the session, for each of the two attempts
+    assert simulator.stats[IMPORT_ROUTE] == 4
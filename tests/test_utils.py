@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""dnacentersdk/utils.py Tests
+
+Copyright (c) 2019 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import pytest
+
+from dnacentersdk.utils import (
+    apply_path_params,
+    check_type,
+    dict_from_items_with_values,
+)
+
+
+def legacy_apply_path_params(URL, path_params):
+    for k in path_params:
+        URL = URL.replace('${' + k + '}', str(path_params[k]))
+        URL = URL.replace(k, str(path_params[k]))
+    return URL
+
+
+@pytest.mark.dnacentersdk
+@pytest.mark.parametrize('url, path_params', [
+    ('/dna/intent/api/v1/network-device/${id}', {'id': 'abc'}),
+    ('/dna/intent/api/v1/discovery/${startIndex}/${recordsToReturn}',
+     {'startIndex': 1, 'recordsToReturn': 500}),
+    ('/dna/intent/api/v1/business/sda/border-device',
+     {'sda/border-device': '10.0.0.1'}),
+    ('/dna/intent/api/v1/${deviceId}/${id}', {'id': '1', 'deviceId': '2'}),
+    ('/dna/intent/api/v1/${x}/${y}', {'x': 'y'}),
+    ('/dna/intent/api/v1/network-device', {}),
+])
+def test_apply_path_params_matches_legacy_behavior(url, path_params):
+    expected = legacy_apply_path_params(url, path_params)
+    # The second call is served by the cached template
+    assert apply_path_params(url, path_params) == expected
+    assert apply_path_params(url, path_params) == expected
+
+
+@pytest.mark.dnacentersdk
+def test_apply_path_params_type_error():
+    with pytest.raises(TypeError):
+        apply_path_params('/dna/intent/api/v1/network-device/${id}', None)
+
+
+@pytest.mark.dnacentersdk
+def test_dict_from_items_with_values():
+    assert dict_from_items_with_values({'a': 1, 'b': None}) == {'a': 1}
+    assert dict_from_items_with_values({'a': 1}, {'b': None}, c=2) == \
+        {'a': 1, 'c': 2}
+
+
+@pytest.mark.dnacentersdk
+def test_check_type():
+    check_type(None, int)
+    check_type(1, (int, str), may_be_none=False)
+    with pytest.raises(TypeError):
+        check_type(None, int, may_be_none=False)
+    with pytest.raises(TypeError):
+        check_type('1', int)